@@ -0,0 +1,123 @@
+"""Benchmark of the typed record decoders against the model wrapping path.
+
+    python -m benchmarks.decode --rounds 5 --trackers 1000 --page-size 1000
+
+Response bodies are fetched once from the mock API. Each resource is then
+decoded both ways: JSON to dicts wrapped in models, and JSON to the typed
+records of lumioo.schema. The report gives the time to decode the body and
+read the usual fields of every object, and the memory the result retains.
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from aiohttp import ClientSession
+
+from lumioo import schema
+from lumioo.analyse import PowerPlantMinute
+from lumioo.plant import PlantEnergyDay
+from lumioo.tracker import TrackerStatus
+from lumioo.utils import json_loads
+
+from .mock_server import PREFIX, MockConfig, start_server
+
+
+def read_tracker_status(status):
+    return (status.latest_synchronisation, status.status_type.level, status.data.production, status.control.max_wind_speed, status.alarms)
+
+
+def read_power(power):
+    return (power.date, power.production, power.consumption, power.auto_consumption, power.grid_consumption)
+
+
+# Resource -> (paths, build models from the decoded body, record class, field reader).
+RESOURCES = {
+    "tracker statuses": (
+        lambda args: [
+            "tracker_statuses?" + "&".join(f"tracker[]={PREFIX}/trackers/{i}" for i in range(start, min(start + 100, args.trackers + 1)))
+            for start in range(1, args.trackers + 1, 100)
+        ],
+        lambda data: [TrackerStatus({"hydra:member": [member]}, None) for member in data["hydra:member"]],
+        schema.TrackerStatusRecord,
+        read_tracker_status,
+    ),
+    "power minutes": (
+        lambda args: [f"power_plant_minutes?plant={PREFIX}/plants/1&date[after]=2023-06-01&date[strictly_before]=2023-06-02"],
+        lambda data: [PowerPlantMinute(member, None) for member in data["hydra:member"]],
+        schema.PowerPlantMinuteRecord,
+        read_power,
+    ),
+    "energy days": (
+        lambda args: [f"energy_plant_days?plant={PREFIX}/plants/1&date[after]=2021-01-01&date[strictly_before]=2024-01-01"],
+        lambda data: [PlantEnergyDay(1, member, None) for member in data["hydra:member"]],
+        schema.PlantEnergyDayRecord,
+        read_power,
+    ),
+}
+
+
+def measure(decode, read, body, rounds):
+    """Return the best time to decode a body and read its objects, and the memory retained."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in decode(body):
+            read(item)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = decode(body)
+    for item in result:
+        read(item)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return best, retained
+
+
+async def fetch_bodies(args):
+    """Return the body of every benchmarked resource, as one collection."""
+    plants = max(args.trackers // 10, 1)
+    runner, _, base_url = await start_server(MockConfig(plants=plants, page_size=args.page_size))
+    try:
+        async with ClientSession() as session:
+            bodies = {}
+            for name, (paths, _, _, _) in RESOURCES.items():
+                members = []
+                for path in paths(args):
+                    async with session.get(f"{base_url}{PREFIX}/{path}") as resp:
+                        resp.raise_for_status()
+                        members.extend((await resp.json())["hydra:member"])
+                bodies[name] = json.dumps({"@type": "hydra:Collection", "hydra:member": members}).encode()
+            return bodies
+    finally:
+        await runner.cleanup()
+
+
+def main(args):
+    bodies = asyncio.run(fetch_bodies(args))
+    for name, (_, build, record, read) in RESOURCES.items():
+        body = bodies[name]
+        count = len(json_loads(body)["hydra:member"])
+        model_time, model_memory = measure(lambda body: build(json_loads(body)), read, body, args.rounds)
+        record_time, record_memory = measure(lambda body: schema.decode_members(body, record), read, body, args.rounds)
+        print(
+            f"{name:<17} objects={count:<6d}"
+            f" models={model_time * 1000:.1f}ms/{model_memory / 2 ** 20:.1f}MiB"
+            f" records={record_time * 1000:.1f}ms/{record_memory / 2 ** 20:.1f}MiB"
+            f" speedup={model_time / record_time:.2f}x"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--trackers", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    main(parse_args())
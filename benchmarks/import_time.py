@@ -0,0 +1,90 @@
+"""Import-time regression benchmark of the lumioo package.
+
+    python -m benchmarks.import_time --rounds 5
+
+Every target is imported in fresh interpreters with `-X importtime`, with
+the src directory of the checkout on the path; the best cumulative import
+time is reported. lumioo.core is timed with asyncio already imported, as
+in any program running its event loop: asyncio alone takes longer than
+the rest of core. Importing the package or a model module must not load
+aiohttp nor NumPy, and the process exits with a non-zero status when that
+happens, when a target exceeds its budget or when it cannot be imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Target module -> (budget in milliseconds, modules it must not load, modules imported first).
+TARGETS = {
+    "lumioo": (25.0, ("aiohttp", "numpy"), ()),
+    "lumioo.plant": (50.0, ("aiohttp", "numpy"), ()),
+    "lumioo.analyse": (50.0, ("aiohttp", "numpy"), ()),
+    "lumioo.core": (100.0, ("aiohttp", "numpy"), ("asyncio",)),
+}
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# A plain import statement: importlib.import_module() is not timed by -X importtime.
+_PROBE = "{preload}import {target}; import json, sys; print(json.dumps(sorted(sys.modules)))"
+
+
+class ImportFailed(Exception):
+    """Raised when a target cannot be imported."""
+
+
+def import_time_ms(target, preload=()):
+    """Return the cumulative import time of a module and the modules loaded."""
+    probe = _PROBE.format(preload="".join(f"import {name}; " for name in preload), target=target)
+    pythonpath = os.pathsep.join(filter(None, (SRC, os.environ.get("PYTHONPATH"))))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        env=dict(os.environ, PYTHONPATH=pythonpath),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise ImportFailed(proc.stderr.strip().splitlines()[-1])
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        if name.strip() == target:
+            cumulative = int(total)
+    return cumulative / 1000, json.loads(proc.stdout)
+
+
+def main(args):
+    failures = []
+    for target, (budget, forbidden, preload) in TARGETS.items():
+        try:
+            runs = [import_time_ms(target, preload) for _ in range(args.rounds)]
+        except ImportFailed as err:
+            failures.append(target)
+            print(f"{target:<16} import failed: {err}")
+            continue
+        best = min(elapsed for elapsed, _ in runs)
+        loaded = [name for name in forbidden if name in runs[0][1]]
+        status = "ok"
+        if best > budget * args.budget_factor:
+            status = "over budget"
+        if loaded:
+            status = f"loads {', '.join(loaded)}"
+        if status != "ok":
+            failures.append(target)
+        print(f"{target:<16} {best:>8.1f}ms  budget={budget * args.budget_factor:.0f}ms  {status}")
+    return 1 if failures else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-factor", type=float, default=1.0, help="scale every budget, e.g. on slow CI machines")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
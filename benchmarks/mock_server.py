@@ -0,0 +1,339 @@
+"""Local stand-in of the /v2/human endpoints of the Okwind API.
+
+Data is generated deterministically from the requested IDs and dates, so any
+fleet size and date range can be served without fixtures.
+"""
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from aiohttp import web
+
+PREFIX = "/v2/human"
+
+
+class MockConfig:
+    """Class that holds the behaviour of the mock API."""
+
+    def __init__(
+        self,
+        plants: int = 10,
+        array_filters: bool = True,
+        trackers_per_plant: int = 10,
+        page_size: int = 1000,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+        seed: int = 0,
+    ) -> None:
+        """Initialize a mock configuration."""
+        self.plants = plants
+        self.array_filters = array_filters
+        self.trackers_per_plant = trackers_per_plant
+        self.page_size = page_size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+
+def _iri(resource: str, resource_id: int) -> str:
+    return f"{PREFIX}/{resource}/{resource_id}"
+
+
+def _iri_id(value: Optional[str]) -> int:
+    if not value:
+        raise web.HTTPBadRequest(text="missing filter")
+    return int(value.rsplit("/", 1)[-1])
+
+
+def _iri_ids(request: web.Request, name: str) -> list:
+    """Return the IDs of a filter given once or as a name[]= array filter."""
+    values = request.query.getall(f"{name}[]", [])
+    if not values:
+        return [_iri_id(request.query.get(name))]
+    return [_iri_id(value) for value in values]
+
+
+def _collection(request: web.Request, members: list, total: Optional[int] = None, page: int = 1, page_size: Optional[int] = None) -> web.Response:
+    data = {
+        "@context": f"{PREFIX}/contexts/Collection",
+        "@id": request.path,
+        "@type": "hydra:Collection",
+        "hydra:member": members,
+        "hydra:totalItems": len(members) if total is None else total,
+    }
+    if page_size:
+        last_page = max(math.ceil(data["hydra:totalItems"] / page_size), 1)
+        query = request.query.copy()
+        view = {"@id": str(request.rel_url), "@type": "hydra:PartialCollectionView"}
+        for name, view_page in (("hydra:first", 1), ("hydra:last", last_page), ("hydra:next", page + 1)):
+            if view_page <= last_page:
+                query["page"] = str(view_page)
+                view[name] = str(request.rel_url.with_query(query))
+        data["hydra:view"] = view
+    return web.json_response(data)
+
+
+def _plant(plant_id: int) -> dict:
+    return {
+        "@id": _iri("plants", plant_id),
+        "@type": "Plant",
+        "id": plant_id,
+        "user": _iri("users", 1),
+        "name": f"Plant {plant_id}",
+        "aliasInstallation": f"plant-{plant_id}",
+        "timezone": "Europe/Paris",
+        "operationDate": "2020-01-01T00:00:00+00:00",
+        "restrictedPower": False,
+        "restrictedValue": 0,
+        "displayAutoconsumption": True,
+        "displayConsumption": True,
+        "nominalPower": 9000,
+        "mainMeter": _iri("meters", plant_id),
+    }
+
+
+def _status_type(level: int) -> dict:
+    return {"@type": "StatusType", "id": level, "label": f"Level {level}", "reference": f"L{level}", "level": level}
+
+
+def _production(dt: datetime) -> float:
+    hour = dt.hour + dt.minute / 60
+    return round(max(math.sin((hour - 6) / 12 * math.pi), 0) * 8000, 1)
+
+
+class MockAPI:
+    """Class that serves the mock API."""
+
+    def __init__(self, config: MockConfig) -> None:
+        """Initialize the mock API."""
+        self.config = config
+        self.requests = 0
+        self.app = web.Application(middlewares=[self.middleware])
+        routes = [
+            ("/users/{id}", self.user),
+            ("/plants", self.plants),
+            ("/plants/{id}", self.plant),
+            ("/plant_statuses", self.plant_statuses),
+            ("/trackers", self.trackers),
+            ("/trackers/{id}", self.tracker),
+            ("/tracker_statuses", self.tracker_statuses),
+            ("/meters/{id}", self.meter),
+            ("/meter_statuses/{id}", self.meter_status),
+            ("/power_plant_minutes", self.power_plant_minutes),
+            ("/energy_plant_days", self.energy_plant_days),
+            ("/solar_times", self.solar_times),
+            ("/production_estimates", self.production_estimates),
+        ]
+        for path, handler in routes:
+            self.app.router.add_get(PREFIX + path, handler)
+            if "{" not in path:
+                self.app.router.add_get(PREFIX + path + "/", handler)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests += 1
+        config = self.config
+        if config.latency or config.latency_jitter:
+            await asyncio.sleep(config.latency + config.random.uniform(0, config.latency_jitter))
+        if config.throttle_rate and config.random.random() < config.throttle_rate:
+            return web.json_response({"detail": "Too Many Requests"}, status=429, headers={"Retry-After": str(config.retry_after)})
+        if config.error_rate and config.random.random() < config.error_rate:
+            return web.json_response({"detail": "Bad Gateway"}, status=502)
+        return await handler(request)
+
+    async def user(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info["id"])
+        return web.json_response({"@id": _iri("users", user_id), "@type": "User", "id": user_id, "email": f"user{user_id}@example.com"})
+
+    async def plants(self, request: web.Request) -> web.Response:
+        return _collection(request, [_plant(plant_id) for plant_id in range(1, self.config.plants + 1)])
+
+    async def plant(self, request: web.Request) -> web.Response:
+        return web.json_response(_plant(int(request.match_info["id"])))
+
+    def _ids(self, request: web.Request, name: str) -> list:
+        if not self.config.array_filters and f"{name}[]" in request.query:
+            raise web.HTTPBadRequest(text="array filters are not supported")
+        return _iri_ids(request, name)
+
+    async def plant_statuses(self, request: web.Request) -> web.Response:
+        return _collection(request, [self._plant_status(plant_id) for plant_id in self._ids(request, "plant")])
+
+    def _plant_status(self, plant_id: int) -> dict:
+        return {
+            "@id": _iri("plant_statuses", plant_id),
+            "@type": "PlantStatus",
+            "id": plant_id,
+            "plant": _iri("plants", plant_id),
+            "latestSynchronisation": datetime.now(timezone.utc).replace(second=0, microsecond=0).isoformat(),
+            "isSynchronised": True,
+            "statusType": _status_type(1),
+            "alarmLevel1": 0,
+            "alarmLevel2": 0,
+            "alarmLevel3": 0,
+        }
+
+    def _tracker(self, tracker_id: int) -> dict:
+        return {
+            "@id": _iri("trackers", tracker_id),
+            "@type": "Tracker",
+            "id": tracker_id,
+            "plant": _iri("plants", (tracker_id - 1) // self.config.trackers_per_plant + 1),
+            "operationDate": "2020-01-01T00:00:00+00:00",
+            "serialNumber": f"TRK{tracker_id:06d}",
+            "nTrk": tracker_id,
+            "userGuideUrl": "https://example.com/guide.pdf",
+        }
+
+    async def trackers(self, request: web.Request) -> web.Response:
+        plant_id = _iri_id(request.query.get("plant"))
+        first = (plant_id - 1) * self.config.trackers_per_plant + 1
+        return _collection(request, [self._tracker(tracker_id) for tracker_id in range(first, first + self.config.trackers_per_plant)])
+
+    async def tracker(self, request: web.Request) -> web.Response:
+        return web.json_response(self._tracker(int(request.match_info["id"])))
+
+    async def tracker_statuses(self, request: web.Request) -> web.Response:
+        return _collection(request, [self._tracker_status(tracker_id) for tracker_id in self._ids(request, "tracker")])
+
+    def _tracker_status(self, tracker_id: int) -> dict:
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        wind = round(self.config.random.uniform(0, 20), 1)
+        return {
+            "@id": _iri("tracker_statuses", tracker_id),
+            "@type": "TrackerStatus",
+            "id": tracker_id,
+            "tracker": _iri("trackers", tracker_id),
+            "statusType": _status_type(1),
+            "latestSynchronisation": now.isoformat(),
+            "isSynchronised": True,
+            "data": {"@type": "TrackerStatusData", "production": _production(now), "restricted": False, "isSynchronised": True, "date": now.isoformat()},
+            "alarms": 0,
+            "control": {
+                "@type": "TrackerStatusControl",
+                "averageWindSpeed": wind / 2,
+                "alarmLabel": "",
+                "alarmDescription": "",
+                "maxWindSpeed": wind,
+                "date": now.isoformat(),
+            },
+            "maxWindSpeed20": wind,
+            "softwareFlatStatu": "none",
+        }
+
+    async def meter(self, request: web.Request) -> web.Response:
+        meter_id = int(request.match_info["id"])
+        return web.json_response({"@id": _iri("meters", meter_id), "@type": "Meter", "id": meter_id, "type": _iri("meter_types", 1), "plant": _iri("plants", meter_id)})
+
+    async def meter_status(self, request: web.Request) -> web.Response:
+        meter_id = int(request.match_info["id"])
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        return web.json_response({
+            "@id": _iri("meter_statuses", meter_id),
+            "@type": "MeterStatus",
+            "id": meter_id,
+            "isSynchronised": True,
+            "latestSynchronisation": now.isoformat(),
+            "data": {"date": now.isoformat(), "consumption": 1200},
+        })
+
+    def _range(self, request: web.Request):
+        plant_id = _iri_ids(request, "plant")[0]
+        start = datetime.fromisoformat(request.query["date[after]"])
+        end = datetime.fromisoformat(request.query["date[strictly_before]"])
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        return plant_id, start, end, int(request.query.get("page", 1))
+
+    async def power_plant_minutes(self, request: web.Request) -> web.Response:
+        plant_id, start, end, page = self._range(request)
+        page_size = self.config.page_size
+        total = max(int((end - start).total_seconds() // 60), 0)
+        members = []
+        for index in range((page - 1) * page_size, min(page * page_size, total)):
+            dt = start + timedelta(minutes=index)
+            production = _production(dt)
+            consumption = 1500.0
+            auto_consumption = min(production, consumption)
+            members.append({
+                "@id": _iri("power_plant_minutes", plant_id * 10 ** 9 + int(dt.timestamp()) // 60),
+                "@type": "PowerPlantMinute",
+                "plant": _iri("plants", plant_id),
+                "date": dt.isoformat(),
+                "production": production,
+                "consumption": consumption,
+                "autoConsumption": auto_consumption,
+                "gridConsumption": consumption - auto_consumption,
+            })
+        return _collection(request, members, total, page, page_size)
+
+    async def energy_plant_days(self, request: web.Request) -> web.Response:
+        _, start, end, page = self._range(request)
+        members = []
+        for plant_id in self._ids(request, "plant"):
+            members.extend(self._energy_days(plant_id, start, end))
+        page_size = self.config.page_size
+        return _collection(request, members[(page - 1) * page_size:page * page_size], len(members), page, page_size)
+
+    def _energy_days(self, plant_id: int, start: datetime, end: datetime) -> list:
+        members = []
+        day = start
+        while day < end:
+            production = 40000.0 + 10000 * math.sin(day.timetuple().tm_yday / 365 * 2 * math.pi)
+            members.append({
+                "@id": _iri("energy_plant_days", plant_id * 10 ** 6 + day.toordinal()),
+                "@type": "EnergyPlantDay",
+                "plant": _iri("plants", plant_id),
+                "date": day.isoformat(),
+                "production": production,
+                "consumption": 30000.0,
+                "autoConsumption": 20000.0,
+                "gridConsumption": 10000.0,
+            })
+            day += timedelta(days=1)
+        return members
+
+    async def solar_times(self, request: web.Request) -> web.Response:
+        day = datetime.fromisoformat(request.query["date"]).replace(tzinfo=timezone.utc)
+        return _collection(request, [{
+            "@type": "SolarTimes",
+            "sunrise": (day + timedelta(hours=6)).isoformat(),
+            "sunset": (day + timedelta(hours=18)).isoformat(),
+        }])
+
+    async def production_estimates(self, request: web.Request) -> web.Response:
+        _iri_id(request.query.get("plant"))
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        members = []
+        for hour in range(24):
+            begin = today + timedelta(hours=hour)
+            members.append({
+                "@type": "ProductionEstimate",
+                "reference": f"H{hour:02d}",
+                "begin": begin.isoformat(),
+                "end": (begin + timedelta(hours=1)).isoformat(),
+                "productionIndex": hour,
+                "production": sum(_production(begin + timedelta(minutes=minute)) for minute in range(60)) / 60,
+            })
+        return _collection(request, members)
+
+
+async def start_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+    """Start the mock API and return its runner, its MockAPI and its base URL."""
+    mock = MockAPI(config)
+    runner = web.AppRunner(mock.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, mock, f"http://{host}:{port}"
@@ -0,0 +1,207 @@
+"""Benchmarks of representative LumiooHubAPI workloads against the mock API.
+
+    python -m benchmarks.run --workload all --latency 0.02 --throttle-rate 0.01
+
+Each workload reports its throughput, the p50/p99 latency of the HTTP
+requests it made and the peak RSS of the process.
+
+With `--record traffic.log` the responses of the mock API are appended to
+a traffic log; `--replay traffic.log` then runs the same workloads from it
+without any server, to measure the client alone deterministically.
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+
+from aiohttp import ClientSession, TraceConfig
+
+from lumioo import replay
+from lumioo.auth import API_PATH_PREFIX, Auth
+from lumioo.core import LumiooHubAPI
+from lumioo.poller import FleetPoller
+from lumioo.tracker import TrackerStatus
+
+from .mock_server import MockConfig, start_server
+
+
+def percentile(values, fraction):
+    """Return a percentile of a list of values."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of the process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class Recorder:
+    """Class that records the latency of every HTTP request of a session."""
+
+    def __init__(self):
+        self.latencies = []
+        self.trace_config = TraceConfig()
+        self.trace_config.on_request_start.append(self._on_start)
+        self.trace_config.on_request_end.append(self._on_end)
+
+    async def _on_start(self, session, context, params):
+        context.start = time.perf_counter()
+
+    async def _on_end(self, session, context, params):
+        self.latencies.append(time.perf_counter() - context.start)
+
+
+def report(name, operations, unit, elapsed, latencies):
+    print(
+        f"{name:<16} {operations / elapsed:>12.1f} {unit}/s"
+        f"  requests={len(latencies):<7d}"
+        f" p50={percentile(latencies, 0.50) * 1000:.1f}ms"
+        f" p99={percentile(latencies, 0.99) * 1000:.1f}ms"
+        f" elapsed={elapsed:.2f}s peak_rss={peak_rss_mb():.1f}MiB"
+    )
+
+
+async def bench_status_polling(api, args, recorder):
+    """Poll every plant and tracker status of the fleet for a few rounds."""
+    tracker_count = args.plants * args.trackers_per_plant
+    poller = FleetPoller(
+        api,
+        plant_ids=range(1, args.plants + 1),
+        tracker_ids=range(1, tracker_count + 1),
+        concurrency=args.concurrency,
+    )
+    start = time.perf_counter()
+    polls = 0
+    for _ in range(args.rounds):
+        await asyncio.gather(*(poller.async_poll(kind, resource_id) for kind, resource_id in poller.resources))
+        polls += len(poller.resources)
+    report("status polling", polls, "polls", time.perf_counter() - start, recorder.latencies)
+
+
+async def bench_minute_backfill(api, args, recorder):
+    """Backfill the power plant minutes of one plant over `--days` days."""
+    date_strictly_before = date(2024, 1, 1)
+    date_after = date_strictly_before - timedelta(days=args.days)
+    start = time.perf_counter()
+    minutes = await api.async_backfill_power_plant_minutes(
+        1, date_after.isoformat(), date_strictly_before.isoformat(), shard="week", concurrency=args.concurrency,
+    )
+    report("minute backfill", len(minutes), "rows", time.perf_counter() - start, recorder.latencies)
+
+
+async def bench_model_access(api, args, recorder):
+    """Read the fields of tracker statuses the way a status loop does."""
+    status = await api.async_get_tracker_status(1)
+    statuses = [TrackerStatus({"hydra:member": [dict(status.raw_data)]}, api.auth) for _ in range(1000)]
+    reads = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds * 10):
+        for status in statuses:
+            status.latest_synchronisation
+            status.status_type.level
+            status.data.production
+            status.control.max_wind_speed
+            status.alarms
+            reads += 5
+    report("model access", reads, "reads", time.perf_counter() - start, [])
+
+
+async def bench_power_series(api, args, recorder):
+    """Fetch `--days` days of power plant minutes as a series, decoded per `--executor`."""
+    executors = {"none": lambda: None, "thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+    executor = executors[args.executor]()
+    date_strictly_before = date(2024, 1, 1)
+    date_after = date_strictly_before - timedelta(days=args.days)
+    lags = []
+
+    async def measure_lag():
+        # How late the loop wakes up a 10ms sleep tells how long it is blocked.
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    ticker = asyncio.ensure_future(measure_lag())
+    start = time.perf_counter()
+    try:
+        series = await api.async_get_power_series(
+            1, date_after.isoformat(), date_strictly_before.isoformat(), prefetch=args.concurrency, executor=executor,
+        )
+    finally:
+        ticker.cancel()
+        if executor is not None:
+            executor.shutdown()
+    report("power series", len(series), "rows", time.perf_counter() - start, recorder.latencies)
+    print(f"{'':<16} executor={args.executor} loop lag p99={percentile(lags, 0.99) * 1000:.1f}ms max={max(lags, default=0) * 1000:.1f}ms")
+
+
+WORKLOADS = {
+    "status": bench_status_polling,
+    "backfill": bench_minute_backfill,
+    "models": bench_model_access,
+    "series": bench_power_series,
+}
+
+
+async def main(args):
+    workloads = WORKLOADS if args.workload == "all" else {args.workload: WORKLOADS[args.workload]}
+    if args.replay:
+        session = replay.ReplaySession.from_file(args.replay)
+        for workload in workloads.values():
+            session.reset()
+            await workload(LumiooHubAPI(Auth(session, "benchmark-token")), args, Recorder())
+        return
+
+    config = MockConfig(
+        plants=args.plants,
+        trackers_per_plant=args.trackers_per_plant,
+        page_size=args.page_size,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+    )
+    runner, mock, base_url = await start_server(config)
+    traffic = replay.TrafficRecorder(args.record) if args.record else None
+    try:
+        for workload in workloads.values():
+            recorder = Recorder()
+            async with ClientSession(trace_configs=[recorder.trace_config]) as session:
+                auth = Auth(session, "benchmark-token", recorder=traffic)
+                auth.host = base_url + API_PATH_PREFIX
+                await workload(LumiooHubAPI(auth), args, recorder)
+    finally:
+        if traffic is not None:
+            traffic.close()
+        await runner.cleanup()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=["all", *WORKLOADS], default="all")
+    parser.add_argument("--plants", type=int, default=20)
+    parser.add_argument("--trackers-per-plant", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="random extra latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 502 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--executor", choices=["none", "thread", "process"], default="none", help="where the series workload decodes pages")
+    parser.add_argument("--record", metavar="PATH", help="append the API traffic to a traffic log")
+    parser.add_argument("--replay", metavar="PATH", help="serve the API traffic from a traffic log")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,89 @@
+"""Python client for the LumiooHub API.
+
+Public names are resolved lazily on first access, so that importing the
+package (or a model module to parse stored JSON) does not pull in aiohttp.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY_ATTRIBUTES = {
+    "LumiooHubAPI": "core",
+    "Auth": "auth",
+    "create_session": "auth",
+    "pool_stats": "auth",
+    "PoolTracer": "auth",
+    "MemoryCache": "cache",
+    "DiskCache": "cache",
+    "RateLimiter": "ratelimit",
+    "RetryPolicy": "ratelimit",
+    "CircuitBreaker": "circuit",
+    "CircuitOpenError": "circuit",
+    "Instrumentation": "metrics",
+    "PrometheusInstrumentation": "metrics",
+    "OpenTelemetryInstrumentation": "metrics",
+    "User": "user",
+    "Plant": "plant",
+    "PlantStatus": "plant",
+    "PlantEnergyDay": "plant",
+    "Tracker": "tracker",
+    "TrackerStatus": "tracker",
+    "Meter": "meter",
+    "MeterStatus": "meter",
+    "SolarTimes": "solar",
+    "ProductionEstimate": "solar",
+    "PowerPlantMinute": "analyse",
+    "PowerSeries": "analyse",
+    "PlantSnapshot": "snapshot",
+    "EnergyStore": "store",
+    "FleetPoller": "poller",
+    "ChangeDetector": "events",
+    "DeviationDetector": "deviation",
+    "BackfillError": "backfill",
+    "SnapshotError": "persist",
+    "RefreshResult": "refresh",
+    "TrafficRecorder": "replay",
+    "SolarScheduler": "scheduler",
+    "ClientPool": "pool",
+    "ReplaySession": "replay",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+if TYPE_CHECKING:
+    from .analyse import PowerPlantMinute, PowerSeries
+    from .auth import Auth, PoolTracer, create_session, pool_stats
+    from .backfill import BackfillError
+    from .cache import DiskCache, MemoryCache
+    from .circuit import CircuitBreaker, CircuitOpenError
+    from .core import LumiooHubAPI
+    from .deviation import DeviationDetector
+    from .events import ChangeDetector
+    from .meter import Meter, MeterStatus
+    from .metrics import Instrumentation, OpenTelemetryInstrumentation, PrometheusInstrumentation
+    from .persist import SnapshotError
+    from .plant import Plant, PlantEnergyDay, PlantStatus
+    from .poller import FleetPoller
+    from .pool import ClientPool
+    from .ratelimit import RateLimiter, RetryPolicy
+    from .refresh import RefreshResult
+    from .replay import ReplaySession, TrafficRecorder
+    from .scheduler import SolarScheduler
+    from .snapshot import PlantSnapshot
+    from .solar import ProductionEstimate, SolarTimes
+    from .store import EnergyStore
+    from .tracker import Tracker, TrackerStatus
+    from .user import User
+
+
+def __getattr__(name: str):
+    """Import the module defining a public name on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,32 +1,42 @@
-from datetime import datetime, date, timedelta
+from array import array
+from datetime import datetime, date, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional
 
-from .auth import Auth
-from .models import StatusType
+from .models import Model, cached_field, iri_to_id
+from .plant import PlantEnergyDay
+from .utils import optional_numpy
 
+if TYPE_CHECKING:
+    from .auth import Auth
 
-class PowerPlantMinute:
+POWER_FIELDS = {
+    "production": "production",
+    "consumption": "consumption",
+    "auto_consumption": "autoConsumption",
+    "grid_consumption": "gridConsumption",
+}
+
+
+class PowerPlantMinute(Model):
     """Class that represents a PowerPlantMinute object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth) -> None:
-        """Initialize a plant power minute object."""
-        self.raw_data = raw_data
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth") -> None:
+        """Initialize a plant power minute object."""
+        super().__init__(raw_data, auth)
 
-    @property
+    @cached_field
     def id(self) -> int:
         """Return the ID of the plant."""
-        id = self.raw_data["@id"].split("/")
-        return id[-1]
+        return iri_to_id(self.raw_data["@id"])
 
     @property
     def type(self) -> str:
         """Return the type of the plant."""
         return self.raw_data["@type"]
 
-    @property
+    @cached_field
     def date(self) -> datetime:
         """Return the data date of the plant."""
         return datetime.fromisoformat(self.raw_data["date"])
@@ -56,3 +66,202 @@ class PowerPlantMinute:
         resp = await self.auth.request("get", f"power_plant_minutes/{self.id}")
         resp.raise_for_status()
         self.raw_data = await resp.json()
+
+
+class PowerSeriesRow:
+    """Class that represents one row of a PowerSeries, read lazily from its columns."""
+
+    __slots__ = ("series", "index")
+
+    def __init__(self, series: "PowerSeries", index: int) -> None:
+        """Initialize a power series row."""
+        self.series = series
+        self.index = index
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    @property
+    def id(self) -> int:
+        """Return the ID of the power plant minute."""
+        return self.series.ids[self.index]
+
+    @property
+    def type(self) -> str:
+        """Return the type of the power plant minute."""
+        return "PowerPlantMinute"
+
+    @property
+    def date(self) -> datetime:
+        """Return the data date of the power plant minute."""
+        tz = timezone(timedelta(seconds=self.series.utc_offsets[self.index]))
+        return datetime.fromtimestamp(self.series.timestamps[self.index], tz)
+
+    @property
+    def production(self) -> float:
+        """Return the production of the power plant minute."""
+        return self.series.production[self.index]
+
+    @property
+    def consumption(self) -> float:
+        """Return the consumption of the power plant minute."""
+        return self.series.consumption[self.index]
+
+    @property
+    def auto_consumption(self) -> float:
+        """Return the auto consumption of the power plant minute."""
+        return self.series.auto_consumption[self.index]
+
+    @property
+    def grid_consumption(self) -> float:
+        """Return the grid consumption of the power plant minute."""
+        return self.series.grid_consumption[self.index]
+
+
+class PowerSeries:
+    """Class that stores power plant minutes as typed columns.
+
+    Dates are kept as epoch seconds with their UTC offset, and every power
+    field is a float column. Columns are `array.array` objects; `column()`
+    exposes them as NumPy arrays without copying when NumPy is installed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty power series."""
+        self.ids = array("q")
+        self.timestamps = array("q")
+        self.utc_offsets = array("l")
+        self.production = array("d")
+        self.consumption = array("d")
+        self.auto_consumption = array("d")
+        self.grid_consumption = array("d")
+
+    @classmethod
+    def from_members(cls, members: Iterable[dict]) -> "PowerSeries":
+        """Return a power series built from raw power plant minute data."""
+        series = cls()
+        for member in members:
+            series.append(member)
+        return series
+
+    @classmethod
+    def from_minutes(cls, minutes: Iterable[PowerPlantMinute]) -> "PowerSeries":
+        """Return a power series built from PowerPlantMinute objects."""
+        return cls.from_members(minute.raw_data for minute in minutes)
+
+    @classmethod
+    def from_energy_days(cls, energy_days: Iterable[PlantEnergyDay]) -> "PowerSeries":
+        """Return a series with one row per PlantEnergyDay object."""
+        return cls.from_members(day.raw_data for day in energy_days)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "PowerSeries":
+        """Return a power series built from (id, timestamp, utc_offset, production,
+        consumption, auto_consumption, grid_consumption) tuples."""
+        series = cls()
+        columns = (series.ids, series.timestamps, series.utc_offsets) + tuple(getattr(series, field) for field in POWER_FIELDS)
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+        return series
+
+    def rows(self) -> Iterator[tuple]:
+        """Iterate over the rows of the series as tuples, in from_rows order."""
+        return zip(self.ids, self.timestamps, self.utc_offsets, *(getattr(self, field) for field in POWER_FIELDS))
+
+    def append(self, raw_data: dict) -> None:
+        """Append the raw data of a power plant minute."""
+        dt = datetime.fromisoformat(raw_data["date"])
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        self.ids.append(iri_to_id(raw_data["@id"]) if "@id" in raw_data else 0)
+        self.timestamps.append(int(dt.timestamp()))
+        self.utc_offsets.append(int(dt.utcoffset().total_seconds()))
+        for field, key in POWER_FIELDS.items():
+            getattr(self, field).append(raw_data[key])
+
+    def extend(self, other: "PowerSeries") -> None:
+        """Append the rows of another series."""
+        self.ids.extend(other.ids)
+        self.timestamps.extend(other.timestamps)
+        self.utc_offsets.extend(other.utc_offsets)
+        for field in POWER_FIELDS:
+            getattr(self, field).extend(getattr(other, field))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int) -> PowerSeriesRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("power series index out of range")
+        return PowerSeriesRow(self, index)
+
+    def __iter__(self) -> Iterator[PowerSeriesRow]:
+        for index in range(len(self)):
+            yield PowerSeriesRow(self, index)
+
+    def column(self, field: str):
+        """Return a column, as a NumPy array when NumPy is installed."""
+        np = optional_numpy()
+        values = getattr(self, field)
+        if np is None:
+            return values
+        return np.frombuffer(values, dtype=values.typecode)
+
+    def sum(self, field: str) -> float:
+        """Return the sum of a field."""
+        np = optional_numpy()
+        if np is None:
+            return sum(getattr(self, field))
+        return float(self.column(field).sum())
+
+    def mean(self, field: str) -> Optional[float]:
+        """Return the mean of a field, or None for an empty series."""
+        if not len(self):
+            return None
+        return self.sum(field) / len(self)
+
+    def resample(self, seconds: int, how: str = "mean") -> "PowerSeries":
+        """Return a new series with one row per `seconds` wide bucket.
+
+        Buckets are aligned on the epoch and `how` is either "mean" or "sum".
+        Row IDs of the resampled series are the bucket indexes.
+        """
+        np = optional_numpy()
+        if how not in ("mean", "sum"):
+            raise ValueError(f"Unsupported resample aggregation: {how}")
+
+        resampled = PowerSeries()
+        if not len(self):
+            return resampled
+
+        if np is not None:
+            buckets = self.column("timestamps") // seconds
+            keys, first, inverse, counts = np.unique(buckets, return_index=True, return_inverse=True, return_counts=True)
+            resampled.ids.extend(keys.tolist())
+            resampled.timestamps.extend((keys * seconds).tolist())
+            resampled.utc_offsets.extend(self.column("utc_offsets")[first].tolist())
+            for field in POWER_FIELDS:
+                totals = np.bincount(inverse, weights=self.column(field), minlength=len(keys))
+                if how == "mean":
+                    totals = totals / counts
+                getattr(resampled, field).extend(totals.tolist())
+            return resampled
+
+        groups = {}  # type: Dict[int, List[int]]
+        for index, timestamp in enumerate(self.timestamps):
+            groups.setdefault(timestamp // seconds, []).append(index)
+        for key in sorted(groups):
+            indexes = groups[key]
+            resampled.ids.append(key)
+            resampled.timestamps.append(key * seconds)
+            resampled.utc_offsets.append(self.utc_offsets[indexes[0]])
+            for field in POWER_FIELDS:
+                values = getattr(self, field)
+                total = sum(values[index] for index in indexes)
+                if how == "mean":
+                    total /= len(indexes)
+                getattr(resampled, field).append(total)
+        return resampled
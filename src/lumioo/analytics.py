@@ -0,0 +1,195 @@
+"""Energy analytics over the columns of PowerSeries.
+
+Every function works on whole columns at once: with NumPy installed the
+work is vectorized, otherwise a pure Python fallback gives the same results
+on smaller volumes. Series of energy days (PowerSeries.from_energy_days)
+and of power plant minutes are both accepted.
+"""
+import calendar
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+from .analyse import POWER_FIELDS, PowerSeries, PowerSeriesRow
+from .utils import optional_numpy, zone
+
+PERIODS = ("hour", "day", "week", "month")
+
+# 1970-01-01 was a Thursday, weeks start on Mondays.
+_EPOCH_WEEKDAY = 3
+
+
+def _local_timestamps(series: PowerSeries, tz: Optional[str]):
+    """Return the timestamps of a series shifted to the wall clock of a time zone.
+
+    The UTC offset is only computed once per distinct hour, which is exact
+    for every time zone changing its offset on the hour.
+    """
+    np = optional_numpy()
+    local_zone = zone(tz)
+    if np is not None:
+        timestamps = series.column("timestamps")
+        hours, inverse = np.unique(timestamps // 3600, return_inverse=True)
+        offsets = np.array(
+            [datetime.fromtimestamp(int(hour) * 3600, local_zone).utcoffset().total_seconds() for hour in hours],
+            dtype=np.int64,
+        )
+        return timestamps + offsets[inverse]
+
+    offsets = {}
+    local = array("q")
+    for timestamp in series.timestamps:
+        hour = timestamp // 3600
+        if hour not in offsets:
+            offsets[hour] = int(datetime.fromtimestamp(hour * 3600, local_zone).utcoffset().total_seconds())
+        local.append(timestamp + offsets[hour])
+    return local
+
+
+def _bucket_starts(local, period: str):
+    """Return the local start of the period bucket of every local timestamp."""
+    np = optional_numpy()
+    if period not in PERIODS:
+        raise ValueError(f"Unsupported period: {period}")
+
+    if np is not None:
+        if period == "hour":
+            return local // 3600 * 3600
+        if period == "day":
+            return local // 86400 * 86400
+        if period == "week":
+            days = local // 86400
+            return (days - (days + _EPOCH_WEEKDAY) % 7) * 86400
+        months = local.astype("datetime64[s]").astype("datetime64[M]")
+        return months.astype("datetime64[s]").astype(np.int64)
+
+    starts = array("q")
+    for timestamp in local:
+        if period == "hour":
+            starts.append(timestamp // 3600 * 3600)
+        elif period == "day":
+            starts.append(timestamp // 86400 * 86400)
+        elif period == "week":
+            days = timestamp // 86400
+            starts.append((days - (days + _EPOCH_WEEKDAY) % 7) * 86400)
+        else:
+            dt = datetime.fromtimestamp(timestamp, timezone.utc)
+            starts.append(calendar.timegm((dt.year, dt.month, 1, 0, 0, 0)))
+    return starts
+
+
+def rollup(series: PowerSeries, period: str, tz: Optional[str] = None) -> PowerSeries:
+    """Return the totals of a series per hour, day, week or month.
+
+    Periods follow the wall clock of `tz`, usually `Plant.timezone`, and
+    default to UTC. Each row of the result starts its period: its timestamp
+    and UTC offset are those of the first row of the period.
+    """
+    np = optional_numpy()
+    result = PowerSeries()
+    if not len(series):
+        return result
+
+    local = _local_timestamps(series, tz)
+    starts = _bucket_starts(local, period)
+
+    if np is not None:
+        keys, first, inverse = np.unique(starts, return_index=True, return_inverse=True)
+        offsets = local[first] - series.column("timestamps")[first]
+        result.ids.extend(range(len(keys)))
+        result.timestamps.extend((keys - offsets).tolist())
+        result.utc_offsets.extend(offsets.tolist())
+        for field in POWER_FIELDS:
+            totals = np.bincount(inverse, weights=series.column(field), minlength=len(keys))
+            getattr(result, field).extend(totals.tolist())
+        return result
+
+    groups = {}
+    for index, start in enumerate(starts):
+        if start not in groups:
+            groups[start] = [index, [0.0] * len(POWER_FIELDS)]
+        totals = groups[start][1]
+        for position, field in enumerate(POWER_FIELDS):
+            totals[position] += getattr(series, field)[index]
+    for bucket, start in enumerate(sorted(groups)):
+        first, totals = groups[start]
+        offset = local[first] - series.timestamps[first]
+        result.ids.append(bucket)
+        result.timestamps.append(start - offset)
+        result.utc_offsets.append(offset)
+        for field, total in zip(POWER_FIELDS, totals):
+            getattr(result, field).append(total)
+    return result
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return numerator / denominator if denominator else None
+
+
+def self_consumption_ratio(series: PowerSeries) -> Optional[float]:
+    """Return the share of the production consumed on site."""
+    return _ratio(series.sum("auto_consumption"), series.sum("production"))
+
+
+def self_sufficiency_ratio(series: PowerSeries) -> Optional[float]:
+    """Return the share of the consumption covered by the production."""
+    return _ratio(series.sum("auto_consumption"), series.sum("consumption"))
+
+
+def grid_restitution(series: PowerSeries):
+    """Return the grid restitution of every row, as PlantEnergyDay.grid_restitution computes it."""
+    np = optional_numpy()
+    if np is not None:
+        production = series.column("production")
+        consumption = series.column("consumption")
+        return np.where(series.column("grid_consumption") == 0, production - consumption, 0.0)
+
+    return array("d", (
+        production - consumption if grid_consumption == 0 else 0.0
+        for production, consumption, grid_consumption
+        in zip(series.production, series.consumption, series.grid_consumption)
+    ))
+
+
+def total_grid_restitution(series: PowerSeries) -> float:
+    """Return the grid restitution of a whole series."""
+    np = optional_numpy()
+    return float(sum(grid_restitution(series)) if np is None else grid_restitution(series).sum())
+
+
+def peak_production(series: PowerSeries) -> Optional[PowerSeriesRow]:
+    """Return the row with the highest production."""
+    np = optional_numpy()
+    if not len(series):
+        return None
+    if np is not None:
+        return series[int(series.column("production").argmax())]
+    production = series.production
+    return series[max(range(len(production)), key=production.__getitem__)]
+
+
+def summary(series: PowerSeries) -> Dict[str, Optional[float]]:
+    """Return the totals and ratios of a series."""
+    totals = {field: series.sum(field) for field in POWER_FIELDS}
+    totals["grid_restitution"] = total_grid_restitution(series)
+    totals["self_consumption_ratio"] = _ratio(totals["auto_consumption"], totals["production"])
+    totals["self_sufficiency_ratio"] = _ratio(totals["auto_consumption"], totals["consumption"])
+    return totals
+
+
+def fleet_series(series_by_plant: Mapping[int, PowerSeries]) -> PowerSeries:
+    """Return the rows of several plants concatenated in one series."""
+    fleet = PowerSeries()
+    for series in series_by_plant.values():
+        fleet.extend(series)
+    return fleet
+
+
+def fleet_summary(series_by_plant: Mapping[int, PowerSeries]) -> Dict[str, Optional[float]]:
+    """Return the totals and ratios of a fleet of plants."""
+    return summary(fleet_series(series_by_plant))
+
+
+def fleet_rollup(series_by_plant: Mapping[int, PowerSeries], period: str, tz: Optional[str] = None) -> PowerSeries:
+    """Return the totals of a fleet of plants per period of the `tz` wall clock."""
+    return rollup(fleet_series(series_by_plant), period, tz)
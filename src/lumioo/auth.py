@@ -1,4 +1,18 @@
-from aiohttp import ClientSession, ClientResponse
+import asyncio
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, NamedTuple, Optional, Union
+
+from .cache import DEFAULT_TTLS, CacheEntry, ResponseCache, cache_key
+from .metrics import NULL_INSTRUMENTATION, Instrumentation, RequestTrace
+from .ratelimit import RateLimiter, RetryPolicy, parse_retry_after
+from .response import BufferedResponse
+from .utils import client_errors, endpoint_family
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse, ClientSession, TraceConfig
+
+    from .circuit import CircuitBreaker
+    from .replay import TrafficRecorder
 
 """
 headers = {
@@ -15,18 +29,336 @@ API_URL = 'https://api.okwind.fr'
 API_PATH_PREFIX = '/v2/human'
 
 
+def _has_brotli() -> bool:
+    """Return if a brotli decoder usable by aiohttp is installed."""
+    for name in ("brotli", "brotlicffi"):
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        return True
+    return False
+
+
+class PoolStats(NamedTuple):
+    """Occupation of the connection pool of a session."""
+
+    limit: int
+    limit_per_host: int
+    in_flight: int
+    waiting: int
+    created: int
+    reused: int
+
+    @property
+    def saturation(self) -> float:
+        """Return the share of the pool limit taken by the requests in flight."""
+        return self.in_flight / self.limit if self.limit else 0.0
+
+
+class PoolTracer:
+    """Class that follows the connection pool of sessions through aiohttp request tracing.
+
+    `in_flight` counts the requests sent and not answered yet, `waiting`
+    those queued for a free connection; `created` and `reused` count the
+    connections handed to requests so far.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.in_flight = 0
+        self.waiting = 0
+        self.created = 0
+        self.reused = 0
+
+    def trace_config(self) -> "TraceConfig":
+        """Return a trace config to pass to the sessions to follow."""
+        from aiohttp import TraceConfig
+
+        trace_config = TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_done)
+        trace_config.on_request_exception.append(self._on_request_done)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_reuseconn)
+        return trace_config
+
+    async def _on_request_start(self, session, context, params) -> None:
+        self.in_flight += 1
+        context.queued = False
+
+    async def _on_request_done(self, session, context, params) -> None:
+        self.in_flight -= 1
+        # aiohttp does not end the queuing of a request cancelled while queued.
+        if context.queued:
+            self.waiting -= 1
+            context.queued = False
+
+    async def _on_queued_start(self, session, context, params) -> None:
+        self.waiting += 1
+        context.queued = True
+
+    async def _on_queued_end(self, session, context, params) -> None:
+        self.waiting -= 1
+        context.queued = False
+
+    async def _on_create_end(self, session, context, params) -> None:
+        self.created += 1
+
+    async def _on_reuseconn(self, session, context, params) -> None:
+        self.reused += 1
+
+
+def pool_stats(session: "ClientSession", tracer: PoolTracer) -> PoolStats:
+    """Return the occupation of the connection pool of a session followed by `tracer`."""
+    connector = session.connector
+    return PoolStats(
+        connector.limit,
+        connector.limit_per_host,
+        tracer.in_flight,
+        tracer.waiting,
+        tracer.created,
+        tracer.reused,
+    )
+
+
+def create_session(
+    limit: int = 100,
+    limit_per_host: int = 30,
+    keepalive_timeout: float = 60,
+    ttl_dns_cache: int = 300,
+    compress: bool = True,
+    timeout: float = 30,
+    tracer: Optional[PoolTracer] = None,
+) -> "ClientSession":
+    """Return a session with a connection pool tuned for the API.
+
+    Connections are kept alive between requests, at most `limit_per_host`
+    of them are opened to the API and DNS answers are cached for
+    `ttl_dns_cache` seconds. With `compress`, gzip (and brotli when the
+    brotli package is installed) encoded responses are requested. With a
+    `tracer`, the connection pool is followed for pool_stats().
+    """
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=True,
+    )
+    headers = {}
+    if compress:
+        headers["accept-encoding"] = "gzip, deflate, br" if _has_brotli() else "gzip, deflate"
+    trace_configs = [tracer.trace_config()] if tracer is not None else None
+    return ClientSession(
+        connector=connector,
+        headers=headers,
+        timeout=ClientTimeout(total=timeout),
+        trace_configs=trace_configs,
+    )
+
+
 class Auth:
     """Class to make authenticated requests."""
 
-    def __init__(self, websession: ClientSession, access_token: str):
-        """Initialize the auth."""
+    def __init__(
+        self,
+        websession: Optional["ClientSession"],
+        access_token: str,
+        cache: Optional[ResponseCache] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional["CircuitBreaker"] = None,
+        session_options: Optional[dict] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        recorder: Optional["TrafficRecorder"] = None,
+        token_refresher: Optional[Callable[[], Awaitable[str]]] = None,
+        pool_tracer: Optional[PoolTracer] = None,
+    ):
+        """Initialize the auth.
+
+        Every call is traced and handed to `instrumentation` when it is
+        enabled.
+
+        Without a websession, Auth opens its own with create_session(),
+        called with `session_options`, on the first request and closes it
+        in `close()`. Its connection pool is followed by a PoolTracer; a
+        websession given here is followed when it was created with the
+        `pool_tracer` passed along.
+
+        When a cache is given, GET responses of the endpoint families listed in
+        `ttls` (DEFAULT_TTLS by default) are cached, revalidated with
+        conditional requests once stale, and concurrent identical GETs share a
+        single request. GETs sent with different headers are cached apart.
+
+        Idempotent requests failing with a connection error or a retryable
+        status are retried following `retry_policy` (RetryPolicy() by default).
+
+        With a `recorder`, every response handed back after retries is read
+        and appended to its traffic log, to be served later by ReplaySession.
+
+        With a `token_refresher`, a request answered 401 gets a new access
+        token from it and is sent once more.
+        """
         self.websession = websession
+        self.session_options = session_options or {}
+        self._owns_session = websession is None
+        if pool_tracer is None and self._owns_session:
+            pool_tracer = PoolTracer()
+        self.pool_tracer = pool_tracer
         self.host = API_URL + API_PATH_PREFIX
         self.access_token = access_token
+        self.cache = cache
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._inflight = {}
+        self.rate_limiter = rate_limiter
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.instrumentation = NULL_INSTRUMENTATION if instrumentation is None else instrumentation
+        self.recorder = recorder
+        self.token_refresher = token_refresher
+        self._token_refresh = None
+
+    async def __aenter__(self) -> "Auth":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if it was opened by Auth."""
+        if self._owns_session and self.websession is not None:
+            await self.websession.close()
+            self.websession = None
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Return the occupation of the connection pool, if a followed session is open."""
+        if self.pool_tracer is None or self.websession is None or self.websession.connector is None:
+            return None
+        return pool_stats(self.websession, self.pool_tracer)
+
+    async def request(self, method: str, path: str, trace: Optional[RequestTrace] = None, **kwargs) -> Union["ClientResponse", BufferedResponse]:
+        """Make a request.
+
+        A caller passing its own `trace` records it once it has read the
+        response, otherwise the request is recorded here.
+        """
+        if trace is not None or not self.instrumentation.enabled:
+            return await self._async_request(method, path, trace, **kwargs)
+
+        trace = RequestTrace(method, path)
+        try:
+            return await self._async_request(method, path, trace, **kwargs)
+        except BaseException as err:
+            trace.error = type(err).__name__
+            raise
+        finally:
+            trace.total_time = trace.elapsed()
+            self.instrumentation.record(trace)
+
+    async def _async_request(self, method: str, path: str, trace: Optional[RequestTrace], **kwargs) -> Union["ClientResponse", BufferedResponse]:
+        if self.cache is not None and method.lower() == "get":
+            ttl = self.ttls.get(endpoint_family(path), 0)
+            if ttl > 0:
+                entry = await self._async_cached_get(path, ttl, trace, **kwargs)
+                return entry.response()
+
+        return await self._async_send(method, path, trace, **kwargs)
+
+    async def async_revalidate(self, path: str, headers: Optional[Dict[str, str]] = None) -> Optional[CacheEntry]:
+        """Refresh the cache entry of a GET even if it is still fresh."""
+        ttl = self.ttls.get(endpoint_family(path), 0)
+        if self.cache is None or ttl <= 0:
+            return None
+        return await self._async_cached_get(path, ttl, None, force=True, headers=headers)
 
-    async def request(self, method: str, path: str, **kwargs) -> ClientResponse:
-        """Make a request."""
-        headers = kwargs.get("headers")
+    async def _async_cached_get(self, path: str, ttl: float, trace: Optional[RequestTrace], force: bool = False, **kwargs) -> CacheEntry:
+        """Return the cache entry of a GET, fetching it when missing or stale."""
+        key = cache_key(path, kwargs.get("headers"))
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh and not force:
+            if trace is not None:
+                trace.cache_hit = True
+                trace.status = entry.status
+            return entry
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._async_fetch_entry(key, path, entry, ttl, trace, **kwargs))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        elif trace is not None:
+            trace.coalesced = True
+        entry = await asyncio.shield(inflight)
+        if trace is not None:
+            trace.status = entry.status
+        return entry
+
+    async def _async_fetch_entry(
+        self, key: str, path: str, entry: Optional[CacheEntry], ttl: float, trace: Optional[RequestTrace], **kwargs
+    ) -> CacheEntry:
+        """Fetch a GET response, revalidating the stale entry if there is one."""
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry.etag is not None:
+                headers["if-none-match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["if-modified-since"] = entry.last_modified
+
+        resp = await self._async_send("get", path, trace, headers=headers, **kwargs)
+        if resp.status == 304 and entry is not None:
+            resp.release()
+            entry.expires = time.time() + ttl
+            self.cache.set(key, entry)
+            return entry
+
+        body = await resp.read()
+        fetched = CacheEntry(str(resp.url), resp.status, list(resp.headers.items()), body, time.time() + ttl)
+        if resp.status == 200:
+            self.cache.set(key, fetched)
+        return fetched
+
+    async def async_refresh_token(self, stale_token: Optional[str] = None) -> str:
+        """Replace the access token with one from the token refresher and return it.
+
+        Concurrent callers share a single refresh, and a caller holding a
+        `stale_token` that was already replaced gets the current token.
+        Requests in flight keep the token they were sent with.
+        """
+        if self.token_refresher is None:
+            raise RuntimeError("Auth has no token refresher")
+        if stale_token is not None and stale_token != self.access_token:
+            return self.access_token
+
+        refresh = self._token_refresh
+        if refresh is None:
+            refresh = self._token_refresh = asyncio.ensure_future(self.token_refresher())
+        try:
+            self.access_token = await asyncio.shield(refresh)
+        finally:
+            if self._token_refresh is refresh and refresh.done():
+                self._token_refresh = None
+        return self.access_token
+
+    async def _async_send(self, method: str, path: str, trace: Optional[RequestTrace] = None, **kwargs) -> "ClientResponse":
+        """Send a request to the API, refreshing the access token once on a 401."""
+        token = self.access_token
+        resp = await self._async_send_attempts(method, path, trace, **kwargs)
+        if resp.status != 401 or self.token_refresher is None:
+            return resp
+
+        resp.release()
+        await self.async_refresh_token(token)
+        return await self._async_send_attempts(method, path, trace, **kwargs)
+
+    async def _async_send_attempts(self, method: str, path: str, trace: Optional[RequestTrace] = None, **kwargs) -> "ClientResponse":
+        """Send a request to the API, retrying it following the retry policy."""
+        headers = kwargs.pop("headers", None)
 
         if headers is None:
             headers = {}
@@ -35,6 +367,65 @@ class Auth:
 
         headers["authorization"] = self.access_token
 
-        return await self.websession.request(
-            method, f"{self.host}/{path}", **kwargs, headers=headers,
-        )
+        if self.websession is None:
+            self.websession = create_session(tracer=self.pool_tracer, **self.session_options)
+
+        family = endpoint_family(path)
+        attempt = 0
+        while True:
+            trial = self.circuit_breaker is not None and self.circuit_breaker.before_request()
+            try:
+                if self.rate_limiter is not None:
+                    waited = await self.rate_limiter.acquire(family)
+                    if trace is not None:
+                        trace.wait_time += waited
+                resp = await self.websession.request(
+                    method, f"{self.host}/{path}", **kwargs, headers=headers,
+                )
+            except client_errors():
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_failure()
+                if not self.retry_policy.can_retry(method, attempt):
+                    raise
+                delay = self.retry_policy.delay(attempt)
+            except BaseException:
+                # Cancelled or failed unexpectedly: the trial request never got an outcome.
+                if trial:
+                    self.circuit_breaker.release_trial()
+                raise
+            else:
+                self._record_status(family, resp.status)
+                if trace is not None:
+                    trace.ttfb = trace.elapsed()
+                    trace.status = resp.status
+                    trace.retries = attempt
+                if resp.status not in self.retry_policy.statuses or not self.retry_policy.can_retry(method, attempt):
+                    if self.recorder is not None:
+                        return await self._async_record(method, path, resp)
+                    return resp
+                delay = self.retry_policy.delay(attempt, parse_retry_after(resp.headers.get("retry-after")))
+                resp.release()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _async_record(self, method: str, path: str, resp: "ClientResponse") -> BufferedResponse:
+        """Append a response to the traffic log and return it buffered."""
+        body = await resp.read()
+        resp.release()
+        headers = list(resp.headers.items())
+        self.recorder.record(method, path, str(resp.url), resp.status, headers, body)
+        return BufferedResponse(method, str(resp.url), resp.status, headers, body, resp.reason)
+
+    def _record_status(self, family: str, status: int) -> None:
+        """Feed the status of a response to the rate limiter and circuit breaker."""
+        if self.rate_limiter is not None:
+            if status == 429:
+                self.rate_limiter.throttle(family)
+            else:
+                self.rate_limiter.recover(family)
+        if self.circuit_breaker is not None:
+            if status == 429 or status >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
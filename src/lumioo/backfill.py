@@ -0,0 +1,124 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Tuple
+
+from .utils import client_errors
+
+SHARD_SIZES = {
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+class BackfillProgress(NamedTuple):
+    """Progress of a backfill, reported each time a shard completes."""
+
+    completed: int
+    total: int
+    resume_after: Optional[str]
+
+
+class BackfillError(Exception):
+    """Raised when some shards of a backfill failed after all retries."""
+
+    def __init__(self, failed: List[Tuple[str, str]], resume_after: Optional[str]) -> None:
+        """Initialize a backfill error."""
+        super().__init__(f"{len(failed)} shard(s) failed, resume after {resume_after}")
+        self.failed = failed
+        self.resume_after = resume_after
+
+
+def _parse_bounds(*values: str) -> List[datetime]:
+    """Return date or date time bounds as comparable datetimes.
+
+    Naive bounds are taken as UTC when another bound has a time zone.
+    """
+    parsed = [datetime.fromisoformat(value) for value in values]
+    if any(value.tzinfo is not None for value in parsed):
+        parsed = [value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc) for value in parsed]
+    return parsed
+
+
+def resume_bound(date_after: str, resume_after: Optional[str]) -> str:
+    """Return the start of a range resumed after `resume_after`, whichever bound is later."""
+    if resume_after is None:
+        return date_after
+    start, resume = _parse_bounds(date_after, resume_after)
+    return resume_after if resume > start else date_after
+
+
+def split_date_range(date_after: str, date_strictly_before: str, shard: str = "day") -> List[Tuple[str, str]]:
+    """Split [date_after, date_strictly_before) into consecutive shards.
+
+    Bounds are returned in the same format as given: dates stay dates and
+    date times stay date times.
+    """
+    step = SHARD_SIZES[shard]
+    has_time = "T" in date_after or "T" in date_strictly_before
+    start, end = _parse_bounds(date_after, date_strictly_before)
+
+    def fmt(value: datetime) -> str:
+        return value.isoformat() if has_time else date(value.year, value.month, value.day).isoformat()
+
+    shards = []
+    while start < end:
+        stop = min(start + step, end)
+        shards.append((fmt(start), fmt(stop)))
+        start = stop
+    return shards
+
+
+async def async_backfill(
+    fetch: Callable[[str, str], Awaitable[list]],
+    shards: List[Tuple[str, str]],
+    concurrency: int = 4,
+    retries: int = 3,
+    progress: Optional[Callable[[BackfillProgress], None]] = None,
+    backoff: float = 0.5,
+) -> List[list]:
+    """Fetch every shard concurrently and return their rows in shard order.
+
+    Up to `concurrency` shards are fetched at once; `fetch` should send one
+    request at a time (prefetch=1) so that as many requests are in flight.
+
+    Each shard is retried on its own with an exponential backoff, during
+    which it gives its slot to another shard. The requests of `fetch` are
+    usually retried by Auth too: a shard may send up to (retries + 1) times
+    (RetryPolicy.retries + 1) requests per page. `progress` is called when a
+    shard completes; its `resume_after` is the end of the last shard before
+    which every shard has completed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results = [None] * len(shards)
+    done = [False] * len(shards)
+    state = {"completed": 0, "watermark": 0}
+
+    async def run(index: int) -> None:
+        shard_after, shard_strictly_before = shards[index]
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    results[index] = await fetch(shard_after, shard_strictly_before)
+                break
+            except client_errors():
+                if attempt == retries:
+                    raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+
+        done[index] = True
+        state["completed"] += 1
+        while state["watermark"] < len(shards) and done[state["watermark"]]:
+            state["watermark"] += 1
+        if progress is not None:
+            progress(BackfillProgress(state["completed"], len(shards), resume_after()))
+
+    def resume_after() -> Optional[str]:
+        if state["watermark"] == 0:
+            return None
+        return shards[state["watermark"] - 1][1]
+
+    outcomes = await asyncio.gather(*(run(index) for index in range(len(shards))), return_exceptions=True)
+    failed = [shards[index] for index, outcome in enumerate(outcomes) if isinstance(outcome, BaseException)]
+    if failed:
+        raise BackfillError(failed, resume_after())
+    return results
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .response import BufferedResponse
+
+# Time to live in seconds of the cached GET responses of each endpoint family.
+# Families not listed here are never cached.
+DEFAULT_TTLS = {
+    "users": 3600,
+    "plants": 3600,
+    "trackers": 3600,
+    "meters": 3600,
+    "solar_times": 86400,
+    "production_estimates": 3600,
+    "plant_statuses": 30,
+    "tracker_statuses": 30,
+    "meter_statuses": 30,
+}
+
+
+def cache_key(path: str, headers: Optional[Mapping[str, str]] = None) -> str:
+    """Return the cache key of a GET, which varies with the headers given by the caller."""
+    key = f"GET {path}"
+    if headers:
+        key += "".join(f"\n{name}: {value}" for name, value in sorted((name.lower(), value) for name, value in headers.items()))
+    return key
+
+
+def parse_cache_key(key: str) -> Tuple[str, Dict[str, str]]:
+    """Return the path and the caller headers of a cache key."""
+    lines = key.split("\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return lines[0].split(" ", 1)[1], headers
+
+
+class CacheEntry:
+    """Class that represents a cached response."""
+
+    __slots__ = ("url", "status", "headers", "body", "expires")
+
+    def __init__(self, url: str, status: int, headers: List[Tuple[str, str]], body: bytes, expires: float) -> None:
+        """Initialize a cache entry."""
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+
+    @property
+    def fresh(self) -> bool:
+        """Return if the entry has not expired yet."""
+        return self.expires > time.time()
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Return the ETag of the cached response."""
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """Return the Last-Modified date of the cached response."""
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> Optional[str]:
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def response(self) -> BufferedResponse:
+        """Return a new response serving the cached body."""
+        return BufferedResponse("get", self.url, self.status, self.headers, self.body)
+
+
+class ResponseCache(ABC):
+    """Base class of the response caches used by Auth."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under a key."""
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry under a key."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under a key."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[str, CacheEntry]]:
+        """Iterate over the keys and entries."""
+
+
+class MemoryCache(ResponseCache):
+    """Class that keeps the most recently used responses in memory."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize a memory cache."""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under a key."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry under a key, evicting the least recently used ones."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under a key."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+    def items(self) -> Iterator[Tuple[str, CacheEntry]]:
+        """Iterate over the keys and entries, least recently used first."""
+        return iter(list(self._entries.items()))
+
+
+class DiskCache(ResponseCache):
+    """Class that stores responses as files in a directory.
+
+    Each file holds a JSON header line, with the key of the entry, followed
+    by the raw body.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize a disk cache."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    @staticmethod
+    def _read(path: str) -> Optional[Tuple[dict, CacheEntry]]:
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, CacheEntry(meta["url"], meta["status"], [tuple(h) for h in meta["headers"]], body, meta["expires"])
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored under a key."""
+        stored = self._read(self._path(key))
+        return None if stored is None else stored[1]
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry under a key."""
+        meta = {"key": key, "url": entry.url, "status": entry.status, "headers": entry.headers, "expires": entry.expires}
+        path = self._path(key)
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            f.write(entry.body)
+        os.replace(f"{path}.tmp", path)
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under a key."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def items(self) -> Iterator[Tuple[str, CacheEntry]]:
+        """Iterate over the keys and entries; files written without their key are skipped."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            stored = self._read(os.path.join(self.directory, name))
+            if stored is not None and "key" in stored[0]:
+                yield stored[0]["key"], stored[1]
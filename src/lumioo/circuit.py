@@ -0,0 +1,61 @@
+import time
+
+from aiohttp import ClientConnectionError
+
+
+class CircuitOpenError(ClientConnectionError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Class that stops sending requests while the API keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast with CircuitOpenError. Once `reset_timeout` seconds
+    have passed a single trial request is let through, and its outcome
+    closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Initialize a circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit: closed, open or half_open."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError if a request must not be sent, return if it is the trial request."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial):
+            raise CircuitOpenError("Circuit breaker is open, the API is degraded")
+        if state == "half_open":
+            self._trial = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Let another trial request through, the last one ended without an outcome."""
+        self._trial = False
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        self.failures += 1
+        self._trial = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
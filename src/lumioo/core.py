@@ -1,12 +1,86 @@
-from typing import List
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from math import ceil
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+from urllib.parse import parse_qs, quote, urlsplit
 
 from .auth import Auth
+from .backfill import BackfillProgress, async_backfill, resume_bound, split_date_range
+from .cache import MemoryCache, parse_cache_key
+from .metrics import RequestTrace
 from .user import User
 from .plant import Plant, PlantStatus, PlantEnergyDay
 from .tracker import Tracker, TrackerStatus
 from .meter import Meter, MeterStatus
 from .solar import SolarTimes, ProductionEstimate
-from .analyse import PowerPlantMinute
+from .snapshot import PlantSnapshot
+from .analyse import PowerPlantMinute, PowerSeries
+from .models import Model, iri_to_id
+from .persist import load_cache, save_cache
+from .refresh import RefreshResult, async_refresh_all
+from .schema import R
+from .stream import HydraMemberStream
+from .utils import client_errors, json_loads
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+T = TypeVar("T")
+
+# Longest URL sent when packing many IDs in one collection query.
+MAX_URL_LENGTH = 2000
+
+
+class _FilterUnsupported(Exception):
+    """Raised when the members of an array filtered query do not tell which ID they belong to."""
+
+
+def _page_number(iri: Optional[str]) -> Optional[int]:
+    """Return the page number of a hydra view IRI."""
+    if not iri:
+        return None
+    page = parse_qs(urlsplit(iri).query).get("page")
+    if not page:
+        return None
+    return int(page[0])
+
+
+@asynccontextmanager
+async def _aclosing(iterator: AsyncIterator[T]) -> AsyncIterator[AsyncIterator[T]]:
+    """Close an async generator on exit, like contextlib.aclosing of Python 3.10."""
+    try:
+        yield iterator
+    finally:
+        await iterator.aclose()
+
+
+def _raise_for_status(resp) -> None:
+    """Raise for an error status, releasing the response first as older aiohttp does not."""
+    if resp.status >= 400:
+        resp.release()
+    resp.raise_for_status()
+
+
+def _date_filter(date_after: str, date_strictly_before: str) -> str:
+    """Return the date range filter of a query, URL-encoding the "+" of time zone offsets."""
+    return f"date[after]={quote(date_after, safe=':')}&date[strictly_before]={quote(date_strictly_before, safe=':')}"
+
+
+def _last_page(data: dict) -> Optional[int]:
+    """Return the last page of a hydra collection, if it can be known."""
+    view = data.get("hydra:view")
+    if view is None:
+        return 1
+    last_page = _page_number(view.get("hydra:last"))
+    if last_page is not None:
+        return last_page
+    total_items = data.get("hydra:totalItems")
+    page_size = len(data["hydra:member"])
+    if total_items is not None and page_size:
+        return ceil(total_items / page_size)
+    return None
 
 
 class LumiooHubAPI:
@@ -15,86 +89,482 @@ class LumiooHubAPI:
     def __init__(self, auth: Auth) -> None:
         """Initialize the API and store the auth so we can make requests."""
         self.auth = auth
+        self._array_filters_rejected = set()
+
+    def save_snapshot(self, path: str) -> int:
+        """Write the cached responses to a snapshot file and return their number."""
+        if self.auth.cache is None:
+            return 0
+        return save_cache(self.auth.cache, path)
+
+    async def async_load_snapshot(self, path: str, grace: float = 300.0, concurrency: int = 4) -> Optional["asyncio.Task"]:
+        """Warm the response cache from a snapshot file.
+
+        Loaded responses are served for at least `grace` seconds while a
+        background task, which is returned, revalidates them with
+        conditional requests. A missing snapshot is a cold start and
+        returns None.
+        """
+        if self.auth.cache is None:
+            self.auth.cache = MemoryCache()
+        try:
+            keys = load_cache(self.auth.cache, path, grace)
+        except FileNotFoundError:
+            return None
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def revalidate(key: str) -> None:
+            path, headers = parse_cache_key(key)
+            async with semaphore:
+                try:
+                    await self.auth.async_revalidate(path, headers)
+                except client_errors():
+                    pass
+
+        return asyncio.ensure_future(asyncio.gather(*(revalidate(key) for key in keys)))
 
     async def async_get_user(self, user_id) -> User:
         """Return the user."""
-        resp = await self.auth.request("get", f"users/{user_id}")
-        resp.raise_for_status()
-        return User(await resp.json(), self.auth)
+        return await self._async_get(f"users/{user_id}", lambda data: User(data, self.auth))
 
     async def async_get_plants(self) -> List[Plant]:
         """Return the plants."""
-        resp = await self.auth.request("get", "plants")
-        resp.raise_for_status()
-        data = await resp.json()
-        return [Plant(plant_data, self.auth) for plant_data in data["hydra:member"]]
+        return await self._async_get("plants", lambda data: [Plant(plant_data, self.auth) for plant_data in data["hydra:member"]])
+
+    async def async_iter_plants(self, prefetch: int = 4) -> AsyncIterator[Plant]:
+        """Iterate over the plants of every page."""
+        async with _aclosing(self._async_iter_members("plants", prefetch)) as members:
+            async for plant_data in members:
+                yield Plant(plant_data, self.auth)
 
     async def async_get_plant(self, plant_id: int) -> Plant:
         """Return the plant."""
-        resp = await self.auth.request("get", f"plants/{plant_id}")
-        resp.raise_for_status()
-        return Plant(await resp.json(), self.auth)
+        return await self._async_get(f"plants/{plant_id}", lambda data: Plant(data, self.auth))
 
     async def async_get_plant_status(self, plant_id: int) -> PlantStatus:
         """Return the plant status."""
-        resp = await self.auth.request("get", f"plant_statuses?plant=/v2/human/plants/{plant_id}")
-        resp.raise_for_status()
-        return PlantStatus(await resp.json(), self.auth)
+        return await self._async_get(f"plant_statuses?plant=/v2/human/plants/{plant_id}", lambda data: PlantStatus(data, self.auth))
 
     async def async_get_plant_energy_days(self, plant_id: int, date_after: str, date_strictly_before: str, page: int = 1) -> List[PlantEnergyDay]:
         """Return the plant energy of the days."""
-        resp = await self.auth.request("get", f"energy_plant_days?plant=/v2/human/plants/{plant_id}&date[after]={date_after}&date[strictly_before]={date_strictly_before}&page={page}")
-        resp.raise_for_status()
-        data = await resp.json()
-        return [PlantEnergyDay(plant_id, energy_data, self.auth) for energy_data in data["hydra:member"]]
+        return await self._async_get(f"energy_plant_days?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}&page={page}", lambda data: [PlantEnergyDay(plant_id, energy_data, self.auth) for energy_data in data["hydra:member"]])
 
     async def async_get_power_plant_minutes(self, plant_id: int, date_after: str, date_strictly_before: str, page: int = 1) -> List[PowerPlantMinute]:
         """Return the power plant minutes."""
-        resp = await self.auth.request("get", f"power_plant_minutes?plant=/v2/human/plants/{plant_id}&date[after]={date_after}&date[strictly_before]={date_strictly_before}&page={page}")
-        resp.raise_for_status()
-        data = await resp.json()
-        return [PowerPlantMinute(power_data, self.auth) for power_data in data["hydra:member"]]
+        return await self._async_get(f"power_plant_minutes?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}&page={page}", lambda data: [PowerPlantMinute(power_data, self.auth) for power_data in data["hydra:member"]])
+
+    async def async_get_record(self, path: str, record: Type[R], **extra) -> R:
+        """Return a resource decoded as a typed record of lumioo.schema."""
+        return await self._async_get(path, lambda data: record.from_data(data, **extra))
+
+    async def async_get_records(self, path: str, record: Type[R], **extra) -> List[R]:
+        """Return the members of a collection page decoded as typed records of lumioo.schema."""
+        return await self._async_get(path, lambda data: record.members_from_data(data, **extra))
+
+    async def async_get_plant_statuses(self, plant_ids: Iterable[int], concurrency: int = 4) -> Dict[int, PlantStatus]:
+        """Return the statuses of many plants, packing their IDs in few queries."""
+        members = await self._async_get_bulk(
+            "plant_statuses", "plant", "plants", plant_ids, "", concurrency,
+            lambda plant_id: self._async_get_members(f"plant_statuses?plant=/v2/human/plants/{plant_id}"),
+        )
+        return {plant_id: PlantStatus({"hydra:member": data}, self.auth) for plant_id, data in members.items() if data}
+
+    async def async_get_tracker_statuses(self, tracker_ids: Iterable[int], concurrency: int = 4) -> Dict[int, TrackerStatus]:
+        """Return the statuses of many trackers, packing their IDs in few queries."""
+        members = await self._async_get_bulk(
+            "tracker_statuses", "tracker", "trackers", tracker_ids, "", concurrency,
+            lambda tracker_id: self._async_get_members(f"tracker_statuses?tracker=/v2/human/trackers/{tracker_id}"),
+        )
+        return {tracker_id: TrackerStatus({"hydra:member": data}, self.auth) for tracker_id, data in members.items() if data}
+
+    async def async_get_plants_energy_days(self, plant_ids: Iterable[int], date_after: str, date_strictly_before: str, concurrency: int = 4) -> Dict[int, List[PlantEnergyDay]]:
+        """Return the energy of the days of many plants, packing their IDs in few queries."""
+        query = f"&{_date_filter(date_after, date_strictly_before)}"
+
+        async def single(plant_id: int) -> List[dict]:
+            path = f"energy_plant_days?plant=/v2/human/plants/{plant_id}{query}"
+            # Already limited to `concurrency` single queries: one page at a time each.
+            async with _aclosing(self._async_iter_members(path, 1)) as members:
+                return [energy_data async for energy_data in members]
+
+        members = await self._async_get_bulk("energy_plant_days", "plant", "plants", plant_ids, query, concurrency, single)
+        return {
+            plant_id: [PlantEnergyDay(plant_id, energy_data, self.auth) for energy_data in data]
+            for plant_id, data in members.items()
+        }
+
+    async def _async_get_members(self, path: str) -> List[dict]:
+        """Return the members of a single page collection."""
+        return await self._async_get(path, lambda data: data["hydra:member"])
+
+    async def _async_get_bulk(
+        self,
+        collection: str,
+        filter_name: str,
+        resource: str,
+        ids: Iterable[int],
+        query: str,
+        concurrency: int,
+        single: Callable[[int], Awaitable[List[dict]]],
+    ) -> Dict[int, List[dict]]:
+        """Return the members of a collection filtered on many IDs, grouped by ID.
+
+        The IDs are packed in `filter[]=` array filters, as many per query as
+        MAX_URL_LENGTH allows. When the API rejects array filters for a
+        collection, or its members do not tell which ID they belong to, each
+        ID is requested on its own with `single`. A rejected query is only
+        taken to mean that array filters are not supported once the single
+        queries of its IDs succeed.
+        """
+        from aiohttp import ClientResponseError
+
+        ids = list(dict.fromkeys(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited_single(resource_id: int) -> List[dict]:
+            async with semaphore:
+                return await single(resource_id)
+
+        async def fallback(chunk_ids: List[int]) -> Dict[int, List[dict]]:
+            results = await asyncio.gather(*(limited_single(resource_id) for resource_id in chunk_ids))
+            return dict(zip(chunk_ids, results))
+
+        if collection in self._array_filters_rejected:
+            return await fallback(ids)
+
+        chunks = []
+        path = f"{collection}?"
+        chunk_ids = []
+        for resource_id in ids:
+            filter_value = f"{filter_name}[]=/v2/human/{resource}/{resource_id}&"
+            if chunk_ids and len(self.auth.host) + 1 + len(path) + len(filter_value) + len(query) + 10 > MAX_URL_LENGTH:
+                chunks.append((path.rstrip("&") + query, chunk_ids))
+                path = f"{collection}?"
+                chunk_ids = []
+            path += filter_value
+            chunk_ids.append(resource_id)
+        if chunk_ids:
+            chunks.append((path.rstrip("&") + query, chunk_ids))
+
+        async def fetch_chunk(path: str, chunk_ids: List[int]) -> Dict[int, List[dict]]:
+            grouped = {resource_id: [] for resource_id in chunk_ids}
+            try:
+                async with semaphore:
+                    async with _aclosing(self._async_iter_members(path, 1)) as members:
+                        async for member in members:
+                            if filter_name not in member:
+                                raise _FilterUnsupported(filter_name)
+                            grouped.setdefault(iri_to_id(member[filter_name]), []).append(member)
+            except ClientResponseError as err:
+                if err.status != 400:
+                    raise
+                grouped = await fallback(chunk_ids)
+                # The same IDs were accepted one at a time: the array filter itself is not supported.
+                self._array_filters_rejected.add(collection)
+                return grouped
+            except _FilterUnsupported:
+                self._array_filters_rejected.add(collection)
+                return await fallback(chunk_ids)
+            return grouped
+
+        results = {}
+        for grouped in await asyncio.gather(*(fetch_chunk(path, chunk_ids) for path, chunk_ids in chunks)):
+            results.update(grouped)
+        return results
+
+    async def async_stream_plant_energy_days(self, plant_id: int, date_after: str, date_strictly_before: str, page: int = 1) -> AsyncIterator[PlantEnergyDay]:
+        """Yield the plant energy of the days of a page as the response is read."""
+        resp = await self.auth.request("get", f"energy_plant_days?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}&page={page}")
+        _raise_for_status(resp)
+        async with HydraMemberStream(resp) as members:
+            async for energy_data in members:
+                yield PlantEnergyDay(plant_id, energy_data, self.auth)
+
+    async def async_stream_power_plant_minutes(self, plant_id: int, date_after: str, date_strictly_before: str, page: int = 1) -> AsyncIterator[PowerPlantMinute]:
+        """Yield the power plant minutes of a page as the response is read."""
+        resp = await self.auth.request("get", f"power_plant_minutes?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}&page={page}")
+        _raise_for_status(resp)
+        async with HydraMemberStream(resp) as members:
+            async for power_data in members:
+                yield PowerPlantMinute(power_data, self.auth)
+
+    async def async_iter_plant_energy_days(self, plant_id: int, date_after: str, date_strictly_before: str, prefetch: int = 4) -> AsyncIterator[PlantEnergyDay]:
+        """Iterate over the plant energy of the days of every page."""
+        path = f"energy_plant_days?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}"
+        async with _aclosing(self._async_iter_members(path, prefetch)) as members:
+            async for energy_data in members:
+                yield PlantEnergyDay(plant_id, energy_data, self.auth)
+
+    async def async_iter_power_plant_minutes(self, plant_id: int, date_after: str, date_strictly_before: str, prefetch: int = 4) -> AsyncIterator[PowerPlantMinute]:
+        """Iterate over the power plant minutes of every page."""
+        path = f"power_plant_minutes?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}"
+        async with _aclosing(self._async_iter_members(path, prefetch)) as members:
+            async for power_data in members:
+                yield PowerPlantMinute(power_data, self.auth)
+
+    async def async_get_power_series(
+        self, plant_id: int, date_after: str, date_strictly_before: str, prefetch: int = 4, executor: Optional["Executor"] = None,
+    ) -> PowerSeries:
+        """Return the power plant minutes of every page as a columnar series.
+
+        With an `executor`, the pages are decoded in it rather than on the
+        event loop, up to `prefetch` at a time, and handed back as columns
+        (in shared memory for a process pool).
+        """
+        path = f"power_plant_minutes?plant=/v2/human/plants/{plant_id}&{_date_filter(date_after, date_strictly_before)}"
+        series = PowerSeries()
+        if executor is None:
+            async with _aclosing(self._async_iter_members(path, prefetch)) as members:
+                async for power_data in members:
+                    series.append(power_data)
+            return series
+
+        from .offload import decode_power_page, release_columns, release_page, use_shared_memory
+
+        loop = asyncio.get_running_loop()
+        shared = use_shared_memory(executor)
+
+        async def get_page(path: str, page: int) -> dict:
+            body = await self._async_get_body(f"{path}&page={page}")
+            decoded = loop.run_in_executor(executor, decode_power_page, body, shared)
+            try:
+                return await asyncio.shield(decoded)
+            except asyncio.CancelledError:
+                decoded.add_done_callback(release_page)
+                raise
+
+        async with _aclosing(self._async_iter_pages(path, prefetch, get_page, release_columns)) as pages:
+            async for data in pages:
+                series.extend(data["hydra:member"].to_series())
+        return series
+
+    async def async_backfill_power_plant_minutes(
+        self,
+        plant_id: int,
+        date_after: str,
+        date_strictly_before: str,
+        shard: str = "day",
+        concurrency: int = 4,
+        retries: int = 3,
+        progress: Optional[Callable[[BackfillProgress], None]] = None,
+        resume_after: Optional[str] = None,
+    ) -> List[PowerPlantMinute]:
+        """Return the power plant minutes of a long range fetched in parallel shards.
+
+        The range is split into `shard` ("day" or "week") sized shards which
+        are fetched concurrently and merged back in date order, without
+        duplicates. Pass the `resume_after` of the last reported progress to
+        skip the shards that were already completed.
+
+        Failed shards are retried `retries` times on top of the retries of
+        the Auth RetryPolicy, see backfill.async_backfill.
+        """
+        date_after = resume_bound(date_after, resume_after)
+
+        async def fetch(shard_after: str, shard_strictly_before: str) -> List[PowerPlantMinute]:
+            return [
+                minute
+                async for minute in self.async_iter_power_plant_minutes(plant_id, shard_after, shard_strictly_before, prefetch=1)
+            ]
+
+        shards = split_date_range(date_after, date_strictly_before, shard)
+        results = await async_backfill(fetch, shards, concurrency, retries, progress)
+
+        minutes = {}
+        for shard_minutes in results:
+            for minute in shard_minutes:
+                minutes.setdefault(minute.raw_data["@id"], minute)
+        return sorted(minutes.values(), key=lambda minute: minute.date)
+
+    async def _async_get_page(self, path: str, page: int) -> dict:
+        """Return one page of a hydra collection."""
+        separator = "&" if "?" in path else "?"
+        return await self._async_get(f"{path}{separator}page={page}", lambda data: data)
+
+    async def _async_get_body(self, path: str) -> bytes:
+        """Return the body of the response at a path, without decoding it."""
+        resp = await self.auth.request("get", path)
+        _raise_for_status(resp)
+        return await resp.read()
+
+    async def _async_get(self, path: str, build: Callable[[dict], T]) -> T:
+        """Return the objects built by `build` from the JSON document at a path.
+
+        With instrumentation enabled, the call is traced up to the model
+        construction.
+        """
+        instrumentation = self.auth.instrumentation
+        if not instrumentation.enabled:
+            resp = await self.auth.request("get", path)
+            _raise_for_status(resp)
+            return build(await resp.json(loads=json_loads))
+
+        trace = RequestTrace("get", path)
+        try:
+            resp = await self.auth.request("get", path, trace=trace)
+            _raise_for_status(resp)
+            body = await resp.read()
+            trace.total_time = trace.elapsed()
+            trace.bytes_received = len(body)
+
+            start = time.perf_counter()
+            data = json_loads(body)
+            trace.decode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = build(data)
+            trace.build_time = time.perf_counter() - start
+            return result
+        except BaseException as err:
+            trace.error = type(err).__name__
+            raise
+        finally:
+            if trace.total_time is None:
+                trace.total_time = trace.elapsed()
+            instrumentation.record(trace)
+
+    async def _async_iter_members(self, path: str, prefetch: int) -> AsyncIterator[dict]:
+        """Yield the members of a hydra collection in page order."""
+        async with _aclosing(self._async_iter_pages(path, prefetch, self._async_get_page)) as pages:
+            async for data in pages:
+                for member in data["hydra:member"]:
+                    yield member
+
+    async def _async_iter_pages(
+        self,
+        path: str,
+        prefetch: int,
+        get_page: Callable[[str, int], Awaitable[dict]],
+        release: Optional[Callable[[dict], None]] = None,
+    ) -> AsyncIterator[dict]:
+        """Yield the pages of a hydra collection, as returned by `get_page`, in page order.
+
+        Once the first page tells how many pages there are, up to `prefetch`
+        of the following pages are requested concurrently. Without a page
+        count the `hydra:next` links are followed one after the other.
+
+        A yielded page belongs to the caller. When the iteration stops early,
+        pages still in flight are cancelled and the prefetched pages nobody
+        will read are handed to `release`.
+        """
+        data = await get_page(path, 1)
+        yield data
+
+        last_page = _last_page(data)
+        if last_page is None:
+            next_page = _page_number(data["hydra:view"].get("hydra:next"))
+            while next_page is not None:
+                data = await get_page(path, next_page)
+                yield data
+                next_page = _page_number(data.get("hydra:view", {}).get("hydra:next"))
+            return
+
+        pending = deque()
+        next_page = 2
+        try:
+            while next_page <= last_page or pending:
+                while next_page <= last_page and len(pending) < max(prefetch, 1):
+                    pending.append(asyncio.ensure_future(get_page(path, next_page)))
+                    next_page += 1
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None and release is not None:
+                    release(task.result())
 
     async def async_get_solar_times(self, plant_id: int, date: str) -> SolarTimes:
         """Return the solar times."""
-        resp = await self.auth.request("get", f"solar_times/?plant=/v2/human/plants/{plant_id}&date={date}")
-        resp.raise_for_status()
-        return SolarTimes(plant_id, date, await resp.json(), self.auth)
+        return await self._async_get(f"solar_times/?plant=/v2/human/plants/{plant_id}&date={date}", lambda data: SolarTimes(plant_id, date, data, self.auth))
 
     async def async_get_production_estimates(self, plant_id: int) -> List[ProductionEstimate]:
         """Return the production estimates."""
-        resp = await self.auth.request("get", f"production_estimates?plant=/v2/human/plants/{plant_id}")
-        resp.raise_for_status()
-        data = await resp.json()
-        return [ProductionEstimate(plant_id, pe_data, self.auth) for pe_data in data["hydra:member"]]
+        return await self._async_get(f"production_estimates?plant=/v2/human/plants/{plant_id}", lambda data: [ProductionEstimate(plant_id, pe_data, self.auth) for pe_data in data["hydra:member"]])
 
     async def async_get_trackers(self, plant_id: int) -> List[Tracker]:
         """Return the trackers."""
-        resp = await self.auth.request("get", f"trackers?plant=/v2/human/plants/{plant_id}")
-        resp.raise_for_status()
-        data = await resp.json()
-        return [Tracker(tracker_data, self.auth) for tracker_data in data["hydra:member"]]
+        return await self._async_get(f"trackers?plant=/v2/human/plants/{plant_id}", lambda data: [Tracker(tracker_data, self.auth) for tracker_data in data["hydra:member"]])
 
     async def async_get_tracker(self, tracker_id: int) -> Tracker:
         """Return the tracker."""
-        resp = await self.auth.request("get", f"trackers/{tracker_id}")
-        resp.raise_for_status()
-        return Tracker(await resp.json(), self.auth)
+        return await self._async_get(f"trackers/{tracker_id}", lambda data: Tracker(data, self.auth))
 
     async def async_get_tracker_status(self, tracker_id: int) -> TrackerStatus:
         """Return the tracker status."""
-        resp = await self.auth.request("get", f"tracker_statuses?tracker=/v2/human/trackers/{tracker_id}")
-        resp.raise_for_status()
-        return TrackerStatus(await resp.json(), self.auth)
+        return await self._async_get(f"tracker_statuses?tracker=/v2/human/trackers/{tracker_id}", lambda data: TrackerStatus(data, self.auth))
 
     async def async_get_meter(self, meter_id: int) -> Meter:
         """Return the meter."""
-        resp = await self.auth.request("get", f"meters/{meter_id}")
-        resp.raise_for_status()
-        return Meter(await resp.json(), self.auth)
+        return await self._async_get(f"meters/{meter_id}", lambda data: Meter(data, self.auth))
 
     async def async_get_meter_status(self, meter_id: int) -> MeterStatus:
         """Return the meter status."""
-        resp = await self.auth.request("get", f"meter_statuses/{meter_id}")
-        resp.raise_for_status()
-        return MeterStatus(await resp.json(), self.auth)
+        return await self._async_get(f"meter_statuses/{meter_id}", lambda data: MeterStatus(data, self.auth))
+
+    async def async_refresh_all(self, models: Iterable[Model], concurrency: int = 10) -> RefreshResult:
+        """Refresh the raw data of many models in place, see refresh.async_refresh_all."""
+        return await async_refresh_all(self, models, concurrency)
+
+    async def async_get_plant_snapshot(self, plant_ids: Iterable[int], concurrency: int = 10) -> Dict[int, PlantSnapshot]:
+        """Return the snapshots of plants, fetching every independent part concurrently.
+
+        The plant, its status and its trackers are requested at once, then
+        the main meter and the tracker statuses as soon as their IDs are
+        known. A resource shared by several plants is only fetched once, and
+        a failing part is recorded in the snapshot errors instead of
+        aborting the others.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = {}
+
+        async def limited(fetch: Callable[[int], Awaitable], resource_id: int):
+            async with semaphore:
+                return await fetch(resource_id)
+
+        async def once(snapshot: PlantSnapshot, kind: str, fetch: Callable[[int], Awaitable], resource_id: int):
+            key = (kind, resource_id)
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(limited(fetch, resource_id))
+            try:
+                return await asyncio.shield(tasks[key])
+            except Exception as err:
+                snapshot.errors[key] = err
+                return None
+
+        async def plant_branch(snapshot: PlantSnapshot) -> None:
+            snapshot.plant = await once(snapshot, "plant", self.async_get_plant, snapshot.plant_id)
+            if snapshot.plant is None or snapshot.plant.raw_data.get("mainMeter") is None:
+                return
+            meter_id = snapshot.plant.main_meter
+            snapshot.meter, snapshot.meter_status = await asyncio.gather(
+                once(snapshot, "meter", self.async_get_meter, meter_id),
+                once(snapshot, "meter_status", self.async_get_meter_status, meter_id),
+            )
+
+        async def status_branch(snapshot: PlantSnapshot) -> None:
+            snapshot.status = await once(snapshot, "plant_status", self.async_get_plant_status, snapshot.plant_id)
+
+        async def trackers_branch(snapshot: PlantSnapshot) -> None:
+            snapshot.trackers = await once(snapshot, "trackers", self.async_get_trackers, snapshot.plant_id) or []
+            statuses = await asyncio.gather(*(
+                once(snapshot, "tracker_status", self.async_get_tracker_status, tracker.id)
+                for tracker in snapshot.trackers
+            ))
+            snapshot.tracker_statuses = {
+                tracker.id: status for tracker, status in zip(snapshot.trackers, statuses) if status is not None
+            }
+
+        snapshots = {plant_id: PlantSnapshot(plant_id) for plant_id in plant_ids}
+        try:
+            await asyncio.gather(*(
+                branch(snapshot)
+                for snapshot in snapshots.values()
+                for branch in (plant_branch, status_branch, trackers_branch)
+            ))
+        finally:
+            # The shielded requests outlive a cancelled caller otherwise.
+            for task in tasks.values():
+                task.cancel()
+        return snapshots
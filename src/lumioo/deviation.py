@@ -0,0 +1,175 @@
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Iterable, Optional, Union
+
+from .analyse import PowerPlantMinute, PowerSeriesRow
+from .solar import ProductionEstimate, SolarTimes
+
+
+class RunningStats:
+    """Class that keeps the mean, variance and extremes of a stream of values."""
+
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum", "recent", "alpha")
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        """Initialize empty running statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.recent = None
+        self.alpha = alpha
+
+    def update(self, value: float) -> None:
+        """Add a value (Welford's algorithm, plus an exponential moving average)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.recent = value if self.recent is None else self.recent + self.alpha * (value - self.recent)
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Return the sample standard deviation."""
+        return self.variance ** 0.5
+
+
+class _Window:
+    """Production measured so far in one estimate window."""
+
+    __slots__ = ("index", "actual", "minutes")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.actual = 0.0
+        self.minutes = 0
+
+
+class _Tracked:
+    """State kept for one plant or tracker."""
+
+    __slots__ = ("begins", "estimates", "share", "daylight", "window", "stats")
+
+    def __init__(self, alpha: float) -> None:
+        self.begins = []
+        self.estimates = []
+        self.share = 1.0
+        self.daylight = {}
+        self.window = None
+        self.stats = RunningStats(alpha)
+
+
+class DeviationDetector:
+    """Class that compares the measured production with the production estimates.
+
+    Production samples are accumulated per ProductionEstimate window, only
+    between sunrise and sunset when SolarTimes are known. When a window is
+    over, its actual/expected ratio feeds running statistics, so the state
+    kept per plant or tracker does not grow with history.
+
+    `minute_energy` converts a minute production sample to the unit of
+    ProductionEstimate.production: 1/60 turns W into Wh.
+    """
+
+    def __init__(self, threshold: float = 0.8, min_windows: int = 3, minute_energy: float = 1 / 60, alpha: float = 0.2) -> None:
+        """Initialize a deviation detector."""
+        self.threshold = threshold
+        self.min_windows = min_windows
+        self.minute_energy = minute_energy
+        self.alpha = alpha
+        self._tracked = {}  # type: Dict[Hashable, _Tracked]
+
+    def _get(self, key: Hashable) -> _Tracked:
+        tracked = self._tracked.get(key)
+        if tracked is None:
+            tracked = self._tracked[key] = _Tracked(self.alpha)
+        return tracked
+
+    def set_estimates(self, key: Hashable, estimates: Iterable[ProductionEstimate], share: float = 1.0) -> None:
+        """Set the production estimates of a plant or tracker.
+
+        `share` scales the estimates, e.g. to the part of the plant
+        production a tracker is expected to produce.
+        """
+        tracked = self._get(key)
+        self.flush(key)
+        windows = sorted((estimate.begin, estimate.end, estimate.production) for estimate in estimates)
+        tracked.begins = [begin for begin, _, _ in windows]
+        tracked.estimates = windows
+        tracked.share = share
+
+    def set_solar_times(self, key: Hashable, solar_times: SolarTimes) -> None:
+        """Set the sunrise and sunset of a day for a plant or tracker."""
+        sunrise = solar_times.sunrise
+        self._get(key).daylight[sunrise.date()] = (sunrise, solar_times.sunset)
+
+    def add_minute(self, key: Hashable, minute: Union[PowerPlantMinute, PowerSeriesRow]) -> Optional[float]:
+        """Add a power plant minute, see add_sample."""
+        return self.add_sample(key, minute.date, minute.production)
+
+    def add_sample(self, key: Hashable, when: datetime, production: float) -> Optional[float]:
+        """Add a one minute production sample.
+
+        Return the ratio of the window the sample closed, if any.
+        """
+        tracked = self._get(key)
+        daylight = tracked.daylight.get(when.date())
+        if daylight is not None and not daylight[0] <= when < daylight[1]:
+            return None
+
+        index = bisect_right(tracked.begins, when) - 1
+        if index < 0 or when >= tracked.estimates[index][1]:
+            return None
+
+        ratio = None
+        if tracked.window is not None and tracked.window.index != index:
+            ratio = self.flush(key)
+        if tracked.window is None:
+            tracked.window = _Window(index)
+            self._prune_daylight(tracked, when.date())
+        tracked.window.actual += production * self.minute_energy
+        tracked.window.minutes += 1
+        return ratio
+
+    @staticmethod
+    def _prune_daylight(tracked: _Tracked, day: date) -> None:
+        for known_day in [known_day for known_day in tracked.daylight if known_day < day - timedelta(days=1)]:
+            del tracked.daylight[known_day]
+
+    def flush(self, key: Hashable) -> Optional[float]:
+        """Close the current window of a plant or tracker and return its ratio."""
+        tracked = self._get(key)
+        window, tracked.window = tracked.window, None
+        if window is None:
+            return None
+
+        begin, end, production = tracked.estimates[window.index]
+        window_minutes = (end - begin).total_seconds() / 60
+        expected = production * tracked.share * min(window.minutes / window_minutes, 1.0)
+        if expected <= 0:
+            return None
+
+        ratio = window.actual / expected
+        tracked.stats.update(ratio)
+        return ratio
+
+    def stats(self, key: Hashable) -> RunningStats:
+        """Return the running actual/expected statistics of a plant or tracker."""
+        return self._get(key).stats
+
+    def underperforming(self, threshold: Optional[float] = None) -> Dict[Hashable, float]:
+        """Return the recent ratio of every plant or tracker below the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        return {
+            key: tracked.stats.recent
+            for key, tracked in self._tracked.items()
+            if tracked.stats.count >= self.min_windows and tracked.stats.recent < threshold
+        }
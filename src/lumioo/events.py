@@ -0,0 +1,196 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .meter import MeterStatus
+from .plant import PlantStatus
+from .tracker import TrackerStatus
+
+Status = Union[PlantStatus, TrackerStatus, MeterStatus]
+
+
+class StatusEvent:
+    """Base class of the events emitted when a watched status field changes."""
+
+    __slots__ = ("kind", "resource_id", "field", "previous", "current", "status")
+
+    def __init__(self, kind: str, resource_id: int, field: str, previous: Any, current: Any, status: Status) -> None:
+        """Initialize a status event."""
+        self.kind = kind
+        self.resource_id = resource_id
+        self.field = field
+        self.previous = previous
+        self.current = current
+        self.status = status
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(kind={self.kind!r}, resource_id={self.resource_id!r}, "
+            f"field={self.field!r}, previous={self.previous!r}, current={self.current!r})"
+        )
+
+
+class AlarmRaised(StatusEvent):
+    """An alarm field went up or got a new label."""
+
+    __slots__ = ()
+
+
+class AlarmCleared(StatusEvent):
+    """An alarm field went back to zero or lost its label."""
+
+    __slots__ = ()
+
+
+class SyncLost(StatusEvent):
+    """The resource stopped being synchronised."""
+
+    __slots__ = ()
+
+
+class SyncRestored(StatusEvent):
+    """The resource is synchronised again."""
+
+    __slots__ = ()
+
+
+class StatusLevelChanged(StatusEvent):
+    """The level of the status type changed."""
+
+    __slots__ = ()
+
+
+class WindSpeedThresholdExceeded(StatusEvent):
+    """A wind speed reported by a tracker went above the threshold."""
+
+    __slots__ = ()
+
+
+# Fields compared for each kind of status, as (name, path in raw_data).
+WATCHED_FIELDS = {
+    "plant": (
+        ("isSynchronised", ("isSynchronised",)),
+        ("statusType.level", ("statusType", "level")),
+        ("alarmLevel1", ("alarmLevel1",)),
+        ("alarmLevel2", ("alarmLevel2",)),
+        ("alarmLevel3", ("alarmLevel3",)),
+    ),
+    "tracker": (
+        ("isSynchronised", ("isSynchronised",)),
+        ("statusType.level", ("statusType", "level")),
+        ("alarms", ("alarms",)),
+        ("control.alarmLabel", ("control", "alarmLabel")),
+        ("maxWindSpeed20", ("maxWindSpeed20",)),
+        ("control.maxWindSpeed", ("control", "maxWindSpeed")),
+    ),
+    "meter": (
+        ("isSynchronised", ("isSynchronised",)),
+    ),
+}
+
+WIND_FIELDS = ("maxWindSpeed20", "control.maxWindSpeed")
+
+
+def _lookup(raw_data: dict, path: Tuple[str, ...]) -> Any:
+    value = raw_data
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class ChangeDetector:
+    """Class that turns successive statuses into typed change events.
+
+    Only the watched fields of the last status of each resource are kept,
+    as a tuple, so an unchanged status costs a single tuple comparison.
+    Events are returned by `observe` and put on `queue`; when the queue is
+    full the oldest events are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, wind_speed_threshold: float = 15.0, maxsize: int = 10000, emit_initial: bool = False) -> None:
+        """Initialize a change detector.
+
+        With `emit_initial`, the first status of a resource is compared to
+        a clear, synchronised state, so alarms already raised are reported.
+        """
+        self.wind_speed_threshold = wind_speed_threshold
+        self.emit_initial = emit_initial
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._queue = None  # type: Optional[asyncio.Queue[StatusEvent]]
+        self._states = {}  # type: Dict[Tuple[str, int], tuple]
+
+    @property
+    def queue(self) -> "asyncio.Queue[StatusEvent]":
+        """Return the queue of events.
+
+        It is created on first use, in the running loop: Python < 3.10 binds
+        it to the current loop.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxsize)
+        return self._queue
+
+    def _initial_state(self, kind: str) -> tuple:
+        return tuple(True if name == "isSynchronised" else None for name, _ in WATCHED_FIELDS[kind])
+
+    def observe(self, kind: str, resource_id: int, status: Status) -> List[StatusEvent]:
+        """Compare a status with the previous one of the same resource."""
+        fields = WATCHED_FIELDS[kind]
+        raw_data = status.raw_data
+        state = tuple(_lookup(raw_data, path) for _, path in fields)
+
+        key = (kind, resource_id)
+        previous_state = self._states.get(key)
+        self._states[key] = state
+        if previous_state is None:
+            if not self.emit_initial:
+                return []
+            previous_state = self._initial_state(kind)
+        if state == previous_state:
+            return []
+
+        events = []
+        for (name, _), previous, current in zip(fields, previous_state, state):
+            if previous == current:
+                continue
+            event_type = self._event_type(name, previous, current)
+            if event_type is not None:
+                events.append(event_type(kind, resource_id, name, previous, current, status))
+
+        for event in events:
+            self._publish(event)
+        return events
+
+    def _event_type(self, name: str, previous: Any, current: Any) -> Optional[type]:
+        if name == "isSynchronised":
+            if previous is not None and not current:
+                return SyncLost
+            return SyncRestored if current and previous is not None else None
+        if name == "statusType.level":
+            return StatusLevelChanged
+        if name in WIND_FIELDS:
+            threshold = self.wind_speed_threshold
+            if current is not None and current > threshold and (previous is None or previous <= threshold):
+                return WindSpeedThresholdExceeded
+            return None
+        if isinstance(current, str) or isinstance(previous, str):
+            return AlarmRaised if current else AlarmCleared
+        if current and (not previous or current > previous):
+            return AlarmRaised
+        if not current and previous:
+            return AlarmCleared
+        return None
+
+    def _publish(self, event: StatusEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.queue.put_nowait(event)
+
+    def forget(self, kind: str, resource_id: int) -> None:
+        """Drop the state kept for a resource."""
+        self._states.pop((kind, resource_id), None)
@@ -1,35 +1,35 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from .auth import Auth
+from .models import Model, cached_field, iri_to_id
 
+if TYPE_CHECKING:
+    from .auth import Auth
 
-class Meter:
+
+class Meter(Model):
     """Class that represents a Meter object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth):
-        """Initialize a meter object."""
-        self.raw_data = raw_data
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth"):
+        """Initialize a meter object."""
+        super().__init__(raw_data, auth)
 
     @property
     def id(self) -> int:
         """Return the ID of the meter."""
         return self.raw_data["id"]
 
-    @property
+    @cached_field
     def type_id(self) -> int:
         """Return the type ID of the meter."""
-        type = self.raw_data["type"].split("/")
-        return type[-1]
+        return iri_to_id(self.raw_data["type"])
 
-    @property
+    @cached_field
     def plant_id(self) -> int:
         """Return the plant ID of the meter."""
-        plant = self.raw_data["plant"].split("/")
-        return plant[-1]
+        return iri_to_id(self.raw_data["plant"])
 
     async def async_update(self):
         """Update the meter data."""
@@ -38,16 +38,14 @@ class Meter:
         self.raw_data = await resp.json()
 
 
-class MeterStatus:
+class MeterStatus(Model):
     """Class that represents a MeterStatus object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth) -> None:
-        """Initialize a meter status object."""
-        self.raw_data = raw_data
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth") -> None:
+        """Initialize a meter status object."""
+        super().__init__(raw_data, auth)
 
     @property
     def id(self) -> int:
@@ -59,12 +57,12 @@ class MeterStatus:
         """Return if the meter is synchronised."""
         return self.raw_data["isSynchronised"]
 
-    @property
+    @cached_field
     def latest_synchronisation(self) -> datetime:
         """Return the latest synchronisation date of the meter."""
         return datetime.fromisoformat(self.raw_data["latestSynchronisation"])
 
-    @property
+    @cached_field
     def date(self) -> datetime:
         """Return the data date of the meter."""
         return datetime.fromisoformat(self.raw_data["data"]["date"])
@@ -0,0 +1,139 @@
+import time
+from typing import Optional
+
+from .utils import endpoint_family
+
+
+class RequestTrace:
+    """Class that collects the timings of one API call.
+
+    Times are in seconds from the start of the call: `wait_time` is spent
+    in the rate limiter, `ttfb` ends when the response headers arrived and
+    `total_time` once the body was read. `decode_time` and `build_time` are
+    spent decoding the JSON and building the model objects.
+    """
+
+    __slots__ = (
+        "method", "path", "family", "start", "start_time_ns", "status", "wait_time", "ttfb", "total_time",
+        "bytes_received", "decode_time", "build_time", "retries", "cache_hit", "coalesced", "error",
+    )
+
+    def __init__(self, method: str, path: str) -> None:
+        """Initialize a request trace starting now."""
+        self.method = method.lower()
+        self.path = path
+        self.family = endpoint_family(path)
+        self.start = time.perf_counter()
+        self.start_time_ns = time.time_ns()
+        self.status = None  # type: Optional[int]
+        self.wait_time = 0.0
+        self.ttfb = None  # type: Optional[float]
+        self.total_time = None  # type: Optional[float]
+        self.bytes_received = None  # type: Optional[int]
+        self.decode_time = None  # type: Optional[float]
+        self.build_time = None  # type: Optional[float]
+        self.retries = 0
+        self.cache_hit = False
+        self.coalesced = False
+        self.error = None  # type: Optional[str]
+
+    def elapsed(self) -> float:
+        """Return the time since the start of the call."""
+        return time.perf_counter() - self.start
+
+
+class Instrumentation:
+    """Base class receiving the trace of every API call.
+
+    The base class is disabled: no trace is created at all, so it costs
+    nothing on the request path.
+    """
+
+    enabled = False
+
+    def record(self, trace: RequestTrace) -> None:
+        """Receive the trace of a finished API call."""
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class PrometheusInstrumentation(Instrumentation):
+    """Class that exports the API calls as prometheus_client metrics."""
+
+    enabled = True
+
+    def __init__(self, registry=None, namespace: str = "lumioo") -> None:
+        """Initialize the Prometheus metrics."""
+        from prometheus_client import REGISTRY, Counter, Histogram
+
+        registry = REGISTRY if registry is None else registry
+        self.requests = Counter(
+            f"{namespace}_requests_total", "API calls.", ["family", "method", "status"], registry=registry,
+        )
+        self.durations = Histogram(
+            f"{namespace}_request_phase_seconds", "Time spent in each phase of the API calls.",
+            ["family", "phase"], registry=registry,
+        )
+        self.bytes_received = Counter(
+            f"{namespace}_response_bytes_total", "Bytes received from the API.", ["family"], registry=registry,
+        )
+        self.retries = Counter(
+            f"{namespace}_retries_total", "API call retries.", ["family"], registry=registry,
+        )
+        self.cache_hits = Counter(
+            f"{namespace}_cache_hits_total", "API calls served from the response cache.", ["family"], registry=registry,
+        )
+
+    def record(self, trace: RequestTrace) -> None:
+        """Update the metrics with the trace of an API call."""
+        status = trace.error if trace.status is None else str(trace.status)
+        self.requests.labels(trace.family, trace.method, status).inc()
+        for phase in ("wait_time", "ttfb", "total_time", "decode_time", "build_time"):
+            value = getattr(trace, phase)
+            if value is not None:
+                self.durations.labels(trace.family, phase).observe(value)
+        if trace.bytes_received:
+            self.bytes_received.labels(trace.family).inc(trace.bytes_received)
+        if trace.retries:
+            self.retries.labels(trace.family).inc(trace.retries)
+        if trace.cache_hit:
+            self.cache_hits.labels(trace.family).inc()
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Class that reports the API calls as OpenTelemetry spans."""
+
+    enabled = True
+
+    def __init__(self, tracer=None) -> None:
+        """Initialize the OpenTelemetry tracer."""
+        from opentelemetry import trace
+
+        self.tracer = trace.get_tracer("lumioo") if tracer is None else tracer
+
+    def record(self, trace: RequestTrace) -> None:
+        """Emit the span of an API call."""
+        from opentelemetry.trace import Status, StatusCode
+
+        attributes = {
+            "http.request.method": trace.method.upper(),
+            "lumioo.endpoint_family": trace.family,
+            "lumioo.path": trace.path,
+            "lumioo.retries": trace.retries,
+            "lumioo.cache_hit": trace.cache_hit,
+        }
+        if trace.status is not None:
+            attributes["http.response.status_code"] = trace.status
+        for phase in ("wait_time", "ttfb", "decode_time", "build_time"):
+            value = getattr(trace, phase)
+            if value is not None:
+                attributes[f"lumioo.{phase}"] = value
+        if trace.bytes_received is not None:
+            attributes["http.response.body.size"] = trace.bytes_received
+
+        span = self.tracer.start_span(f"lumioo {trace.family}", start_time=trace.start_time_ns, attributes=attributes)
+        if trace.error is not None:
+            span.set_status(Status(StatusCode.ERROR, trace.error))
+        total_time = trace.total_time if trace.total_time is not None else trace.elapsed()
+        span.end(end_time=trace.start_time_ns + int(total_time * 1e9))
@@ -1,14 +1,71 @@
+from typing import Optional
 
-class StatusType:
-    """Class that represents a StatusType object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict) -> None:
-        """Initialize a status type object."""
-        self.raw_data = raw_data
+def iri_to_id(iri: Optional[str]) -> Optional[int]:
+    """Return the integer ID at the end of an IRI such as /v2/human/plants/12."""
+    if iri is None:
+        return None
+    return int(iri.rsplit("/", 1)[-1])
+
+
+class cached_field:
+    """Decorator for a property parsed once from raw_data.
+
+    The value is kept until raw_data is replaced, which is what every
+    `async_update` does.
+    """
+
+    def __init__(self, func) -> None:
+        """Initialize a cached field."""
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        cache = obj._cache
+        try:
+            return cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.func(obj)
+            return value
+
+
+class Model:
+    """Base class of the objects of the LumiooHub API."""
+
+    __slots__ = ("_raw_data", "_cache", "auth")
+
+    def __init__(self, raw_data: dict, auth=None) -> None:
+        """Initialize a model object."""
+        self._raw_data = raw_data
+        self._cache = {}
+        self.auth = auth
 
     def __getitem__(self, item):
         return getattr(self, item)
 
+    @property
+    def raw_data(self) -> dict:
+        """Return the raw data of the object."""
+        return self._raw_data
+
+    @raw_data.setter
+    def raw_data(self, raw_data: dict) -> None:
+        self._raw_data = raw_data
+        self._cache.clear()
+
+
+class StatusType(Model):
+    """Class that represents a StatusType object in the LumiooHub API."""
+
+    __slots__ = ()
+
+    def __init__(self, raw_data: dict) -> None:
+        """Initialize a status type object."""
+        super().__init__(raw_data)
+
     @property
     def type(self) -> str:
         """Return the status type."""
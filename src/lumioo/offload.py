@@ -0,0 +1,146 @@
+"""Decoding and aggregation of power plant minutes off the event loop.
+
+The functions run in a thread or process pool executor. They are module
+level so they can be pickled, and they exchange PowerSeries as ColumnBuffers:
+the raw bytes of each column, or a shared memory block holding all of them
+when the executor is a process pool and multiprocessing.shared_memory is
+available.
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .analyse import POWER_FIELDS, PowerSeries
+from .utils import json_loads
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+COLUMNS = ("ids", "timestamps", "utc_offsets") + tuple(POWER_FIELDS)
+
+# Hydra keys of a page kept next to its decoded members, for pagination.
+PAGE_KEYS = ("hydra:view", "hydra:totalItems")
+
+
+def use_shared_memory(executor: Optional[Executor]) -> bool:
+    """Return if columns should be handed back from an executor in shared memory."""
+    return shared_memory is not None and isinstance(executor, ProcessPoolExecutor)
+
+
+def _create_block(size: int) -> "shared_memory.SharedMemory":
+    """Return a new shared memory block that the resource tracker of this process leaves alone.
+
+    The reader of the block unlinks it. Python 3.13 does not track a block
+    created with track=False; older versions track every block on POSIX,
+    so it is unregistered right away.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    if os.name == "posix":
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+class ColumnBuffers:
+    """Class that holds the columns of a PowerSeries as bytes or in shared memory."""
+
+    __slots__ = ("length", "columns", "shm_name", "layout")
+
+    def __init__(
+        self,
+        length: int,
+        columns: Optional[Dict[str, bytes]] = None,
+        shm_name: Optional[str] = None,
+        layout: Optional[List[Tuple[str, int, int]]] = None,
+    ) -> None:
+        """Initialize column buffers."""
+        self.length = length
+        self.columns = columns
+        self.shm_name = shm_name
+        self.layout = layout
+
+    def __len__(self) -> int:
+        return self.length
+
+    @classmethod
+    def from_series(cls, series: PowerSeries, shared: bool = False) -> "ColumnBuffers":
+        """Return the columns of a series, in a new shared memory block when `shared`."""
+        if not shared or not len(series):
+            return cls(len(series), {name: getattr(series, name).tobytes() for name in COLUMNS})
+
+        layout = []
+        offset = 0
+        for name in COLUMNS:
+            size = len(getattr(series, name)) * getattr(series, name).itemsize
+            layout.append((name, offset, size))
+            offset += size
+        block = _create_block(offset)
+        try:
+            for name, start, size in layout:
+                block.buf[start:start + size] = memoryview(getattr(series, name)).cast("B")
+        finally:
+            block.close()
+        return cls(len(series), shm_name=block.name, layout=layout)
+
+    def to_series(self) -> PowerSeries:
+        """Return the series of the columns, releasing their shared memory block."""
+        series = PowerSeries()
+        if self.shm_name is None:
+            for name in COLUMNS:
+                getattr(series, name).frombytes(self.columns[name])
+            return series
+
+        block = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            for name, start, size in self.layout:
+                getattr(series, name).frombytes(block.buf[start:start + size])
+        finally:
+            block.close()
+            block.unlink()
+        return series
+
+    def release(self) -> None:
+        """Release the shared memory block of columns that will not be read."""
+        if self.shm_name is not None:
+            block = shared_memory.SharedMemory(name=self.shm_name)
+            block.close()
+            block.unlink()
+            self.shm_name = None
+
+
+def decode_power_page(body: bytes, shared: bool = False) -> dict:
+    """Return a power plant minutes page with its members decoded to ColumnBuffers."""
+    data = json_loads(body)
+    page = {key: data[key] for key in PAGE_KEYS if key in data}
+    page["hydra:member"] = ColumnBuffers.from_series(PowerSeries.from_members(data["hydra:member"]), shared)
+    return page
+
+
+def release_columns(page: dict) -> None:
+    """Release the columns of a decoded page nobody will read."""
+    page["hydra:member"].release()
+
+
+def release_page(future: "asyncio.Future") -> None:
+    """Release the columns of a decoded page nobody will read, once it is done."""
+    if not future.cancelled() and future.exception() is None:
+        release_columns(future.result())
+
+
+def resample_columns(columns: ColumnBuffers, seconds: int, how: str = "mean", shared: bool = False) -> ColumnBuffers:
+    """Return the columns of a series resampled with PowerSeries.resample."""
+    return ColumnBuffers.from_series(columns.to_series().resample(seconds, how), shared)
+
+
+async def async_resample(series: PowerSeries, seconds: int, how: str = "mean", executor: Optional[Executor] = None) -> PowerSeries:
+    """Return a series resampled in an executor."""
+    loop = asyncio.get_running_loop()
+    columns = await loop.run_in_executor(
+        executor, resample_columns, ColumnBuffers.from_series(series), seconds, how, use_shared_memory(executor),
+    )
+    return columns.to_series()
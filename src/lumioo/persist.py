@@ -0,0 +1,103 @@
+import base64
+import json
+import os
+import struct
+import time
+import zlib
+from typing import List, Tuple
+
+from .cache import CacheEntry, ResponseCache
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAGIC = b"LMSN"
+VERSION = 1
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+_HEADER = struct.Struct(">4sBB")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot cannot be read."""
+
+
+def dump_entries(entries: List[Tuple[str, CacheEntry]]) -> bytes:
+    """Return the compact binary snapshot of cache entries.
+
+    The snapshot is a magic, a format version and a codec byte followed by
+    the zlib compressed entries, encoded with msgpack when installed and
+    JSON otherwise.
+    """
+    rows = [
+        [key, entry.url, entry.status, [list(header) for header in entry.headers], entry.body, entry.expires]
+        for key, entry in entries
+    ]
+    if msgpack is not None:
+        codec = CODEC_MSGPACK
+        payload = msgpack.packb([time.time(), rows], use_bin_type=True)
+    else:
+        codec = CODEC_JSON
+        for row in rows:
+            row[4] = base64.b64encode(row[4]).decode("ascii")
+        payload = json.dumps([time.time(), rows], separators=(",", ":")).encode()
+    return _HEADER.pack(MAGIC, VERSION, codec) + zlib.compress(payload)
+
+
+def load_entries(data: bytes) -> List[Tuple[str, CacheEntry]]:
+    """Return the cache entries of a binary snapshot."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, codec = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("Not a lumioo snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    try:
+        payload = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as err:
+        raise SnapshotError("Snapshot is corrupted") from err
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise SnapshotError("Snapshot was written with msgpack, which is not installed")
+        _, rows = msgpack.unpackb(payload, raw=False)
+    elif codec == CODEC_JSON:
+        _, rows = json.loads(payload)
+        for row in rows:
+            row[4] = base64.b64decode(row[4])
+    else:
+        raise SnapshotError(f"Unknown snapshot codec {codec}")
+
+    return [
+        (key, CacheEntry(url, status, [tuple(header) for header in headers], body, expires))
+        for key, url, status, headers, body, expires in rows
+    ]
+
+
+def save_cache(cache: ResponseCache, path: str) -> int:
+    """Write the entries of a cache to a snapshot file and return their number."""
+    entries = list(cache.items())
+    data = dump_entries(entries)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    return len(entries)
+
+
+def load_cache(cache: ResponseCache, path: str, grace: float = 0) -> List[str]:
+    """Load the entries of a snapshot file into a cache and return their keys.
+
+    Entries are kept fresh for at least `grace` seconds, so they can be
+    served while they get revalidated.
+    """
+    with open(path, "rb") as f:
+        entries = load_entries(f.read())
+    expires = time.time() + grace
+    for key, entry in entries:
+        entry.expires = max(entry.expires, expires)
+        cache.set(key, entry)
+    return [key for key, _ in entries]
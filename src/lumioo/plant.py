@@ -1,30 +1,30 @@
 from datetime import datetime, date, timedelta
+from typing import TYPE_CHECKING
 
-from .auth import Auth
-from .models import StatusType
+from .models import Model, StatusType, cached_field, iri_to_id
 
+if TYPE_CHECKING:
+    from .auth import Auth
 
-class Plant:
+
+class Plant(Model):
     """Class that represents a Plant object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth):
-        """Initialize a plant object."""
-        self.raw_data = raw_data
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth"):
+        """Initialize a plant object."""
+        super().__init__(raw_data, auth)
 
     @property
     def id(self) -> int:
         """Return the ID of the plant."""
         return self.raw_data["id"]
 
-    @property
+    @cached_field
     def user(self) -> int:
         """Return the user ID of the plant."""
-        user = self.raw_data["user"].split("/")
-        return user[-1]
+        return iri_to_id(self.raw_data["user"])
 
     @property
     def name(self) -> str:
@@ -41,7 +41,7 @@ class Plant:
         """Return the timezone of the plant."""
         return self.raw_data["timezone"]
 
-    @property
+    @cached_field
     def operation_date(self) -> datetime:
         """Return the operation date of the plant."""
         return datetime.fromisoformat(self.raw_data["operationDate"])
@@ -71,11 +71,10 @@ class Plant:
         """Return the nominal power of the plant."""
         return self.raw_data["nominalPower"]
 
-    @property
+    @cached_field
     def main_meter(self) -> int:
         """Return the main meter ID of the plant."""
-        meter = self.raw_data["mainMeter"].split("/")
-        return meter[-1]
+        return iri_to_id(self.raw_data["mainMeter"])
 
     async def async_update(self):
         """Update the plant data."""
@@ -84,16 +83,14 @@ class Plant:
         self.raw_data = await resp.json()
 
 
-class PlantStatus:
+class PlantStatus(Model):
     """Class that represents a PlantStatus object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth) -> None:
-        """Initialize a plant status object."""
-        self.raw_data = raw_data["hydra:member"][0]
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth") -> None:
+        """Initialize a plant status object."""
+        super().__init__(raw_data["hydra:member"][0], auth)
 
     @property
     def type(self) -> str:
@@ -105,7 +102,7 @@ class PlantStatus:
         """Return the ID of the plant status."""
         return self.raw_data["id"]
 
-    @property
+    @cached_field
     def latest_synchronisation(self) -> datetime:
         """Return the latest synchronisation date of the plant."""
         return datetime.fromisoformat(self.raw_data["latestSynchronisation"])
@@ -115,7 +112,7 @@ class PlantStatus:
         """Return if the plant is synchronised."""
         return self.raw_data["isSynchronised"]
 
-    @property
+    @cached_field
     def status_type(self) -> StatusType:
         """Return the StatusType of the plant."""
         return StatusType(self.raw_data["statusType"])
@@ -137,30 +134,29 @@ class PlantStatus:
 
     async def async_update(self) -> None:
         """Update the plant status data."""
-        resp = await self.auth.request("get", f"plant_statuses?plant=/v2/human/plants/{self.id}")
+        plant = self.raw_data.get("plant") or f"/v2/human/plants/{self.id}"
+        resp = await self.auth.request("get", f"plant_statuses?plant={plant}")
         resp.raise_for_status()
         json_data = await resp.json()
         self.raw_data = json_data["hydra:member"][0]
 
 
-class PlantEnergyDay:
+class PlantEnergyDay(Model):
     """Class that represents a PlantEnergyDay object in the LumiooHub API."""
 
-    def __init__(self, plant_id: str, raw_data: dict, auth: Auth) -> None:
+    __slots__ = ("plant_id",)
+
+    def __init__(self, plant_id: str, raw_data: dict, auth: "Auth") -> None:
         """Initialize a plant energy day object."""
+        super().__init__(raw_data, auth)
         self.plant_id = plant_id
-        self.raw_data = raw_data
-        self.auth = auth
-
-    def __getitem__(self, item):
-        return getattr(self, item)
 
     @property
     def type(self) -> str:
         """Return the type."""
         return self.raw_data["@type"]
 
-    @property
+    @cached_field
     def date(self) -> datetime:
         """Return the date."""
         return datetime.fromisoformat(self.raw_data["date"])
@@ -194,7 +190,7 @@ class PlantEnergyDay:
 
     async def async_update(self) -> None:
         """Update the plant energy day data."""
-        dt = datetime.fromisoformat(self.date)
+        dt = self.date
         day = date(dt.year, dt.month, dt.day)
         next_day_dt = dt + timedelta(days=1)
         next_day = date(next_day_dt.year, next_day_dt.month, next_day_dt.day)
@@ -202,7 +198,7 @@ class PlantEnergyDay:
         date_after = day.isoformat()
         date_strictly_before = next_day.isoformat()
 
-        resp = await self.auth.request("get", f"energy_plant_days?plant=/v2/human/plants/{self.plant_id}&date[after]={date_after}&date[strictly_before]={date_strictly_before}&page={page}")
+        resp = await self.auth.request("get", f"energy_plant_days?plant=/v2/human/plants/{self.plant_id}&date[after]={date_after}&date[strictly_before]={date_strictly_before}")
         resp.raise_for_status()
         json_data = await resp.json()
         self.raw_data = json_data["hydra:member"][0]
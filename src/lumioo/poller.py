@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import random
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple, Union
+
+from .core import LumiooHubAPI
+from .events import ChangeDetector
+from .meter import MeterStatus
+from .plant import PlantStatus
+from .scheduler import SolarScheduler
+from .tracker import TrackerStatus
+from .utils import client_errors
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVALS = {
+    "plant": 300.0,
+    "tracker": 60.0,
+    "meter": 300.0,
+}
+
+
+class StatusChange(NamedTuple):
+    """A status whose watched fields changed since the previous poll."""
+
+    kind: str
+    resource_id: int
+    status: Union[PlantStatus, TrackerStatus, MeterStatus]
+
+
+def status_fingerprint(status: Union[PlantStatus, TrackerStatus, MeterStatus]) -> Tuple:
+    """Return the fields of a status that are compared between polls."""
+    raw_data = status.raw_data
+    if isinstance(status, TrackerStatus):
+        alarms = raw_data.get("alarms")
+    elif isinstance(status, PlantStatus):
+        alarms = (raw_data.get("alarmLevel1"), raw_data.get("alarmLevel2"), raw_data.get("alarmLevel3"))
+    else:
+        alarms = raw_data.get("isSynchronised")
+    level = (raw_data.get("statusType") or {}).get("level")
+    return raw_data.get("latestSynchronisation"), alarms, level
+
+
+class FleetPoller:
+    """Class that polls the statuses of many plants, trackers and meters.
+
+    Each resource is polled on its own schedule: the first polls are spread
+    evenly over the interval of their kind and every following poll gets a
+    random jitter, so the request rate stays steady instead of bursting on a
+    shared tick. Only statuses whose fingerprint changed are published.
+
+    With a `scheduler`, the jittered interval is adapted to daylight and
+    wind by SolarScheduler.async_delay.
+
+    A failing poll is logged and the resource is polled again after its
+    delay; polling only stops with `async_stop`.
+    """
+
+    def __init__(
+        self,
+        api: LumiooHubAPI,
+        plant_ids: Iterable[int] = (),
+        tracker_ids: Iterable[int] = (),
+        meter_ids: Iterable[int] = (),
+        intervals: Optional[Dict[str, float]] = None,
+        jitter: float = 0.1,
+        concurrency: int = 10,
+        detector: Optional[ChangeDetector] = None,
+        scheduler: Optional[SolarScheduler] = None,
+    ) -> None:
+        """Initialize a fleet poller.
+
+        Every polled status is also fed to `detector` when one is given.
+        """
+        self.api = api
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.jitter = jitter
+        self.detector = detector
+        self.scheduler = scheduler
+        self.resources = (
+            [("plant", plant_id) for plant_id in plant_ids]
+            + [("tracker", tracker_id) for tracker_id in tracker_ids]
+            + [("meter", meter_id) for meter_id in meter_ids]
+        )
+        self.concurrency = concurrency
+        self._semaphore = None  # type: Optional[asyncio.Semaphore]
+        self._fingerprints = {}
+        self._subscribers = []
+        self._tasks = []
+        self.dropped = 0
+
+    def subscribe(self, maxsize: int = 0) -> "asyncio.Queue[StatusChange]":
+        """Return a queue receiving every status change.
+
+        A slow subscriber does not hold up polling: when its queue is full,
+        the oldest change is dropped and counted in `dropped`.
+        """
+        queue = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[StatusChange]") -> None:
+        """Stop publishing status changes to a queue."""
+        self._subscribers.remove(queue)
+
+    async def async_fetch_status(self, kind: str, resource_id: int) -> Union[PlantStatus, TrackerStatus, MeterStatus]:
+        """Return the current status of a resource."""
+        if kind == "plant":
+            return await self.api.async_get_plant_status(resource_id)
+        if kind == "tracker":
+            return await self.api.async_get_tracker_status(resource_id)
+        return await self.api.async_get_meter_status(resource_id)
+
+    async def async_poll(self, kind: str, resource_id: int) -> Optional[StatusChange]:
+        """Poll a resource once and publish its status if it changed."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            status = await self.async_fetch_status(kind, resource_id)
+
+        if self.detector is not None:
+            self.detector.observe(kind, resource_id, status)
+        if self.scheduler is not None:
+            self.scheduler.observe(kind, resource_id, status)
+
+        fingerprint = status_fingerprint(status)
+        if self._fingerprints.get((kind, resource_id)) == fingerprint:
+            return None
+        self._fingerprints[(kind, resource_id)] = fingerprint
+
+        change = StatusChange(kind, resource_id, status)
+        for queue in self._subscribers:
+            self._publish(queue, change)
+        return change
+
+    def _publish(self, queue: "asyncio.Queue[StatusChange]", change: StatusChange) -> None:
+        try:
+            queue.put_nowait(change)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            self.dropped += 1
+            queue.put_nowait(change)
+
+    def next_delay(self, kind: str, resource_id: int) -> float:
+        """Return the delay before the next poll of a resource."""
+        interval = self.intervals[kind]
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def async_next_delay(self, kind: str, resource_id: int) -> float:
+        """Return the delay before the next poll of a resource, adapted by the scheduler."""
+        delay = self.next_delay(kind, resource_id)
+        if self.scheduler is None:
+            return delay
+        return await self.scheduler.async_delay(kind, resource_id, delay)
+
+    async def _async_run(self, kind: str, resource_id: int, offset: float) -> None:
+        await asyncio.sleep(offset)
+        while True:
+            try:
+                await self.async_poll(kind, resource_id)
+            except client_errors() as err:
+                _LOGGER.debug("Polling %s %s failed: %r", kind, resource_id, err)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception("Unexpected error polling %s %s", kind, resource_id)
+
+            try:
+                delay = await self.async_next_delay(kind, resource_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception("Unexpected error scheduling %s %s", kind, resource_id)
+                delay = self.next_delay(kind, resource_id)
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """Start polling every resource."""
+        if self._tasks:
+            return
+        # Created here, in the running loop: Python < 3.10 binds it to the current loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        counts = {}
+        for kind, _ in self.resources:
+            counts[kind] = counts.get(kind, 0) + 1
+        slots = {}
+        for kind, resource_id in self.resources:
+            slot = slots.get(kind, 0)
+            slots[kind] = slot + 1
+            offset = self.intervals[kind] * slot / counts[kind]
+            self._tasks.append(asyncio.ensure_future(self._async_run(kind, resource_id, offset)))
+
+    async def async_stop(self) -> None:
+        """Stop polling and wait for the polling tasks to finish."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self) -> "FleetPoller":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.async_stop()
@@ -0,0 +1,155 @@
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Hashable, Iterator, Optional
+
+from .auth import Auth, PoolStats, PoolTracer, create_session, pool_stats
+from .cache import ResponseCache
+from .core import LumiooHubAPI
+from .ratelimit import FairScheduler, RateLimiter
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class AccountRateLimiter(RateLimiter):
+    """Class that waits for the fair share of an account in the pool budget, then its own budget.
+
+    The account token is only taken once its turn came, so an account
+    queued behind the others does not hold its own budget meanwhile.
+    """
+
+    def __init__(
+        self,
+        account: Hashable,
+        rate: Optional[float] = None,
+        family_rates: Optional[Dict[str, float]] = None,
+        scheduler: Optional[FairScheduler] = None,
+    ) -> None:
+        """Initialize an account rate limiter."""
+        super().__init__(rate, family_rates)
+        self.account = account
+        self.scheduler = scheduler
+
+    async def acquire(self, family: str) -> float:
+        """Wait for the budgets of a request and return the time waited."""
+        waited = 0.0
+        if self.scheduler is not None:
+            waited += await self.scheduler.acquire(self.account)
+        return waited + await super().acquire(family)
+
+
+class ClientPool:
+    """Class that serves many accounts over a shared connection pool.
+
+    Every account gets its own Auth, holding its access token, rate budget,
+    cache and token refresher, and its own LumiooHubAPI. All of them share
+    one session. With a pool `rate`, the requests of all accounts are also
+    admitted in round robin under that rate, so an account with a large
+    backlog cannot starve the others. A throttled account only slows down
+    itself.
+    """
+
+    def __init__(
+        self,
+        websession: Optional["ClientSession"] = None,
+        rate: Optional[float] = None,
+        account_rate: Optional[float] = None,
+        family_rates: Optional[Dict[str, float]] = None,
+        cache_factory: Optional[Callable[[], ResponseCache]] = None,
+        session_options: Optional[dict] = None,
+        pool_tracer: Optional[PoolTracer] = None,
+        **auth_options,
+    ) -> None:
+        """Initialize a client pool.
+
+        Without a websession, the pool opens one with create_session(),
+        called with `session_options` and followed by a PoolTracer, and
+        closes it in `close()`. A websession given here is followed when it
+        was created with the `pool_tracer` passed along. Caches
+        are never shared between accounts: each gets one from
+        `cache_factory`. Other keyword arguments are passed to every Auth.
+        """
+        self.websession = websession
+        self.session_options = session_options or {}
+        self._owns_session = websession is None
+        if pool_tracer is None and self._owns_session:
+            pool_tracer = PoolTracer()
+        self.pool_tracer = pool_tracer
+        self.scheduler = FairScheduler(rate) if rate is not None else None
+        self.account_rate = account_rate
+        self.family_rates = family_rates
+        self.cache_factory = cache_factory
+        self.auth_options = auth_options
+        self._apis = {}  # type: Dict[Hashable, LumiooHubAPI]
+
+    def add_account(
+        self,
+        account: Hashable,
+        access_token: str,
+        rate: Optional[float] = None,
+        token_refresher: Optional[Callable[[], Awaitable[str]]] = None,
+    ) -> LumiooHubAPI:
+        """Add an account and return its API.
+
+        `rate` overrides the account rate of the pool for this account.
+        """
+        if account in self._apis:
+            raise ValueError(f"Account {account!r} is already in the pool")
+        if self.websession is None:
+            self.websession = create_session(tracer=self.pool_tracer, **self.session_options)
+
+        rate_limiter = None
+        account_rate = rate if rate is not None else self.account_rate
+        if account_rate is not None or self.family_rates or self.scheduler is not None:
+            rate_limiter = AccountRateLimiter(account, account_rate, self.family_rates, self.scheduler)
+        auth = Auth(
+            self.websession,
+            access_token,
+            cache=self.cache_factory() if self.cache_factory is not None else None,
+            rate_limiter=rate_limiter,
+            token_refresher=token_refresher,
+            pool_tracer=self.pool_tracer,
+            **self.auth_options,
+        )
+        api = self._apis[account] = LumiooHubAPI(auth)
+        return api
+
+    def remove_account(self, account: Hashable) -> None:
+        """Remove an account from the pool."""
+        del self._apis[account]
+
+    def __getitem__(self, account: Hashable) -> LumiooHubAPI:
+        return self._apis[account]
+
+    def __contains__(self, account: Hashable) -> bool:
+        return account in self._apis
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._apis)
+
+    def __len__(self) -> int:
+        return len(self._apis)
+
+    async def async_refresh_token(self, account: Hashable) -> str:
+        """Refresh the access token of an account and return it."""
+        return await self._apis[account].auth.async_refresh_token()
+
+    def set_access_token(self, account: Hashable, access_token: str) -> None:
+        """Replace the access token of an account; requests in flight keep the previous one."""
+        self._apis[account].auth.access_token = access_token
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """Return the occupation of the shared connection pool, if a followed session is open."""
+        if self.pool_tracer is None or self.websession is None or self.websession.connector is None:
+            return None
+        return pool_stats(self.websession, self.pool_tracer)
+
+    async def close(self) -> None:
+        """Close the shared session if it was opened by the pool."""
+        if self._owns_session and self.websession is not None:
+            await self.websession.close()
+            self.websession = None
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,166 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """Class that spaces requests out to a rate, allowing bursts up to a capacity.
+
+    The rate adapts: `throttle` cuts it when the API pushes back and
+    `recover` grows it back towards its configured value.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Initialize a token bucket of `rate` tokens per second."""
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self) -> float:
+        """Take a token, waiting for it if needed, and return the time waited."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        # The token is reserved: the debt is paid back before the next caller.
+        delay = -self.tokens / self.rate
+        await asyncio.sleep(delay)
+        return delay
+
+    def throttle(self, factor: float = 0.5) -> None:
+        """Reduce the rate after the API signalled too many requests."""
+        self.rate = max(self.rate * factor, self.max_rate / 100)
+
+    def recover(self, factor: float = 0.05) -> None:
+        """Grow the rate back by a fraction of its configured value."""
+        self.rate = min(self.rate + self.max_rate * factor, self.max_rate)
+
+
+class RateLimiter:
+    """Class that enforces a global request rate and per endpoint family rates.
+
+    Without a global `rate`, only the endpoint family rates are enforced.
+    """
+
+    def __init__(self, rate: Optional[float], family_rates: Optional[Dict[str, float]] = None) -> None:
+        """Initialize a rate limiter."""
+        self.bucket = TokenBucket(rate) if rate is not None else None
+        self.family_buckets = {family: TokenBucket(family_rate) for family, family_rate in (family_rates or {}).items()}
+
+    async def acquire(self, family: str) -> float:
+        """Wait for the budgets of a request and return the time waited."""
+        waited = 0.0
+        family_bucket = self.family_buckets.get(family)
+        if family_bucket is not None:
+            waited += await family_bucket.acquire()
+        if self.bucket is not None:
+            waited += await self.bucket.acquire()
+        return waited
+
+    def throttle(self, family: str) -> None:
+        """Reduce the rates used by an endpoint family."""
+        if self.bucket is not None:
+            self.bucket.throttle()
+        if family in self.family_buckets:
+            self.family_buckets[family].throttle()
+
+    def recover(self, family: str) -> None:
+        """Grow back the rates used by an endpoint family."""
+        if self.bucket is not None:
+            self.bucket.recover()
+        if family in self.family_buckets:
+            self.family_buckets[family].recover()
+
+
+class FairScheduler:
+    """Class that shares a request rate between clients in round robin.
+
+    Clients waiting for a token are served in turn, one token each, so a
+    client with many queued requests cannot delay the others by more than
+    one token per round.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Initialize a fair scheduler of `rate` tokens per second."""
+        self.bucket = TokenBucket(rate, capacity)
+        self._queues = OrderedDict()  # type: OrderedDict[Hashable, Deque[asyncio.Future]]
+        self._dispatcher = None  # type: Optional[asyncio.Future]
+
+    async def acquire(self, client: Hashable) -> float:
+        """Wait for the turn of a client to take a token and return the time waited."""
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(client, deque()).append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._async_dispatch())
+        await future
+        return time.monotonic() - start
+
+    async def _async_dispatch(self) -> None:
+        """Hand out tokens to the waiting clients in turn until none is left."""
+        while self._queues:
+            client, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            if future.done():
+                continue
+            await self.bucket.acquire()
+            if not future.done():
+                future.set_result(None)
+
+
+class RetryPolicy:
+    """Class that decides which requests are retried and how long to wait."""
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses=frozenset((429, 500, 502, 503, 504)),
+        methods=frozenset(("get", "head", "options")),
+    ) -> None:
+        """Initialize a retry policy."""
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        self.methods = methods
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Return if a request may be sent again after `attempt` retries."""
+        return attempt < self.retries and method.lower() in self.methods
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return the delay before a retry, honouring Retry-After when given."""
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds of a Retry-After header."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,140 @@
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .models import Model, iri_to_id
+from .plant import Plant, PlantStatus
+from .tracker import Tracker, TrackerStatus
+
+if TYPE_CHECKING:
+    from .core import LumiooHubAPI
+
+
+class RefreshFailure(NamedTuple):
+    """A model that could not be refreshed, with the error raised."""
+
+    model: Model
+    error: Exception
+
+
+class RefreshResult(NamedTuple):
+    """Outcome of a refresh, model by model."""
+
+    refreshed: List[Model]
+    failures: List[RefreshFailure]
+
+    @property
+    def ok(self) -> bool:
+        """Return if every model was refreshed."""
+        return not self.failures
+
+
+def _plant_of(model: Model) -> Optional[int]:
+    """Return the ID of the plant a status belongs to; a status ID is not its plant ID."""
+    return iri_to_id(model.raw_data.get("plant"))
+
+
+def _tracker_of(model: Model) -> Optional[int]:
+    """Return the ID of the tracker a status belongs to."""
+    return iri_to_id(model.raw_data.get("tracker"))
+
+
+async def _async_plants(api: "LumiooHubAPI", models: List[Plant], concurrency: int) -> Dict[int, dict]:
+    """Return the raw data of plants, from every page of the plants collection."""
+    return {plant.id: plant.raw_data async for plant in api.async_iter_plants(concurrency)}
+
+
+async def _async_plant_statuses(api: "LumiooHubAPI", models: List[PlantStatus], concurrency: int) -> Dict[int, dict]:
+    """Return the raw data of plant statuses, packed in few collection queries."""
+    plant_ids = [plant_id for plant_id in map(_plant_of, models) if plant_id is not None]
+    statuses = await api.async_get_plant_statuses(plant_ids, concurrency)
+    return {plant_id: status.raw_data for plant_id, status in statuses.items()}
+
+
+async def _async_tracker_statuses(api: "LumiooHubAPI", models: List[TrackerStatus], concurrency: int) -> Dict[int, dict]:
+    """Return the raw data of tracker statuses, packed in few collection queries."""
+    tracker_ids = [tracker_id for tracker_id in map(_tracker_of, models) if tracker_id is not None]
+    statuses = await api.async_get_tracker_statuses(tracker_ids, concurrency)
+    return {tracker_id: status.raw_data for tracker_id, status in statuses.items()}
+
+
+async def _async_trackers(api: "LumiooHubAPI", models: List[Tracker], concurrency: int) -> Dict[int, dict]:
+    """Return the raw data of trackers, from the trackers collection of their plants."""
+    plant_ids = {iri_to_id(model.raw_data["plant"]) for model in models if model.raw_data.get("plant")}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def plant_trackers(plant_id: int) -> List[Tracker]:
+        async with semaphore:
+            return await api.async_get_trackers(plant_id)
+
+    raw_data = {}
+    for trackers in await asyncio.gather(*(plant_trackers(plant_id) for plant_id in plant_ids)):
+        raw_data.update((tracker.id, tracker.raw_data) for tracker in trackers)
+    return raw_data
+
+
+# Model type -> coroutine returning the fresh raw data of models of that type, by key.
+BULK_REFRESHERS = {
+    Plant: _async_plants,
+    PlantStatus: _async_plant_statuses,
+    Tracker: _async_trackers,
+    TrackerStatus: _async_tracker_statuses,
+}  # type: Dict[type, Callable[[LumiooHubAPI, List, int], Awaitable[Dict[int, dict]]]]
+
+# Model type -> key of a model in the raw data of BULK_REFRESHERS, when it is not the model ID.
+REFRESH_KEYS = {
+    PlantStatus: _plant_of,
+    TrackerStatus: _tracker_of,
+}  # type: Dict[type, Callable[[Model], Optional[int]]]
+
+
+async def async_refresh_all(api: "LumiooHubAPI", models: Iterable[Model], concurrency: int = 10) -> RefreshResult:
+    """Refresh the raw data of many models in place.
+
+    Models are grouped by type. Types listed in BULK_REFRESHERS are fetched
+    with collection queries; the other models, and those a collection query
+    failed for or did not return, are updated with their own `async_update`,
+    at most `concurrency` at a time. A model failing to refresh is reported
+    in the result and keeps its previous data.
+    """
+    groups = {}  # type: Dict[type, List[Model]]
+    for model in models:
+        groups.setdefault(type(model), []).append(model)
+
+    refreshed = []
+    failures = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def update(model: Model) -> None:
+        try:
+            async with semaphore:
+                await model.async_update()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            failures.append(RefreshFailure(model, err))
+        else:
+            refreshed.append(model)
+
+    async def refresh_group(model_type: type, group: List[Model]) -> None:
+        remaining = group
+        bulk = BULK_REFRESHERS.get(model_type)
+        if bulk is not None:
+            try:
+                raw_data = await bulk(api, group, concurrency)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                raw_data = {}
+            key = REFRESH_KEYS.get(model_type)
+            remaining = []
+            for model in group:
+                model_key = model.id if key is None else key(model)
+                if model_key is not None and model_key in raw_data:
+                    model.raw_data = raw_data[model_key]
+                    refreshed.append(model)
+                else:
+                    remaining.append(model)
+        await asyncio.gather(*(update(model) for model in remaining))
+
+    await asyncio.gather(*(refresh_group(model_type, group) for model_type, group in groups.items()))
+    return RefreshResult(refreshed, failures)
@@ -0,0 +1,151 @@
+import json
+import struct
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .auth import API_PATH_PREFIX
+from .response import BufferedResponse
+
+MAGIC = b"LMRP"
+VERSION = 1
+
+_HEADER = struct.Struct(">4sB")
+_RECORD = struct.Struct(">II")
+
+
+class ReplayError(ValueError):
+    """Raised when a traffic log cannot be read."""
+
+
+class ReplayMissError(Exception):
+    """Raised when a replayed request was never recorded."""
+
+
+class Exchange:
+    """Class that represents one recorded request and its response."""
+
+    __slots__ = ("method", "path", "url", "status", "headers", "body")
+
+    def __init__(self, method: str, path: str, url: str, status: int, headers: List[Tuple[str, str]], body: bytes) -> None:
+        """Initialize an exchange."""
+        self.method = method
+        self.path = path
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def response(self) -> BufferedResponse:
+        """Return a response replaying the exchange."""
+        return BufferedResponse(self.method, self.url, self.status, self.headers, self.body)
+
+
+class TrafficRecorder:
+    """Class that appends API exchanges to a traffic log.
+
+    The log is a magic and a format version followed by one record per
+    exchange: the lengths of its JSON metadata and of its body, then both.
+    Records are only ever appended, so a log can be written by successive
+    runs and a record cut short by a crash is ignored when reading.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize a recorder writing to `path`."""
+        self.path = path
+        self._file = None  # type: Optional[BinaryIO]
+
+    def record(self, method: str, path: str, url: str, status: int, headers: Iterable[Tuple[str, str]], body: bytes) -> None:
+        """Append an exchange to the log."""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(_HEADER.pack(MAGIC, VERSION))
+        meta = json.dumps([method.upper(), path, url, status, [list(header) for header in headers]], separators=(",", ":")).encode()
+        self._file.write(_RECORD.pack(len(meta), len(body)) + meta + body)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the log."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "TrafficRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_exchanges(data: bytes) -> Iterator[Exchange]:
+    """Iterate over the exchanges of a traffic log."""
+    if len(data) < _HEADER.size:
+        raise ReplayError("Traffic log is truncated")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("Not a lumioo traffic log")
+    if version != VERSION:
+        raise ReplayError(f"Unsupported traffic log version {version}")
+
+    view = memoryview(data)
+    offset = _HEADER.size
+    while offset + _RECORD.size <= len(data):
+        meta_size, body_size = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        end = start + meta_size + body_size
+        if end > len(data):
+            break
+        method, path, url, status, headers = json.loads(view[start:start + meta_size].tobytes())
+        yield Exchange(method, path, url, status, [tuple(header) for header in headers], view[start + meta_size:end].tobytes())
+        offset = end
+
+
+class ReplaySession:
+    """Class that serves recorded exchanges in place of an aiohttp session.
+
+    Pass it as the websession of Auth. Responses are looked up in an
+    in-memory index keyed by method and API path; a request made several
+    times gets its recorded responses in order, then the last one again.
+    """
+
+    def __init__(self, exchanges: Iterable[Exchange], prefix: str = API_PATH_PREFIX) -> None:
+        """Initialize a replay session."""
+        self.prefix = prefix
+        self.connector = None
+        self.closed = False
+        self._index = {}  # type: Dict[Tuple[str, str], List[Exchange]]
+        self._cursors = {}  # type: Dict[Tuple[str, str], int]
+        for exchange in exchanges:
+            self._index.setdefault((exchange.method, exchange.path), []).append(exchange)
+
+    @classmethod
+    def from_file(cls, path: str, prefix: str = API_PATH_PREFIX) -> "ReplaySession":
+        """Return a replay session serving the exchanges of a traffic log."""
+        with open(path, "rb") as f:
+            return cls(read_exchanges(f.read()), prefix)
+
+    def __len__(self) -> int:
+        return sum(len(exchanges) for exchanges in self._index.values())
+
+    def reset(self) -> None:
+        """Replay every request from its first recorded response again."""
+        self._cursors.clear()
+
+    async def request(self, method: str, url: str, **kwargs) -> BufferedResponse:
+        """Return the next recorded response of a request."""
+        key = (method.upper(), url.partition(f"{self.prefix}/")[2])
+        exchanges = self._index.get(key)
+        if not exchanges:
+            raise ReplayMissError(f"No recorded response for {key[0]} {key[1]}")
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return exchanges[min(cursor, len(exchanges) - 1)].response()
+
+    async def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+    async def __aenter__(self) -> "ReplaySession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,96 @@
+import json
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable, Optional, Tuple
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+if TYPE_CHECKING:
+    from aiohttp import RequestInfo
+
+
+class BufferedBody:
+    """Class that exposes an already read body like a response content stream."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize a buffered body."""
+        self._body = body
+
+    async def read(self, n: int = -1) -> bytes:
+        """Return the body."""
+        return self._body
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        """Iterate over the body in chunks of `n` bytes."""
+        for start in range(0, len(self._body), n):
+            yield self._body[start:start + n]
+
+
+class BufferedResponse:
+    """Class that represents an API response whose body has already been read.
+
+    It mirrors the parts of `aiohttp.ClientResponse` the library relies on,
+    so cached and shared responses can be handed to any caller.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Iterable[Tuple[str, str]],
+        body: bytes,
+        reason: Optional[str] = None,
+    ) -> None:
+        """Initialize a buffered response."""
+        self.method = method
+        self.url = url
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.reason = reason
+        self.content = BufferedBody(body)
+        self._body = body
+
+    @property
+    def ok(self) -> bool:
+        """Return if the response status is below 400."""
+        return self.status < 400
+
+    @property
+    def request_info(self) -> "RequestInfo":
+        """Return the request info of the response."""
+        from aiohttp import RequestInfo
+        from yarl import URL
+
+        return RequestInfo(URL(self.url), self.method.upper(), CIMultiDictProxy(CIMultiDict()))
+
+    def raise_for_status(self) -> None:
+        """Raise a ClientResponseError if the response status is 400 or higher."""
+        if self.status >= 400:
+            from aiohttp import ClientResponseError
+
+            raise ClientResponseError(
+                self.request_info, (), status=self.status, message=self.reason or "", headers=self.headers,
+            )
+
+    async def read(self) -> bytes:
+        """Return the body of the response."""
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        """Return the body of the response decoded as text."""
+        return self._body.decode(encoding)
+
+    async def json(self, loads: Callable = json.loads, **kwargs):
+        """Return the body of the response decoded as JSON."""
+        return loads(self._body)
+
+    def release(self) -> None:
+        """Release the response, nothing to do for a buffered body."""
+
+    def close(self) -> None:
+        """Close the response, nothing to do for a buffered body."""
+
+    async def __aenter__(self) -> "BufferedResponse":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
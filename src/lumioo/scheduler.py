@@ -0,0 +1,138 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from .meter import MeterStatus
+from .models import iri_to_id
+from .plant import PlantStatus
+from .solar import SolarTimes
+from .tracker import TrackerStatus
+from .utils import client_errors, zone
+
+if TYPE_CHECKING:
+    from .core import LumiooHubAPI
+
+# Fractional part of the golden ratio, spreads resource IDs evenly over [0, 1).
+_GOLDEN = 0.6180339887498949
+
+
+def phase(resource_id: int) -> float:
+    """Return the phase of a resource in [0, 1), evenly spread across IDs."""
+    return (resource_id * _GOLDEN) % 1.0
+
+
+class SolarScheduler:
+    """Class that adapts polling intervals to daylight and wind.
+
+    Between sunset and sunrise (widened by `margin`) a resource is polled
+    every `night_factor` intervals, and never later than dawn. At dawn the
+    fleet wakes up spread over one interval by the phase of each resource
+    instead of all at once. While a tracker of a plant reports a wind speed
+    of at least `wind_speed_threshold`, the resources of that plant are
+    polled every `wind_factor` interval.
+
+    Solar times are fetched once per plant and local day, the time zone of
+    a plant and the plant of a tracker or meter only once. When they cannot
+    be fetched, or the time zone cannot be resolved, the base interval is
+    used.
+    """
+
+    def __init__(
+        self,
+        api: "LumiooHubAPI",
+        night_factor: float = 6.0,
+        margin: timedelta = timedelta(minutes=30),
+        wind_speed_threshold: float = 15.0,
+        wind_factor: float = 0.25,
+    ) -> None:
+        """Initialize a solar scheduler."""
+        self.api = api
+        self.night_factor = night_factor
+        self.margin = margin
+        self.wind_speed_threshold = wind_speed_threshold
+        self.wind_factor = wind_factor
+        self._plants = {}  # type: Dict[Tuple[str, int], int]
+        self._timezones = {}  # type: Dict[int, str]
+        self._solar_times = {}  # type: Dict[Tuple[int, date], SolarTimes]
+        self._windy_trackers = set()
+
+    def set_plant(self, kind: str, resource_id: int, plant_id: int) -> None:
+        """Set the plant of a resource, sparing the request to look it up."""
+        self._plants[(kind, resource_id)] = plant_id
+
+    async def async_plant_id(self, kind: str, resource_id: int) -> int:
+        """Return the ID of the plant of a resource."""
+        if kind == "plant":
+            return resource_id
+        plant_id = self._plants.get((kind, resource_id))
+        if plant_id is None:
+            if kind == "tracker":
+                tracker = await self.api.async_get_tracker(resource_id)
+                plant_id = iri_to_id(tracker.raw_data["plant"])
+            else:
+                plant_id = (await self.api.async_get_meter(resource_id)).plant_id
+            self._plants[(kind, resource_id)] = plant_id
+        return plant_id
+
+    async def async_solar_times(self, plant_id: int, day: date) -> SolarTimes:
+        """Return the solar times of a plant for a local day."""
+        key = (plant_id, day)
+        solar_times = self._solar_times.get(key)
+        if solar_times is None:
+            solar_times = await self.api.async_get_solar_times(plant_id, day.isoformat())
+            for old_key in [old_key for old_key in self._solar_times if old_key[0] == plant_id and old_key[1] < day - timedelta(days=1)]:
+                del self._solar_times[old_key]
+            self._solar_times[key] = solar_times
+        return solar_times
+
+    async def async_until_dawn(self, plant_id: int, now: Optional[datetime] = None) -> float:
+        """Return the seconds until the next dawn of a plant, 0 during the day."""
+        timezone_name = self._timezones.get(plant_id)
+        if timezone_name is None:
+            timezone_name = self._timezones[plant_id] = (await self.api.async_get_plant(plant_id)).timezone
+        local_zone = zone(timezone_name)
+        now = datetime.now(timezone.utc) if now is None else now
+        today = now.astimezone(local_zone).date()
+
+        def bounds(solar_times: SolarTimes) -> Tuple[datetime, datetime]:
+            sunrise, sunset = solar_times.sunrise, solar_times.sunset
+            if sunrise.tzinfo is None:
+                sunrise, sunset = sunrise.replace(tzinfo=local_zone), sunset.replace(tzinfo=local_zone)
+            return sunrise - self.margin, sunset + self.margin
+
+        dawn, dusk = bounds(await self.async_solar_times(plant_id, today))
+        if now < dawn:
+            return (dawn - now).total_seconds()
+        if now < dusk:
+            return 0.0
+        dawn, _ = bounds(await self.async_solar_times(plant_id, today + timedelta(days=1)))
+        return max((dawn - now).total_seconds(), 0.0)
+
+    def observe(self, kind: str, resource_id: int, status: Union[PlantStatus, TrackerStatus, MeterStatus]) -> None:
+        """Track the wind reported by a tracker status."""
+        if kind != "tracker":
+            return
+        wind_speed = (status.raw_data.get("control") or {}).get("maxWindSpeed")
+        if wind_speed is not None and wind_speed >= self.wind_speed_threshold:
+            self._windy_trackers.add(resource_id)
+        else:
+            self._windy_trackers.discard(resource_id)
+
+    def is_windy(self, plant_id: int) -> bool:
+        """Return if a tracker of a plant last reported a high wind speed."""
+        return any(self._plants.get(("tracker", tracker_id)) == plant_id for tracker_id in self._windy_trackers)
+
+    async def async_delay(self, kind: str, resource_id: int, interval: float, now: Optional[datetime] = None) -> float:
+        """Return the delay before the next poll of a resource polled every `interval` seconds."""
+        try:
+            plant_id = await self.async_plant_id(kind, resource_id)
+            until_dawn = await self.async_until_dawn(plant_id, now)
+        except client_errors() + (KeyError, ValueError, RuntimeError):
+            # RuntimeError: time zones are not supported without zoneinfo.
+            return interval
+
+        if until_dawn > 0:
+            return min(interval * self.night_factor, until_dawn + interval * phase(resource_id))
+        if self.is_windy(plant_id):
+            return interval * self.wind_factor
+        return interval
@@ -0,0 +1,324 @@
+"""Typed records decoded from API responses.
+
+Models wrap the JSON they were built from and parse each field on access.
+Records are the compact alternative for bulk work: once the body is parsed
+by json_loads (orjson when installed), every field is converted once,
+dates to datetime and IRIs to int IDs, into a slotted object which does
+not keep the JSON alive. Records keep the property names of the
+models, but are read-only snapshots without `async_update`.
+
+    statuses = schema.decode_members(body, schema.TrackerStatusRecord)
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Type, TypeVar
+
+from .models import iri_to_id
+from .utils import json_loads
+
+R = TypeVar("R", bound="Record")
+
+
+def _datetime(value: Optional[str]) -> Optional[datetime]:
+    """Return a datetime parsed from an ISO 8601 string, or None."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value)
+
+
+class Record(ABC):
+    """Base class of the typed records."""
+
+    __slots__ = ()
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    @classmethod
+    @abstractmethod
+    def from_raw(cls: Type[R], raw: dict) -> R:
+        """Return a record decoded from the raw data of a resource."""
+
+    @classmethod
+    def from_data(cls: Type[R], data: dict, **extra) -> R:
+        """Return a record decoded from a resource, or the first member of a collection."""
+        if "hydra:member" in data:
+            data = data["hydra:member"][0]
+        return cls.from_raw(data, **extra)
+
+    @classmethod
+    def members_from_data(cls: Type[R], data: dict, **extra) -> List[R]:
+        """Return the records decoded from the members of a collection."""
+        from_raw = cls.from_raw
+        return [from_raw(raw, **extra) for raw in data["hydra:member"]]
+
+
+class StatusTypeRecord(Record):
+    """Class that represents a StatusType record."""
+
+    __slots__ = ("type", "id", "label", "reference", "level")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "StatusTypeRecord":
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.id = raw.get("id")
+        record.label = raw.get("label")
+        record.reference = raw.get("reference")
+        record.level = raw.get("level")
+        return record
+
+
+def _status_type(raw: Optional[dict]) -> Optional[StatusTypeRecord]:
+    """Return the StatusType record of raw data, or None."""
+    if raw is None:
+        return None
+    return StatusTypeRecord.from_raw(raw)
+
+
+class PlantRecord(Record):
+    """Class that represents a Plant record."""
+
+    __slots__ = (
+        "id", "user", "name", "alias_installation", "timezone", "operation_date", "restricted_power",
+        "restricted_value", "display_autoconsumption", "display_consumption", "nominal_power", "main_meter",
+    )
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "PlantRecord":
+        record = cls.__new__(cls)
+        record.id = raw.get("id")
+        record.user = iri_to_id(raw.get("user"))
+        record.name = raw.get("name")
+        record.alias_installation = raw.get("aliasInstallation")
+        record.timezone = raw.get("timezone")
+        record.operation_date = _datetime(raw.get("operationDate"))
+        record.restricted_power = raw.get("restrictedPower")
+        record.restricted_value = raw.get("restrictedValue")
+        record.display_autoconsumption = raw.get("displayAutoconsumption")
+        record.display_consumption = raw.get("displayConsumption")
+        record.nominal_power = raw.get("nominalPower")
+        record.main_meter = iri_to_id(raw.get("mainMeter"))
+        return record
+
+
+class PlantStatusRecord(Record):
+    """Class that represents a PlantStatus record."""
+
+    __slots__ = (
+        "type", "id", "latest_synchronisation", "is_synchronised", "status_type",
+        "alarm_level_1", "alarm_level_2", "alarm_level_3",
+    )
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "PlantStatusRecord":
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.id = raw.get("id")
+        record.latest_synchronisation = _datetime(raw.get("latestSynchronisation"))
+        record.is_synchronised = raw.get("isSynchronised")
+        record.status_type = _status_type(raw.get("statusType"))
+        record.alarm_level_1 = raw.get("alarmLevel1")
+        record.alarm_level_2 = raw.get("alarmLevel2")
+        record.alarm_level_3 = raw.get("alarmLevel3")
+        return record
+
+
+class PlantEnergyDayRecord(Record):
+    """Class that represents a PlantEnergyDay record."""
+
+    __slots__ = ("plant_id", "type", "date", "production", "consumption", "auto_consumption", "grid_consumption")
+
+    @classmethod
+    def from_raw(cls, raw: dict, plant_id: Optional[int] = None) -> "PlantEnergyDayRecord":
+        record = cls.__new__(cls)
+        record.plant_id = plant_id if plant_id is not None else iri_to_id(raw.get("plant"))
+        record.type = raw.get("@type")
+        record.date = _datetime(raw.get("date"))
+        record.production = raw.get("production")
+        record.consumption = raw.get("consumption")
+        record.auto_consumption = raw.get("autoConsumption")
+        record.grid_consumption = raw.get("gridConsumption")
+        return record
+
+    @property
+    def grid_restitution(self) -> int:
+        """Return the grid restitution of the day."""
+        if self.grid_consumption == 0:
+            return self.production - self.consumption
+        return 0
+
+
+class TrackerRecord(Record):
+    """Class that represents a Tracker record."""
+
+    __slots__ = ("id", "operation_date", "serial_number", "n_trk", "user_guide_url")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "TrackerRecord":
+        record = cls.__new__(cls)
+        record.id = raw.get("id")
+        record.operation_date = _datetime(raw.get("operationDate"))
+        record.serial_number = raw.get("serialNumber")
+        record.n_trk = raw.get("nTrk")
+        record.user_guide_url = raw.get("userGuideUrl")
+        return record
+
+
+class TrackerStatusDataRecord(Record):
+    """Class that represents a TrackerStatusData record."""
+
+    __slots__ = ("type", "production", "restricted", "is_synchronised", "date")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "TrackerStatusDataRecord":
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.production = raw.get("production")
+        record.restricted = raw.get("restricted")
+        record.is_synchronised = raw.get("isSynchronised")
+        record.date = _datetime(raw.get("date"))
+        return record
+
+
+class TrackerStatusControlRecord(Record):
+    """Class that represents a TrackerStatusControl record."""
+
+    __slots__ = ("type", "average_wind_speed", "alarmLabel", "alarmDescription", "max_wind_speed", "date")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "TrackerStatusControlRecord":
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.average_wind_speed = raw.get("averageWindSpeed")
+        record.alarmLabel = raw.get("alarmLabel")
+        record.alarmDescription = raw.get("alarmDescription")
+        record.max_wind_speed = raw.get("maxWindSpeed")
+        record.date = _datetime(raw.get("date"))
+        return record
+
+
+class TrackerStatusRecord(Record):
+    """Class that represents a TrackerStatus record."""
+
+    __slots__ = (
+        "type", "id", "status_type", "latest_synchronisation", "is_synchronised", "data",
+        "alarms", "control", "max_wind_speed20", "software_flat_status",
+    )
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "TrackerStatusRecord":
+        data = raw.get("data")
+        control = raw.get("control")
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.id = raw.get("id")
+        record.status_type = _status_type(raw.get("statusType"))
+        record.latest_synchronisation = _datetime(raw.get("latestSynchronisation"))
+        record.is_synchronised = raw.get("isSynchronised")
+        record.data = None if data is None else TrackerStatusDataRecord.from_raw(data)
+        record.alarms = raw.get("alarms")
+        record.control = None if control is None else TrackerStatusControlRecord.from_raw(control)
+        record.max_wind_speed20 = raw.get("maxWindSpeed20")
+        record.software_flat_status = raw.get("softwareFlatStatu")
+        return record
+
+
+class MeterRecord(Record):
+    """Class that represents a Meter record."""
+
+    __slots__ = ("id", "type_id", "plant_id")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "MeterRecord":
+        record = cls.__new__(cls)
+        record.id = raw.get("id")
+        record.type_id = iri_to_id(raw.get("type"))
+        record.plant_id = iri_to_id(raw.get("plant"))
+        return record
+
+
+class MeterStatusRecord(Record):
+    """Class that represents a MeterStatus record."""
+
+    __slots__ = ("id", "is_synchronised", "latest_synchronisation", "date", "consumption")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "MeterStatusRecord":
+        data = raw.get("data") or {}
+        record = cls.__new__(cls)
+        record.id = raw.get("id")
+        record.is_synchronised = raw.get("isSynchronised")
+        record.latest_synchronisation = _datetime(raw.get("latestSynchronisation"))
+        record.date = _datetime(data.get("date"))
+        record.consumption = data.get("consumption")
+        return record
+
+
+class PowerPlantMinuteRecord(Record):
+    """Class that represents a PowerPlantMinute record."""
+
+    __slots__ = ("id", "type", "date", "production", "consumption", "auto_consumption", "grid_consumption")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "PowerPlantMinuteRecord":
+        record = cls.__new__(cls)
+        record.id = iri_to_id(raw.get("@id"))
+        record.type = raw.get("@type")
+        record.date = _datetime(raw.get("date"))
+        record.production = raw.get("production")
+        record.consumption = raw.get("consumption")
+        record.auto_consumption = raw.get("autoConsumption")
+        record.grid_consumption = raw.get("gridConsumption")
+        return record
+
+
+class SolarTimesRecord(Record):
+    """Class that represents a SolarTimes record."""
+
+    __slots__ = ("type", "sunrise", "sunset")
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "SolarTimesRecord":
+        record = cls.__new__(cls)
+        record.type = raw.get("@type")
+        record.sunrise = _datetime(raw.get("sunrise"))
+        record.sunset = _datetime(raw.get("sunset"))
+        return record
+
+
+class ProductionEstimateRecord(Record):
+    """Class that represents a ProductionEstimate record."""
+
+    __slots__ = ("plant_id", "type", "reference", "begin", "end", "production_index", "production")
+
+    @classmethod
+    def from_raw(cls, raw: dict, plant_id: Optional[int] = None) -> "ProductionEstimateRecord":
+        record = cls.__new__(cls)
+        record.plant_id = plant_id if plant_id is not None else iri_to_id(raw.get("plant"))
+        record.type = raw.get("@type")
+        record.reference = raw.get("reference")
+        record.begin = _datetime(raw.get("begin"))
+        record.end = _datetime(raw.get("end"))
+        record.production_index = raw.get("productionIndex")
+        record.production = raw.get("production")
+        return record
+
+
+def decode(body: bytes, record: Type[R], **extra) -> R:
+    """Return a record decoded from the body of a resource or single member collection."""
+    return record.from_data(json_loads(body), **extra)
+
+
+def decode_members(body: bytes, record: Type[R], **extra) -> List[R]:
+    """Return the records decoded from the body of a collection."""
+    return record.members_from_data(json_loads(body), **extra)
@@ -0,0 +1,32 @@
+from typing import Dict, List, Optional, Tuple
+
+from .meter import Meter, MeterStatus
+from .plant import Plant, PlantStatus
+from .tracker import Tracker, TrackerStatus
+
+
+class PlantSnapshot:
+    """Class that groups a plant with its status, trackers and main meter.
+
+    Every part fetched independently may be missing: the error that prevented
+    it is kept in `errors`, keyed like ("meter", meter_id).
+    """
+
+    def __init__(self, plant_id: int) -> None:
+        """Initialize an empty plant snapshot."""
+        self.plant_id = plant_id
+        self.plant = None  # type: Optional[Plant]
+        self.status = None  # type: Optional[PlantStatus]
+        self.trackers = []  # type: List[Tracker]
+        self.tracker_statuses = {}  # type: Dict[int, TrackerStatus]
+        self.meter = None  # type: Optional[Meter]
+        self.meter_status = None  # type: Optional[MeterStatus]
+        self.errors = {}  # type: Dict[Tuple[str, int], Exception]
+
+    def __getitem__(self, item):
+        return getattr(self, item)
+
+    @property
+    def complete(self) -> bool:
+        """Return if every part of the snapshot was fetched."""
+        return not self.errors
@@ -1,31 +1,34 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from .auth import Auth
+from .models import Model, cached_field
 
+if TYPE_CHECKING:
+    from .auth import Auth
 
-class SolarTimes:
+
+class SolarTimes(Model):
     """Class that represents a SolatTimes object in the LumiooHub API."""
 
-    def __init__(self, plant_id: int, date: str, raw_data: dict, auth: Auth):
+    __slots__ = ("plant_id", "date")
+
+    def __init__(self, plant_id: int, date: str, raw_data: dict, auth: "Auth"):
         """Initialize a solar times object."""
+        super().__init__(raw_data["hydra:member"][0], auth)
         self.plant_id = plant_id
         self.date = date
-        self.raw_data = raw_data["hydra:member"][0]
-
-    def __getitem__(self, item):
-        return getattr(self, item)
 
     @property
     def type(self) -> str:
         """Return the solar times type."""
         return self.raw_data["@type"]
 
-    @property
+    @cached_field
     def sunrise(self) -> datetime:
         """Return the sunrise time."""
         return datetime.fromisoformat(self.raw_data["sunrise"])
 
-    @property
+    @cached_field
     def sunset(self) -> datetime:
         """Return the sunset time."""
         return datetime.fromisoformat(self.raw_data["sunset"])
@@ -38,16 +41,15 @@ class SolarTimes:
         self.raw_data = json_data["hydra:member"][0]
 
 
-class ProductionEstimate:
+class ProductionEstimate(Model):
     """Class that represents a Production estimate object in the LumiooHub API."""
 
-    def __init__(self, plant_id: int, raw_data: dict, auth: Auth):
+    __slots__ = ("plant_id",)
+
+    def __init__(self, plant_id: int, raw_data: dict, auth: "Auth"):
         """Initialize a production estimates object."""
+        super().__init__(raw_data, auth)
         self.plant_id = plant_id
-        self.raw_data = raw_data
-
-    def __getitem__(self, item):
-        return getattr(self, item)
 
     @property
     def type(self) -> str:
@@ -59,12 +61,12 @@ class ProductionEstimate:
         """Return the reference prediction estimates."""
         return self.raw_data["reference"]
 
-    @property
+    @cached_field
     def begin(self) -> datetime:
         """Return the begin date time of the production estimate."""
         return datetime.fromisoformat(self.raw_data["begin"])
 
-    @property
+    @cached_field
     def end(self) -> datetime:
         """Return the end date time of the production estimate."""
         return datetime.fromisoformat(self.raw_data["end"])
@@ -83,7 +85,8 @@ class ProductionEstimate:
         """Update the production estimates data."""
         resp = await self.auth.request("get", f"production_estimates?plant=/v2/human/plants/{self.plant_id}")
         resp.raise_for_status()
-        for ref in await resp.json():
+        json_data = await resp.json()
+        for ref in json_data["hydra:member"]:
             if ref["reference"] == self.reference:
                 self.raw_data = ref
                 break
@@ -0,0 +1,140 @@
+import json
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from .analyse import PowerSeries
+from .backfill import async_backfill, split_date_range
+from .core import LumiooHubAPI
+from .plant import PlantEnergyDay
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS power_plant_minutes (
+    plant_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    utc_offset INTEGER NOT NULL,
+    production REAL NOT NULL,
+    consumption REAL NOT NULL,
+    auto_consumption REAL NOT NULL,
+    grid_consumption REAL NOT NULL,
+    PRIMARY KEY (plant_id, timestamp)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS energy_plant_days (
+    plant_id INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    raw_data TEXT NOT NULL,
+    PRIMARY KEY (plant_id, timestamp)
+) WITHOUT ROWID;
+"""
+
+# Number of days of minutes fetched and written at once during a sync.
+SYNC_BLOCK_DAYS = 28
+
+
+def _timestamp(value: str) -> int:
+    """Return the epoch seconds of an ISO date, naive values being UTC."""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class EnergyStore:
+    """Class that keeps power plant minutes and energy days in a SQLite database.
+
+    `async_sync` only downloads what is newer than the stored data, plus the
+    last `revision_window` that the API may still revise. Queries never go
+    to the network.
+    """
+
+    def __init__(self, path: str = ":memory:", revision_window: timedelta = timedelta(days=2)) -> None:
+        """Initialize an energy store."""
+        self.revision_window = revision_window
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.connection.close()
+
+    def latest_minute(self, plant_id: int) -> Optional[datetime]:
+        """Return the date of the latest stored power plant minute of a plant."""
+        row = self.connection.execute(
+            "SELECT MAX(timestamp) FROM power_plant_minutes WHERE plant_id = ?", (plant_id,),
+        ).fetchone()
+        return None if row[0] is None else datetime.fromtimestamp(row[0], timezone.utc)
+
+    def latest_energy_day(self, plant_id: int) -> Optional[datetime]:
+        """Return the date of the latest stored energy day of a plant."""
+        row = self.connection.execute(
+            "SELECT MAX(timestamp) FROM energy_plant_days WHERE plant_id = ?", (plant_id,),
+        ).fetchone()
+        return None if row[0] is None else datetime.fromtimestamp(row[0], timezone.utc)
+
+    def add_power_series(self, plant_id: int, series: PowerSeries) -> None:
+        """Store the rows of a power series, replacing the ones already stored."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO power_plant_minutes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((plant_id, timestamp, id, *values) for id, timestamp, *values in series.rows()),
+            )
+
+    def add_energy_days(self, plant_id: int, energy_days: List[PlantEnergyDay]) -> None:
+        """Store energy days, replacing the ones already stored."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO energy_plant_days VALUES (?, ?, ?)",
+                ((plant_id, _timestamp(day.raw_data["date"]), json.dumps(day.raw_data)) for day in energy_days),
+            )
+
+    def query_power_series(self, plant_id: int, date_after: str, date_strictly_before: str) -> PowerSeries:
+        """Return the stored power plant minutes of a range."""
+        rows = self.connection.execute(
+            "SELECT id, timestamp, utc_offset, production, consumption, auto_consumption, grid_consumption"
+            " FROM power_plant_minutes WHERE plant_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (plant_id, _timestamp(date_after), _timestamp(date_strictly_before)),
+        )
+        return PowerSeries.from_rows(rows)
+
+    def query_energy_days(self, plant_id: int, date_after: str, date_strictly_before: str) -> List[PlantEnergyDay]:
+        """Return the stored energy days of a range."""
+        rows = self.connection.execute(
+            "SELECT raw_data FROM energy_plant_days WHERE plant_id = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (plant_id, _timestamp(date_after), _timestamp(date_strictly_before)),
+        )
+        return [PlantEnergyDay(plant_id, json.loads(raw_data), None) for raw_data, in rows]
+
+    async def _async_sync_start(self, api: LumiooHubAPI, plant_id: int, latest: Optional[datetime], since: Optional[date]) -> date:
+        if latest is not None:
+            return (latest - self.revision_window).date()
+        if since is not None:
+            return since
+        plant = await api.async_get_plant(plant_id)
+        return plant.operation_date.date()
+
+    async def async_sync(self, api: LumiooHubAPI, plant_id: int, since: Optional[date] = None, concurrency: int = 4) -> None:
+        """Download the minutes and energy days of a plant missing from the store.
+
+        The first sync of a plant starts at `since`, or at the operation date
+        of the plant when not given.
+        """
+        end = datetime.now(timezone.utc).date() + timedelta(days=1)
+
+        start = await self._async_sync_start(api, plant_id, self.latest_energy_day(plant_id), since)
+        energy_days = [
+            day async for day in api.async_iter_plant_energy_days(plant_id, start.isoformat(), end.isoformat())
+        ]
+        self.add_energy_days(plant_id, energy_days)
+
+        start = await self._async_sync_start(api, plant_id, self.latest_minute(plant_id), since)
+        while start < end:
+            block_end = min(start + timedelta(days=SYNC_BLOCK_DAYS), end)
+            shards = split_date_range(start.isoformat(), block_end.isoformat())
+
+            async def fetch(shard_after: str, shard_strictly_before: str) -> PowerSeries:
+                return await api.async_get_power_series(plant_id, shard_after, shard_strictly_before, prefetch=1)
+
+            for series in await async_backfill(fetch, shards, concurrency):
+                self.add_power_series(plant_id, series)
+            start = block_end
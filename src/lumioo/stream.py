@@ -0,0 +1,129 @@
+import codecs
+import json
+import re
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, Optional
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_START, _KEY, _VALUE, _MEMBERS_START, _MEMBERS = range(5)
+
+
+class _NeedMore(Exception):
+    """Raised when the buffer ends before the next JSON value."""
+
+
+class HydraMemberStream:
+    """Class that decodes the hydra:member items of a response as they arrive.
+
+    Only the item being decoded and the last chunk read are held in memory,
+    so the peak memory does not depend on the size of the page. The other
+    top level keys of the collection (hydra:totalItems, hydra:view...) are
+    collected in `meta` while iterating.
+
+    The response is released once every item was read, or when the stream
+    is closed with `aclose()` or by leaving `async with`.
+    """
+
+    def __init__(self, resp: "ClientResponse", chunk_size: int = 65536) -> None:
+        """Initialize a hydra member stream."""
+        self.resp = resp
+        self.chunk_size = chunk_size
+        self.meta = {}
+        self._decoder = json.JSONDecoder()
+        self._iterator = None  # type: Optional[AsyncGenerator[dict, None]]
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        if self._iterator is None:
+            self._iterator = self._async_iter()
+        return self._iterator
+
+    async def aclose(self) -> None:
+        """Stop decoding and release the response."""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+        self.resp.release()
+
+    async def __aenter__(self) -> "HydraMemberStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def _decode(self, buffer: str, pos: int, eof: bool):
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            raise _NeedMore
+        # A number could continue in the next chunk.
+        if end == len(buffer) and not eof:
+            raise _NeedMore
+        return value, end
+
+    async def _async_iter(self) -> AsyncGenerator[dict, None]:
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        chunks = self.resp.content.iter_chunked(self.chunk_size).__aiter__()
+        buffer, pos, eof = "", 0, False
+        state, key = _START, None
+
+        try:
+            while True:
+                try:
+                    pos = _WHITESPACE.match(buffer, pos).end()
+                    if pos == len(buffer):
+                        raise _NeedMore
+                    char = buffer[pos]
+
+                    if state == _START:
+                        if char != "{":
+                            raise ValueError("Expected a JSON object")
+                        pos += 1
+                        state = _KEY
+                    elif state == _KEY:
+                        if char == "}":
+                            return
+                        if char == ",":
+                            pos += 1
+                            continue
+                        key, end = self._decode(buffer, pos, eof)
+                        end = _WHITESPACE.match(buffer, end).end()
+                        if end == len(buffer):
+                            raise _NeedMore
+                        if buffer[end] != ":":
+                            raise ValueError(f"Expected ':' after key {key!r}")
+                        pos = end + 1
+                        state = _MEMBERS_START if key == "hydra:member" else _VALUE
+                    elif state == _VALUE:
+                        self.meta[key], pos = self._decode(buffer, pos, eof)
+                        state = _KEY
+                    elif state == _MEMBERS_START:
+                        if char != "[":
+                            raise ValueError("Expected hydra:member to be an array")
+                        pos += 1
+                        state = _MEMBERS
+                    elif char == "]":
+                        pos += 1
+                        state = _KEY
+                    elif char == ",":
+                        pos += 1
+                    else:
+                        item, pos = self._decode(buffer, pos, eof)
+                        yield item
+                except _NeedMore:
+                    if eof:
+                        raise ValueError("Incomplete JSON response")
+                    try:
+                        chunk = await chunks.__anext__()
+                    except StopAsyncIteration:
+                        eof = True
+                        chunk = b""
+                    # The decoded text is only dropped once it outgrows a chunk, not on every read.
+                    if pos >= self.chunk_size:
+                        buffer, pos = buffer[pos:], 0
+                    buffer += text_decoder.decode(chunk, final=eof)
+        finally:
+            self.resp.release()
@@ -1,25 +1,27 @@
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-from .auth import Auth
-from .models import StatusType
+from .models import Model, StatusType, cached_field
 
+if TYPE_CHECKING:
+    from .auth import Auth
 
-class Tracker:
+
+class Tracker(Model):
     """Class that represents a Tracker object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth):
-        """Initialize a tracker object."""
-        self.raw_data = raw_data
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth"):
+        """Initialize a tracker object."""
+        super().__init__(raw_data, auth)
 
     @property
     def id(self) -> int:
         """Return the ID of the tracker."""
         return self.raw_data["id"]
 
-    @property
+    @cached_field
     def operation_date(self) -> datetime:
         """Return the operation date of the tracker."""
         return datetime.fromisoformat(self.raw_data["operationDate"])
@@ -46,15 +48,14 @@ class Tracker:
         self.raw_data = await resp.json()
 
 
-class TrackerStatusData:
+class TrackerStatusData(Model):
     """Class that represents a TrackerStatusData object in the LumiooHub API."""
 
+    __slots__ = ()
+
     def __init__(self, raw_data: dict):
         """Initialize a tracker status data object."""
-        self.raw_data = raw_data
-
-    def __getitem__(self, item):
-        return getattr(self, item)
+        super().__init__(raw_data)
 
     @property
     def type(self) -> str:
@@ -76,21 +77,20 @@ class TrackerStatusData:
         """Return if the tracker status is synchronised."""
         return self.raw_data["isSynchronised"]
 
-    @property
+    @cached_field
     def date(self) -> datetime:
         """Return the date of the tracker status data."""
         return datetime.fromisoformat(self.raw_data["date"])
 
 
-class TrackerStatusControl:
+class TrackerStatusControl(Model):
     """Class that represents a TrackerStatusControl object in the LumiooHub API."""
 
+    __slots__ = ()
+
     def __init__(self, raw_data: dict):
         """Initialize a tracker status control object."""
-        self.raw_data = raw_data
-
-    def __getitem__(self, item):
-        return getattr(self, item)
+        super().__init__(raw_data)
 
     @property
     def type(self) -> str:
@@ -117,22 +117,20 @@ class TrackerStatusControl:
         """Return the max wind speed of the tracker."""
         return self.raw_data["maxWindSpeed"]
 
-    @property
+    @cached_field
     def date(self) -> datetime:
         """Return the control date of the tracker."""
         return datetime.fromisoformat(self.raw_data["date"])
 
 
-class TrackerStatus:
+class TrackerStatus(Model):
     """Class that represents a TrackerStatus object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth):
-        """Initialize a tracker status object."""
-        self.raw_data = raw_data["hydra:member"][0]
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth"):
+        """Initialize a tracker status object."""
+        super().__init__(raw_data["hydra:member"][0], auth)
 
     @property
     def type(self) -> str:
@@ -144,12 +142,12 @@ class TrackerStatus:
         """Return the ID of the tracker status."""
         return self.raw_data["id"]
 
-    @property
+    @cached_field
     def status_type(self) -> StatusType:
         """Return the StatusType of the tracker."""
         return StatusType(self.raw_data["statusType"])
 
-    @property
+    @cached_field
     def latest_synchronisation(self) -> datetime:
         """Return the latest synchronisation of the tracker."""
         return datetime.fromisoformat(self.raw_data["latestSynchronisation"])
@@ -159,7 +157,7 @@ class TrackerStatus:
         """Return if the tracker is synchronised."""
         return self.raw_data["isSynchronised"]
 
-    @property
+    @cached_field
     def data(self) -> TrackerStatusData:
         """Return the TrackerStatusData of the tracker."""
         return TrackerStatusData(self.raw_data["data"])
@@ -169,7 +167,7 @@ class TrackerStatus:
         """Return the alarms of the tracker."""
         return self.raw_data["alarms"]
 
-    @property
+    @cached_field
     def control(self) -> TrackerStatusControl:
         """Return the TrackerStatusControl of the tracker."""
         return TrackerStatusControl(self.raw_data["control"])
@@ -186,7 +184,8 @@ class TrackerStatus:
 
     async def async_update(self):
         """Update the tracker status data."""
-        resp = await self.auth.request("get", f"tracker_statuses/?tracker=/v2/human/trackers/{self.id}")
+        tracker = self.raw_data.get("tracker") or f"/v2/human/trackers/{self.id}"
+        resp = await self.auth.request("get", f"tracker_statuses/?tracker={tracker}")
         resp.raise_for_status()
         json_data = await resp.json()
         self.raw_data = json_data["hydra:member"][0]
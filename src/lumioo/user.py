@@ -1,16 +1,19 @@
-from .auth import Auth
+from typing import TYPE_CHECKING
 
+from .models import Model
 
-class User:
+if TYPE_CHECKING:
+    from .auth import Auth
+
+
+class User(Model):
     """Class that represents an User object in the LumiooHub API."""
 
-    def __init__(self, raw_data: dict, auth: Auth):
-        """Initialize an user object."""
-        self.raw_data = raw_data
-        self.auth = auth
+    __slots__ = ()
 
-    def __getitem__(self, item):
-        return getattr(self, item)
+    def __init__(self, raw_data: dict, auth: "Auth"):
+        """Initialize an user object."""
+        super().__init__(raw_data, auth)
 
     @property
     def id(self) -> int:
@@ -1,3 +1,79 @@
+import functools
+import json
+from datetime import timezone, tzinfo
+from typing import Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+elif msgspec is not None:
+    json_loads = msgspec.json.decode
+else:
+    json_loads = json.loads
+
+
+@functools.lru_cache(maxsize=None)
+def optional_numpy():
+    """Return the numpy module, or None when it is not installed.
+
+    NumPy is imported on first use so that importing lumioo stays cheap.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _zone_info():
+    """Return the ZoneInfo class, or None when neither zoneinfo nor backports.zoneinfo is installed."""
+    try:
+        from zoneinfo import ZoneInfo
+    except ImportError:
+        try:
+            from backports.zoneinfo import ZoneInfo
+        except ImportError:
+            return None
+    return ZoneInfo
+
+
+def zone(tz: Optional[str]) -> tzinfo:
+    """Return the time zone of an IANA name such as Plant.timezone, UTC for None.
+
+    Raise RuntimeError when time zones are not supported: they require
+    Python 3.9 or backports.zoneinfo. An unknown name raises a KeyError.
+    """
+    if tz is None:
+        return timezone.utc
+    zone_info = _zone_info()
+    if zone_info is None:
+        raise RuntimeError("Time zone support requires Python 3.9 or backports.zoneinfo")
+    return zone_info(tz)
+
+
+@functools.lru_cache(maxsize=None)
+def client_errors() -> Tuple[type, ...]:
+    """Return the exceptions of a request that got no response: aiohttp.ClientError and timeouts.
+
+    aiohttp is imported on first use so that importing lumioo stays cheap;
+    an except clause only evaluates it once an exception is raised.
+    """
+    import asyncio
+
+    from aiohttp import ClientError
+
+    return ClientError, asyncio.TimeoutError
+
 
 # Function to convert speed in m/s to km/h
 def mps_to_kmph(mps):
@@ -8,3 +84,12 @@ def mps_to_kmph(mps):
     1 m/sec = 18/5 km/hr or 3.6 km/hr
     """
     return round(3.6 * mps, 2)
+
+
+def endpoint_family(path):
+    """Return the endpoint family of an API path.
+
+    "plants/12" and "plant_statuses?plant=/v2/human/plants/12" belong to the
+    "plants" and "plant_statuses" families.
+    """
+    return path.split("?", 1)[0].strip("/").split("/", 1)[0]
@@ -0,0 +1,28 @@
+import asyncio
+import inspect
+
+import pytest
+
+from lumioo import analyse, analytics
+from lumioo.utils import optional_numpy
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run coroutine tests in a new event loop."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy, when installed, and with the pure Python fallback."""
+    if request.param == "numpy" and optional_numpy() is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == "python":
+        for module in (analyse, analytics):
+            monkeypatch.setattr(module, "optional_numpy", lambda: None)
+    return request.param
@@ -0,0 +1,69 @@
+"""Stand-ins for the API used by the tests."""
+import asyncio
+import json
+from typing import Callable, List, Optional, Tuple
+
+from lumioo.auth import API_PATH_PREFIX, Auth
+from lumioo.core import LumiooHubAPI
+from lumioo.ratelimit import RetryPolicy
+from lumioo.response import BufferedResponse
+
+
+def json_response(data, status: int = 200, headers: Optional[dict] = None) -> BufferedResponse:
+    """Return a response serving `data` as JSON."""
+    headers = dict({"content-type": "application/ld+json"}, **(headers or {}))
+    return BufferedResponse("get", "http://api.test/", status, list(headers.items()), json.dumps(data).encode())
+
+
+def collection(members: list, total: Optional[int] = None, last_page: Optional[int] = None, page: int = 1) -> dict:
+    """Return a hydra collection, paginated when `last_page` is given."""
+    data = {"@type": "hydra:Collection", "hydra:member": members, "hydra:totalItems": len(members) if total is None else total}
+    if last_page is not None:
+        data["hydra:view"] = {"@id": f"/x?page={page}", "hydra:last": f"/x?page={last_page}"}
+        if page < last_page:
+            data["hydra:view"]["hydra:next"] = f"/x?page={page + 1}"
+    return data
+
+
+class FakeSession:
+    """Session answering requests with `handler` in place of aiohttp.
+
+    `handler` is called with the method, the API path and the headers of
+    each request and returns a response, JSON data to serve, or raises.
+    It may be a coroutine function.
+    """
+
+    def __init__(self, handler: Callable) -> None:
+        """Initialize a fake session."""
+        self.handler = handler
+        self.requests = []  # type: List[Tuple[str, str, dict]]
+        self.connector = None
+        self.closed = False
+
+    @property
+    def paths(self) -> List[str]:
+        """Return the paths requested so far."""
+        return [path for _, path, _ in self.requests]
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, **kwargs) -> BufferedResponse:
+        """Return the response of the handler."""
+        path = url.partition(f"{API_PATH_PREFIX}/")[2]
+        headers = dict(headers or {})
+        self.requests.append((method.upper(), path, headers))
+        result = self.handler(method.upper(), path, headers)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if isinstance(result, BufferedResponse):
+            return result
+        return json_response(result)
+
+    async def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+
+def make_api(handler: Callable, **auth_options) -> Tuple[LumiooHubAPI, FakeSession]:
+    """Return an API talking to a fake session, without retry backoff by default."""
+    session = FakeSession(handler)
+    auth_options.setdefault("retry_policy", RetryPolicy(backoff=0))
+    return LumiooHubAPI(Auth(session, "token", **auth_options)), session
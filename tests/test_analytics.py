@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from lumioo import analytics
+from lumioo.analyse import PowerSeries
+from lumioo.utils import optional_numpy
+
+try:
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
+
+
+def epoch(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def series(*rows) -> PowerSeries:
+    """Return a series of (timestamp, production, consumption, auto_consumption, grid_consumption) rows."""
+    return PowerSeries.from_rows((index, row[0], 0) + row[1:] for index, row in enumerate(rows))
+
+
+SERIES = series(
+    (epoch(2023, 1, 1, 22, 30), 10.0, 4.0, 4.0, 0.0),
+    (epoch(2023, 1, 1, 23, 30), 0.0, 5.0, 0.0, 5.0),
+    (epoch(2023, 1, 2, 10, 0), 6.0, 8.0, 6.0, 2.0),
+)
+
+
+def test_rollup_per_utc_day(backend):
+    days = analytics.rollup(SERIES, "day")
+
+    assert list(days.timestamps) == [epoch(2023, 1, 1), epoch(2023, 1, 2)]
+    assert list(days.utc_offsets) == [0, 0]
+    assert list(days.production) == [10.0, 6.0]
+    assert list(days.consumption) == [9.0, 8.0]
+
+
+@pytest.mark.skipif(zoneinfo is None, reason="Time zone support requires Python 3.9")
+def test_rollup_follows_the_wall_clock_of_a_time_zone(backend):
+    days = analytics.rollup(SERIES, "day", "Europe/Paris")
+
+    # 23:30 UTC is already January 2nd in Paris.
+    assert list(days.timestamps) == [epoch(2023, 1, 1, 23) - 86400, epoch(2023, 1, 1, 23)]
+    assert list(days.utc_offsets) == [3600, 3600]
+    assert list(days.production) == [10.0, 6.0]
+    assert list(days.consumption) == [4.0, 13.0]
+
+
+def test_rollup_per_hour_week_and_month(backend):
+    rows = series(
+        (epoch(2023, 1, 1, 12), 1.0, 0.0, 0.0, 0.0),
+        (epoch(2023, 1, 2, 12), 2.0, 0.0, 0.0, 0.0),
+        (epoch(2023, 1, 2, 12, 30), 3.0, 0.0, 0.0, 0.0),
+        (epoch(2023, 2, 1), 4.0, 0.0, 0.0, 0.0),
+    )
+
+    hours = analytics.rollup(rows, "hour")
+    assert list(hours.production) == [1.0, 5.0, 4.0]
+
+    # 2023-01-01 is a Sunday, its week started on Monday 2022-12-26.
+    weeks = analytics.rollup(rows, "week")
+    assert list(weeks.timestamps) == [epoch(2022, 12, 26), epoch(2023, 1, 2), epoch(2023, 1, 30)]
+    assert list(weeks.production) == [1.0, 5.0, 4.0]
+
+    months = analytics.rollup(rows, "month")
+    assert list(months.timestamps) == [epoch(2023, 1, 1), epoch(2023, 2, 1)]
+    assert list(months.production) == [6.0, 4.0]
+
+    with pytest.raises(ValueError):
+        analytics.rollup(rows, "year")
+    assert len(analytics.rollup(PowerSeries(), "day")) == 0
+
+
+def test_ratios_and_grid_restitution(backend):
+    assert analytics.self_consumption_ratio(SERIES) == pytest.approx(10.0 / 16.0)
+    assert analytics.self_sufficiency_ratio(SERIES) == pytest.approx(10.0 / 17.0)
+    assert analytics.self_consumption_ratio(PowerSeries()) is None
+
+    assert list(analytics.grid_restitution(SERIES)) == [6.0, 0.0, 0.0]
+    assert analytics.total_grid_restitution(SERIES) == 6.0
+
+    peak = analytics.peak_production(SERIES)
+    assert (peak.id, peak.production) == (0, 10.0)
+    assert analytics.peak_production(PowerSeries()) is None
+
+
+def test_fleet_functions_combine_plants(backend):
+    other = series((epoch(2023, 1, 2, 11), 2.0, 1.0, 1.0, 0.0))
+    fleet = {1: SERIES, 2: other}
+
+    assert len(analytics.fleet_series(fleet)) == 4
+    totals = analytics.fleet_summary(fleet)
+    assert totals["production"] == 18.0
+    assert totals["grid_restitution"] == 7.0
+    assert totals["self_consumption_ratio"] == pytest.approx(11.0 / 18.0)
+    assert list(analytics.fleet_rollup(fleet, "day").production) == [10.0, 8.0]
+
+
+@pytest.mark.skipif(optional_numpy() is None, reason="NumPy is not installed")
+@pytest.mark.skipif(zoneinfo is None, reason="Time zone support requires Python 3.9")
+def test_backends_agree_across_a_dst_change(monkeypatch):
+    rows = series(*(
+        (epoch(2023, 3, 25) + hour * 3600, float(hour), 1.0, 1.0, 0.0)
+        for hour in range(72)
+    ))
+    with_numpy = analytics.rollup(rows, "day", "Europe/Paris")
+    monkeypatch.setattr(analytics, "optional_numpy", lambda: None)
+    monkeypatch.setattr("lumioo.analyse.optional_numpy", lambda: None)
+    without_numpy = analytics.rollup(rows, "day", "Europe/Paris")
+
+    assert list(with_numpy.rows()) == list(without_numpy.rows())
+    assert list(with_numpy.utc_offsets) == [3600, 3600, 7200, 7200]
@@ -0,0 +1,152 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from lumioo.backfill import BackfillError, async_backfill, resume_bound, split_date_range
+
+from .helpers import collection, make_api
+
+
+def test_split_date_range_keeps_the_bound_format():
+    assert split_date_range("2023-01-01", "2023-01-04") == [
+        ("2023-01-01", "2023-01-02"), ("2023-01-02", "2023-01-03"), ("2023-01-03", "2023-01-04"),
+    ]
+    assert split_date_range("2023-01-01T12:00:00", "2023-01-02T06:00:00") == [
+        ("2023-01-01T12:00:00", "2023-01-02T06:00:00"),
+    ]
+    assert split_date_range("2023-01-01", "2023-01-20", "week") == [
+        ("2023-01-01", "2023-01-08"), ("2023-01-08", "2023-01-15"), ("2023-01-15", "2023-01-20"),
+    ]
+
+
+def test_split_date_range_mixes_aware_and_naive_bounds():
+    # 23:00 at UTC-2 is 01:00 UTC: the last shard stops at midnight UTC.
+    assert split_date_range("2023-01-01T23:00:00-02:00", "2023-01-04") == [
+        ("2023-01-01T23:00:00-02:00", "2023-01-02T23:00:00-02:00"),
+        ("2023-01-02T23:00:00-02:00", "2023-01-04T00:00:00+00:00"),
+    ]
+
+
+def test_resume_bound_compares_instants():
+    assert resume_bound("2023-01-01", None) == "2023-01-01"
+    assert resume_bound("2023-01-01", "2023-01-05") == "2023-01-05"
+    assert resume_bound("2023-01-05", "2023-01-02") == "2023-01-05"
+    # 23:00 at UTC-2 is after midnight UTC, though it sorts first as a string.
+    assert resume_bound("2023-01-02", "2023-01-01T23:00:00-02:00") == "2023-01-01T23:00:00-02:00"
+
+
+async def test_async_backfill_returns_rows_in_shard_order_and_reports_progress():
+    shards = split_date_range("2023-01-01", "2023-01-05")
+    reports = []
+
+    async def fetch(shard_after, shard_strictly_before):
+        await asyncio.sleep(0.01 * (5 - int(shard_after[-2:])))
+        return [shard_after]
+
+    results = await async_backfill(fetch, shards, concurrency=4, progress=reports.append)
+
+    assert results == [["2023-01-01"], ["2023-01-02"], ["2023-01-03"], ["2023-01-04"]]
+    # Shards complete last to first: nothing can be resumed before the first one is done.
+    assert [report.resume_after for report in reports] == [None, None, None, "2023-01-05"]
+    assert reports[-1].completed == reports[-1].total == 4
+
+
+async def test_async_backfill_raises_the_failed_shards():
+    shards = split_date_range("2023-01-01", "2023-01-04")
+    attempts = {}
+
+    async def fetch(shard_after, shard_strictly_before):
+        attempts[shard_after] = attempts.get(shard_after, 0) + 1
+        if shard_after == "2023-01-02":
+            raise ClientConnectionError()
+        return []
+
+    with pytest.raises(BackfillError) as excinfo:
+        await async_backfill(fetch, shards, retries=2, backoff=0)
+
+    assert excinfo.value.failed == [("2023-01-02", "2023-01-03")]
+    assert excinfo.value.resume_after == "2023-01-02"
+    assert attempts == {"2023-01-01": 1, "2023-01-02": 3, "2023-01-03": 1}
+
+
+async def test_async_backfill_backoff_frees_the_slot():
+    shards = split_date_range("2023-01-01", "2023-01-03")
+    calls = []
+
+    async def fetch(shard_after, shard_strictly_before):
+        calls.append(shard_after)
+        if calls.count(shard_after) == 1 and shard_after == "2023-01-01":
+            raise ClientConnectionError()
+        return [shard_after]
+
+    results = await async_backfill(fetch, shards, concurrency=1, backoff=0.05)
+
+    assert results == [["2023-01-01"], ["2023-01-02"]]
+    # The second shard ran while the first one was backing off.
+    assert calls == ["2023-01-01", "2023-01-02", "2023-01-01"]
+
+
+async def test_backfill_power_plant_minutes_resumes_and_deduplicates():
+    def handler(method, path, headers):
+        query = parse_qs(urlsplit(path).query)
+        day = query["date[after]"][0][:10]
+        members = [
+            {"@id": f"/v2/human/power_plant_minutes/{minute}", "@type": "PowerPlantMinute", "date": f"{day}T00:{minute:02d}:00+00:00",
+             "production": 1, "consumption": 1, "autoConsumption": 1, "gridConsumption": 0}
+            for minute in (1, 2)
+        ]
+        return collection(members)
+
+    api, session = make_api(handler)
+    minutes = await api.async_backfill_power_plant_minutes(
+        1, "2023-01-02", "2023-01-05", resume_after="2023-01-02T23:00:00-02:00",
+    )
+
+    starts = sorted(parse_qs(urlsplit(path).query)["date[after]"][0] for path in session.paths)
+    assert starts == ["2023-01-02T23:00:00-02:00", "2023-01-03T23:00:00-02:00"]
+    # Every shard returned the same two IDs: they are kept once.
+    assert [minute.id for minute in minutes] == [1, 2]
+
+
+async def test_async_backfill_retries_timeouts():
+    shards = split_date_range("2023-01-01", "2023-01-02")
+    attempts = []
+
+    async def fetch(shard_after, shard_strictly_before):
+        attempts.append(shard_after)
+        if len(attempts) == 1:
+            raise asyncio.TimeoutError()
+        return [shard_after]
+
+    assert await async_backfill(fetch, shards, backoff=0) == [["2023-01-01"]]
+    assert len(attempts) == 2
+
+
+async def test_backfill_power_plant_minutes_encodes_offsets_and_bounds_requests():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(method, path, headers):
+        query = parse_qs(urlsplit(path).query)
+        page = int(query["page"][0])
+        day = query["date[after]"][0][:10]
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        members = [
+            {"@id": f"/v2/human/power_plant_minutes/{day}-{page}", "@type": "PowerPlantMinute", "date": f"{day}T00:0{page}:00+01:00",
+             "production": 1, "consumption": 1, "autoConsumption": 1, "gridConsumption": 0}
+        ]
+        return collection(members, last_page=3, page=page)
+
+    api, session = make_api(handler)
+    minutes = await api.async_backfill_power_plant_minutes(1, "2023-01-01T00:00:00+01:00", "2023-01-05T00:00:00+01:00", concurrency=2)
+
+    assert len(minutes) == 12
+    assert all("%2B01:00" in path and "+" not in path for path in session.paths)
+    starts = {parse_qs(urlsplit(path).query)["date[after]"][0] for path in session.paths}
+    assert "2023-01-02T00:00:00+01:00" in starts
+    # Each shard reads its pages one at a time.
+    assert state["peak"] == 2
@@ -0,0 +1,68 @@
+from aiohttp import ClientSession
+
+from benchmarks import import_time, run
+from benchmarks.mock_server import PREFIX, MockConfig, start_server
+
+
+async def get(session, url):
+    async with session.get(url) as resp:
+        return resp.status, resp.headers, await resp.json(content_type=None) if resp.status < 400 else None
+
+
+async def test_mock_server_paginates_and_filters():
+    runner, mock, base_url = await start_server(MockConfig(plants=3, page_size=100, array_filters=False))
+    try:
+        async with ClientSession() as session:
+            url = f"{base_url}{PREFIX}/power_plant_minutes?plant={PREFIX}/plants/1&date[after]=2023-06-01&date[strictly_before]=2023-06-01T04:00:00"
+            status, _, data = await get(session, url + "&page=3")
+            assert status == 200
+            assert data["hydra:totalItems"] == 240
+            assert len(data["hydra:member"]) == 40
+            assert data["hydra:view"]["hydra:last"].endswith("page=3")
+            assert "hydra:next" not in data["hydra:view"]
+
+            status, _, _ = await get(session, f"{base_url}{PREFIX}/plant_statuses?plant[]={PREFIX}/plants/1&plant[]={PREFIX}/plants/2")
+            assert status == 400
+            assert mock.requests == 2
+    finally:
+        await runner.cleanup()
+
+
+async def test_mock_server_throttles_with_retry_after():
+    runner, _, base_url = await start_server(MockConfig(throttle_rate=1.0, retry_after=2))
+    try:
+        async with ClientSession() as session:
+            status, headers, _ = await get(session, f"{base_url}{PREFIX}/plants/1")
+            assert (status, headers["Retry-After"]) == (429, "2")
+    finally:
+        await runner.cleanup()
+
+
+async def test_benchmark_runs_every_workload(capsys):
+    args = run.parse_args(["--plants", "2", "--trackers-per-plant", "2", "--days", "1", "--rounds", "1", "--concurrency", "2"])
+    await run.main(args)
+
+    output = capsys.readouterr().out
+    for name in ("power series", "rows/s"):
+        assert name in output
+    assert len(output.splitlines()) >= len(run.WORKLOADS)
+
+
+async def test_benchmark_records_and_replays_its_traffic(tmp_path, capsys):
+    log = str(tmp_path / "traffic")
+    options = ["--plants", "1", "--trackers-per-plant", "1", "--days", "1", "--rounds", "1", "--workload", "status"]
+    await run.main(run.parse_args(options + ["--record", log]))
+    await run.main(run.parse_args(options + ["--replay", log]))
+
+    assert capsys.readouterr().out.count("status polling") == 2
+
+
+def test_import_time_probe_reports_failed_imports(monkeypatch, capsys):
+    monkeypatch.delenv("PYTHONPATH", raising=False)
+    elapsed, loaded = import_time.import_time_ms("lumioo.core", ("asyncio",))
+    assert elapsed > 0
+    assert "lumioo.core" in loaded and "aiohttp" not in loaded
+
+    monkeypatch.setattr(import_time, "TARGETS", {"lumioo.missing": (1.0, (), ())})
+    assert import_time.main(import_time.parse_args(["--rounds", "1"])) == 1
+    assert "lumioo.missing   import failed: ModuleNotFoundError" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from aiohttp import ClientResponseError
+
+from lumioo.core import MAX_URL_LENGTH
+
+from .helpers import collection, json_response, make_api
+
+
+def status(plant_id: int, with_plant: bool = True) -> dict:
+    member = {"@id": f"/v2/human/plant_statuses/{100 + plant_id}", "id": 100 + plant_id, "isSynchronised": True}
+    if with_plant:
+        member["plant"] = f"/v2/human/plants/{plant_id}"
+    return member
+
+
+def array_filters(method, path, headers):
+    if "plant[]=" in path:
+        ids = [int(value.rsplit("/", 1)[1]) for value in path.partition("?")[2].split("&") if value.startswith("plant[]=")]
+        return collection([status(plant_id) for plant_id in ids if plant_id % 2])
+    return collection([status(int(path.rsplit("/", 1)[1]))])
+
+
+async def test_ids_are_packed_in_array_filters():
+    api, session = make_api(array_filters)
+
+    statuses = await api.async_get_plant_statuses([1, 2, 3, 3])
+
+    assert session.paths == ["plant_statuses?plant[]=/v2/human/plants/1&plant[]=/v2/human/plants/2&plant[]=/v2/human/plants/3&page=1"]
+    assert sorted(statuses) == [1, 3]
+    assert statuses[3].id == 103
+
+
+async def test_queries_stay_under_the_url_length_limit():
+    api, session = make_api(array_filters)
+
+    statuses = await api.async_get_plant_statuses(range(1, 301))
+
+    assert len(session.paths) > 1
+    assert all(len(api.auth.host) + 1 + len(path) <= MAX_URL_LENGTH for path in session.paths)
+    assert sorted(statuses) == list(range(1, 301, 2))
+
+
+async def test_rejected_array_filters_fall_back_to_single_queries():
+    def handler(method, path, headers):
+        if "plant[]=" in path:
+            return json_response({"detail": "Invalid filter"}, status=400)
+        return array_filters(method, path, headers)
+
+    api, session = make_api(handler)
+
+    assert sorted(await api.async_get_plant_statuses([1, 2])) == [1, 2]
+    assert sorted(await api.async_get_plant_statuses([3])) == [3]
+    # The rejection is remembered: the second call goes straight to single queries.
+    assert [path for path in session.paths if "[]" in path] == [session.paths[0]]
+
+
+async def test_members_without_the_filtered_field_fall_back_to_single_queries():
+    def handler(method, path, headers):
+        if "plant[]=" in path:
+            return collection([status(1, with_plant=False)])
+        return array_filters(method, path, headers)
+
+    api, session = make_api(handler)
+
+    assert sorted(await api.async_get_plant_statuses([1, 2])) == [1, 2]
+    assert session.paths[1:] == ["plant_statuses?plant=/v2/human/plants/1", "plant_statuses?plant=/v2/human/plants/2"]
+
+
+async def test_other_lookup_errors_are_not_swallowed():
+    def handler(method, path, headers):
+        if "plant[]=" in path:
+            return {"@type": "hydra:Collection"}
+        return array_filters(method, path, headers)
+
+    api, session = make_api(handler)
+
+    with pytest.raises(KeyError):
+        await api.async_get_plant_statuses([1, 2])
+    assert len(session.paths) == 1
+    assert "plant_statuses" not in api._array_filters_rejected
+
+
+async def test_a_rejected_id_does_not_disable_array_filters():
+    def handler(method, path, headers):
+        if path.endswith("/plants/99") or "plants/99&" in path:
+            return json_response({"detail": "Invalid IRI"}, status=400)
+        return array_filters(method, path, headers)
+
+    api, session = make_api(handler)
+
+    with pytest.raises(ClientResponseError):
+        await api.async_get_plant_statuses([1, 99])
+    assert "plant_statuses" not in api._array_filters_rejected
+
+    assert sorted(await api.async_get_plant_statuses([1, 3])) == [1, 3]
+    assert session.paths[-1] == "plant_statuses?plant[]=/v2/human/plants/1&plant[]=/v2/human/plants/3&page=1"
+
+
+async def test_energy_day_fallback_keeps_to_the_concurrency():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(method, path, headers):
+        if "plant[]=" in path:
+            return json_response({"detail": "Invalid filter"}, status=400)
+        page = int(parse_qs(urlsplit(path).query)["page"][0])
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return collection([{"@id": f"/v2/human/energy_plant_days/{page}", "date": "2023-01-01T00:00:00+00:00"}], last_page=3, page=page)
+
+    api, session = make_api(handler)
+
+    days = await api.async_get_plants_energy_days([1, 2, 3, 4], "2023-01-01", "2023-01-04", concurrency=2)
+
+    assert [len(days[plant_id]) for plant_id in (1, 2, 3, 4)] == [3, 3, 3, 3]
+    assert state["peak"] == 2
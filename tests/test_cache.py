@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from lumioo.cache import CacheEntry, DiskCache, MemoryCache, ResponseCache, cache_key, parse_cache_key
+
+from .helpers import json_response, make_api
+
+
+def entry(body: bytes = b"{}", expires: float = None, etag: str = None) -> CacheEntry:
+    headers = [("content-type", "application/json")] + ([("ETag", etag)] if etag else [])
+    return CacheEntry("http://api.test/plants/1", 200, headers, body, time.time() + 60 if expires is None else expires)
+
+
+def test_response_cache_is_abstract():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+    class Incomplete(ResponseCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    class WithoutItems(ResponseCache):
+        get = set = delete = clear = lambda self, *args: None
+
+    with pytest.raises(TypeError):
+        WithoutItems()
+
+
+def test_memory_cache_evicts_the_least_recently_used():
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", entry(b"a"))
+    cache.set("b", entry(b"b"))
+    cache.get("a")
+    cache.set("c", entry(b"c"))
+
+    assert cache.get("b") is None
+    assert [key for key, _ in cache.items()] == ["a", "c"]
+    cache.delete("a")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_disk_cache_round_trips_entries(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set("GET plants/1", entry(b"\x00body", etag='"v1"'))
+
+    loaded = DiskCache(str(tmp_path)).get("GET plants/1")
+    assert (loaded.body, loaded.status, loaded.etag) == (b"\x00body", 200, '"v1"')
+    assert cache.get("GET plants/2") is None
+
+    cache.delete("GET plants/1")
+    assert cache.get("GET plants/1") is None
+    cache.set("GET plants/3", entry())
+    cache.clear()
+    assert cache.get("GET plants/3") is None
+
+
+def test_disk_cache_items_recover_the_keys(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    keys = [cache_key("plants/1"), cache_key("plants/1", {"Accept": "text/csv"})]
+    for key in keys:
+        cache.set(key, entry(key.encode()))
+    (tmp_path / "partial.tmp").write_bytes(b"{")
+    (tmp_path / ("0" * 40)).write_bytes(b'{"url": "", "status": 200, "headers": [], "expires": 0}\n')
+
+    items = dict(DiskCache(str(tmp_path)).items())
+    assert sorted(items) == sorted(keys)
+    assert all(items[key].body == key.encode() for key in keys)
+
+
+def test_cache_key_varies_with_headers():
+    assert cache_key("plants/1") == "GET plants/1"
+    assert cache_key("plants/1", {}) == "GET plants/1"
+    assert cache_key("plants/1", {"Accept": "text/csv"}) != cache_key("plants/1")
+    key = cache_key("plants/1", {"Accept": "text/csv", "X-Trace": "1"})
+    assert parse_cache_key(key) == ("plants/1", {"accept": "text/csv", "x-trace": "1"})
+    assert parse_cache_key("GET plants/1") == ("plants/1", {})
+
+
+def plant_handler(versions):
+    """Return a handler serving plant 1 with an ETag, answering 304 while it is unchanged."""
+    def handler(method, path, headers):
+        etag = f'"v{versions[0]}"'
+        if headers.get("if-none-match") == etag:
+            return json_response(None, status=304, headers={"ETag": etag})
+        return json_response({"id": 1, "name": f"Plant v{versions[0]}"}, headers={"ETag": etag})
+    return handler
+
+
+async def test_fresh_entries_are_served_from_the_cache():
+    api, session = make_api(plant_handler([1]), cache=MemoryCache())
+
+    first = await api.async_get_plant(1)
+    second = await api.async_get_plant(1)
+
+    assert first.name == second.name == "Plant v1"
+    assert len(session.requests) == 1
+
+
+async def test_stale_entries_are_revalidated():
+    versions = [1]
+    api, session = make_api(plant_handler(versions), cache=MemoryCache(), ttls={"plants": 60})
+    await api.async_get_plant(1)
+
+    api.auth.cache.get("GET plants/1").expires = 0
+    assert (await api.async_get_plant(1)).name == "Plant v1"
+    assert session.requests[-1][2]["if-none-match"] == '"v1"'
+    assert api.auth.cache.get("GET plants/1").fresh
+
+    versions[0] = 2
+    api.auth.cache.get("GET plants/1").expires = 0
+    assert (await api.async_get_plant(1)).name == "Plant v2"
+    assert len(session.requests) == 3
+
+
+async def test_families_without_ttl_are_not_cached():
+    api, session = make_api(plant_handler([1]), cache=MemoryCache(), ttls={"trackers": 60})
+    await api.async_get_plant(1)
+    await api.async_get_plant(1)
+    assert len(session.requests) == 2
+
+
+async def test_concurrent_gets_share_one_request_per_headers():
+    async def handler(method, path, headers):
+        await asyncio.sleep(0.01)
+        return {"accept": headers.get("Accept")}
+
+    api, session = make_api(handler, cache=MemoryCache())
+
+    async def get(headers=None):
+        resp = await api.auth.request("get", "plants/1", headers=headers)
+        return await resp.json()
+
+    results = await asyncio.gather(get(), get(), get({"Accept": "text/csv"}), get({"Accept": "text/csv"}))
+
+    assert results == [{"accept": None}, {"accept": None}, {"accept": "text/csv"}, {"accept": "text/csv"}]
+    assert len(session.requests) == 2
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lumioo.deviation import DeviationDetector, RunningStats
+from lumioo.solar import ProductionEstimate, SolarTimes
+
+START = datetime(2023, 6, 1, 10, tzinfo=timezone.utc)
+
+
+def estimates(hours: int, production: float = 60.0):
+    return [
+        ProductionEstimate(1, {
+            "@type": "ProductionEstimate",
+            "begin": (START + timedelta(hours=hour)).isoformat(),
+            "end": (START + timedelta(hours=hour + 1)).isoformat(),
+            "production": production,
+        }, None)
+        for hour in range(hours)
+    ]
+
+
+def feed(detector, key, hours: int, watts: float, start: datetime = START):
+    ratios = []
+    for minute in range(hours * 60):
+        ratio = detector.add_sample(key, start + timedelta(minutes=minute), watts)
+        if ratio is not None:
+            ratios.append(ratio)
+    return ratios
+
+
+def test_running_stats_matches_the_batch_statistics():
+    values = [4.0, 7.0, 13.0, 16.0]
+    stats = RunningStats(alpha=0.5)
+    for value in values:
+        stats.update(value)
+
+    assert (stats.count, stats.mean, stats.minimum, stats.maximum) == (4, 10.0, 4.0, 16.0)
+    assert stats.variance == pytest.approx(30.0)
+    assert stats.stddev == pytest.approx(30.0 ** 0.5)
+    assert stats.recent == 12.625
+    assert RunningStats().variance == 0.0
+
+
+def test_windows_are_closed_by_the_next_window():
+    detector = DeviationDetector()
+    detector.set_estimates("plant", estimates(3))
+
+    # 60 W during a minute is 1 Wh, 60 Wh per hour as estimated.
+    assert feed(detector, "plant", 3, 60.0) == [pytest.approx(1.0)] * 2
+    assert detector.flush("plant") == pytest.approx(1.0)
+    assert detector.flush("plant") is None
+    assert detector.stats("plant").count == 3
+
+
+def test_underperforming_plants_are_reported_after_enough_windows():
+    detector = DeviationDetector(threshold=0.8, min_windows=3)
+    for key in ("good", "bad"):
+        detector.set_estimates(key, estimates(4))
+    feed(detector, "good", 4, 60.0)
+    ratios = feed(detector, "bad", 2, 30.0)
+
+    assert ratios == [pytest.approx(0.5)]
+    assert detector.underperforming() == {}
+
+    feed(detector, "bad", 2, 30.0, START + timedelta(hours=2))
+    assert detector.underperforming() == {"bad": pytest.approx(0.5)}
+    assert detector.underperforming(threshold=0.4) == {}
+
+
+def test_share_scales_the_estimates():
+    detector = DeviationDetector()
+    detector.set_estimates("tracker", estimates(2), share=0.5)
+
+    assert feed(detector, "tracker", 2, 30.0) == [pytest.approx(1.0)]
+
+
+def test_partial_windows_are_prorated():
+    detector = DeviationDetector()
+    detector.set_estimates("plant", estimates(1))
+    for minute in range(30):
+        detector.add_sample("plant", START + timedelta(minutes=minute), 60.0)
+
+    assert detector.flush("plant") == pytest.approx(1.0)
+
+
+def test_samples_outside_the_estimates_or_daylight_are_ignored():
+    detector = DeviationDetector()
+    detector.set_estimates("plant", estimates(2))
+    detector.set_solar_times("plant", SolarTimes(1, "2023-06-01", {"hydra:member": [{
+        "@type": "SolarTimes",
+        "sunrise": (START + timedelta(minutes=30)).isoformat(),
+        "sunset": (START + timedelta(hours=5)).isoformat(),
+    }]}, None))
+
+    assert detector.add_sample("plant", START - timedelta(minutes=1), 60.0) is None
+    assert detector.add_sample("plant", START + timedelta(hours=3), 60.0) is None
+    # Samples before sunrise are not accumulated, so they cannot skew the ratio.
+    for minute in range(60):
+        detector.add_sample("plant", START + timedelta(minutes=minute), 600.0 if minute < 30 else 60.0)
+    assert detector.flush("plant") == pytest.approx(1.0)
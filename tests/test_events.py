@@ -0,0 +1,107 @@
+import asyncio
+
+from lumioo.events import (
+    AlarmCleared,
+    AlarmRaised,
+    ChangeDetector,
+    StatusLevelChanged,
+    SyncLost,
+    SyncRestored,
+    WindSpeedThresholdExceeded,
+)
+from lumioo.plant import PlantStatus
+from lumioo.tracker import TrackerStatus
+
+
+def plant_status(synchronised: bool = True, level: int = 0, alarm: int = 0) -> PlantStatus:
+    return PlantStatus({"hydra:member": [{
+        "isSynchronised": synchronised,
+        "statusType": {"level": level},
+        "alarmLevel1": alarm,
+        "alarmLevel2": 0,
+        "alarmLevel3": 0,
+    }]}, None)
+
+
+def tracker_status(wind: float = 5.0, label=None) -> TrackerStatus:
+    return TrackerStatus({"hydra:member": [{
+        "isSynchronised": True,
+        "alarms": 0,
+        "maxWindSpeed20": wind,
+        "control": {"alarmLabel": label, "maxWindSpeed": None},
+    }]}, None)
+
+
+def kinds(events):
+    return [(type(event), event.field, event.previous, event.current) for event in events]
+
+
+async def test_changes_of_watched_fields_become_typed_events():
+    detector = ChangeDetector()
+
+    assert detector.observe("plant", 1, plant_status()) == []
+    assert detector.observe("plant", 1, plant_status()) == []
+    events = detector.observe("plant", 1, plant_status(synchronised=False, level=2, alarm=1))
+
+    assert kinds(events) == [
+        (SyncLost, "isSynchronised", True, False),
+        (StatusLevelChanged, "statusType.level", 0, 2),
+        (AlarmRaised, "alarmLevel1", 0, 1),
+    ]
+    assert events[0].resource_id == 1 and events[0].kind == "plant"
+    assert kinds(detector.observe("plant", 1, plant_status(level=2))) == [
+        (SyncRestored, "isSynchronised", False, True),
+        (AlarmCleared, "alarmLevel1", 1, 0),
+    ]
+    assert detector.queue.qsize() == 5
+    assert [detector.queue.get_nowait() for _ in range(3)] == events
+
+
+async def test_tracker_labels_and_wind_threshold():
+    detector = ChangeDetector(wind_speed_threshold=15.0)
+    detector.observe("tracker", 7, tracker_status())
+
+    assert kinds(detector.observe("tracker", 7, tracker_status(wind=20.0, label="Motor"))) == [
+        (AlarmRaised, "control.alarmLabel", None, "Motor"),
+        (WindSpeedThresholdExceeded, "maxWindSpeed20", 5.0, 20.0),
+    ]
+    # Still above the threshold: no new event.
+    assert detector.observe("tracker", 7, tracker_status(wind=25.0, label="Motor")) == []
+    assert kinds(detector.observe("tracker", 7, tracker_status(wind=5.0))) == [
+        (AlarmCleared, "control.alarmLabel", "Motor", None),
+    ]
+
+
+async def test_initial_statuses_are_compared_to_a_clear_state():
+    assert ChangeDetector().observe("plant", 1, plant_status(alarm=3)) == []
+
+    detector = ChangeDetector(emit_initial=True)
+    assert kinds(detector.observe("plant", 1, plant_status(synchronised=False, alarm=3))) == [
+        (SyncLost, "isSynchronised", True, False),
+        (StatusLevelChanged, "statusType.level", None, 0),
+        (AlarmRaised, "alarmLevel1", None, 3),
+    ]
+    detector.forget("plant", 1)
+    assert len(detector.observe("plant", 1, plant_status(synchronised=False, alarm=3))) == 3
+
+
+async def test_a_full_queue_drops_the_oldest_events():
+    detector = ChangeDetector(maxsize=2)
+    detector.observe("plant", 1, plant_status())
+    for alarm in (1, 2, 3):
+        detector.observe("plant", 1, plant_status(alarm=alarm))
+
+    assert detector.dropped == 1
+    assert [event.current for event in (detector.queue.get_nowait(), detector.queue.get_nowait())] == [2, 3]
+
+
+def test_detector_created_outside_the_event_loop():
+    detector = ChangeDetector()
+    assert detector._queue is None
+
+    async def consume():
+        detector.observe("plant", 1, plant_status(alarm=0))
+        detector.observe("plant", 1, plant_status(alarm=1))
+        return await asyncio.wait_for(detector.queue.get(), 1)
+
+    assert isinstance(asyncio.run(consume()), AlarmRaised)
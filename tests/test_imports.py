@@ -0,0 +1,41 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import lumioo
+from lumioo import utils
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+@pytest.mark.parametrize("module", ["lumioo", "lumioo.plant", "lumioo.analyse", "lumioo.core", "lumioo.poller"])
+def test_importing_does_not_load_aiohttp_nor_numpy(module):
+    probe = f"import {module}, json, sys; print(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    output = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True, text=True, check=True).stdout
+
+    loaded = set(json.loads(output))
+    assert "aiohttp" not in loaded
+    assert "numpy" not in loaded
+
+
+def test_public_names_are_resolved_on_first_access():
+    for name in lumioo.__all__:
+        value = getattr(lumioo, name)
+        assert value.__name__ == name
+        assert value.__module__ == f"lumioo.{lumioo._LAZY_ATTRIBUTES[name]}"
+    assert set(lumioo.__all__) <= set(dir(lumioo))
+    with pytest.raises(AttributeError):
+        lumioo.NotAPublicName
+
+
+def test_client_errors_are_resolved_once():
+    from aiohttp import ClientConnectionError, ClientError
+
+    assert utils.client_errors() == (ClientError, asyncio.TimeoutError)
+    assert utils.client_errors() is utils.client_errors()
+    assert issubclass(ClientConnectionError, utils.client_errors())
@@ -0,0 +1,105 @@
+import pytest
+
+from lumioo.cache import MemoryCache
+from lumioo.metrics import Instrumentation, RequestTrace
+from lumioo.ratelimit import RateLimiter
+
+from .helpers import json_response, make_api
+
+
+class TraceCollector(Instrumentation):
+    enabled = True
+
+    def __init__(self) -> None:
+        self.traces = []
+
+    def record(self, trace: RequestTrace) -> None:
+        self.traces.append(trace)
+
+
+def plant(method, path, headers):
+    return {"id": 1, "name": "Plant"}
+
+
+async def test_calls_are_traced_up_to_the_model_construction():
+    instrumentation = TraceCollector()
+    api, _ = make_api(plant, instrumentation=instrumentation, rate_limiter=RateLimiter(None, family_rates={"plants": 1000}))
+
+    assert (await api.async_get_plant(1)).name == "Plant"
+
+    trace, = instrumentation.traces
+    assert (trace.method, trace.path, trace.family, trace.status) == ("get", "plants/1", "plants", 200)
+    assert trace.bytes_received == len(b'{"id": 1, "name": "Plant"}')
+    assert 0 <= trace.wait_time and 0 <= trace.ttfb <= trace.total_time
+    assert trace.decode_time is not None and trace.build_time is not None
+    assert (trace.retries, trace.cache_hit, trace.error) == (0, False, None)
+
+
+async def test_retries_cache_hits_and_errors_are_traced():
+    answers = [json_response({}, status=503), {"id": 1}]
+    instrumentation = TraceCollector()
+    api, _ = make_api(lambda *request: answers.pop(0), instrumentation=instrumentation, cache=MemoryCache())
+
+    await api.async_get_plant(1)
+    await api.async_get_plant(1)
+    api.auth.websession.handler = lambda *request: json_response({}, status=404)
+    with pytest.raises(Exception) as info:
+        await api.async_get_plant(2)
+
+    retried, cached, failed = instrumentation.traces
+    assert (retried.retries, retried.status, retried.cache_hit) == (1, 200, False)
+    assert (cached.cache_hit, cached.status) == (True, 200)
+    assert (failed.status, failed.error) == (404, type(info.value).__name__)
+    assert failed.total_time is not None
+
+
+async def test_disabled_instrumentation_creates_no_trace(monkeypatch):
+    def forbidden(*args):
+        raise AssertionError("trace created")
+
+    monkeypatch.setattr("lumioo.core.RequestTrace", forbidden)
+    monkeypatch.setattr("lumioo.auth.RequestTrace", forbidden)
+    api, _ = make_api(plant)
+
+    assert (await api.async_get_plant(1)).id == 1
+
+
+def finished_trace() -> RequestTrace:
+    trace = RequestTrace("GET", "plants/1")
+    trace.status = 200
+    trace.ttfb = trace.total_time = 0.01
+    trace.bytes_received = 42
+    trace.retries = 1
+    return trace
+
+
+def test_prometheus_instrumentation_exports_the_traces():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    from lumioo.metrics import PrometheusInstrumentation
+
+    registry = prometheus_client.CollectorRegistry()
+    PrometheusInstrumentation(registry).record(finished_trace())
+
+    labels = {"family": "plants", "method": "get", "status": "200"}
+    assert registry.get_sample_value("lumioo_requests_total", labels) == 1
+    assert registry.get_sample_value("lumioo_response_bytes_total", {"family": "plants"}) == 42
+    assert registry.get_sample_value("lumioo_retries_total", {"family": "plants"}) == 1
+
+
+def test_opentelemetry_instrumentation_emits_spans():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    from lumioo.metrics import OpenTelemetryInstrumentation
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    OpenTelemetryInstrumentation(provider.get_tracer("test")).record(finished_trace())
+
+    span, = exporter.get_finished_spans()
+    assert span.name == "lumioo plants"
+    assert span.attributes["http.response.status_code"] == 200
+    assert span.end_time - span.start_time == 10_000_000
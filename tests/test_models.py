@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+
+from lumioo.analyse import PowerPlantMinute
+from lumioo.meter import Meter, MeterStatus
+from lumioo.models import Model, iri_to_id
+from lumioo.plant import Plant, PlantEnergyDay, PlantStatus
+from lumioo.solar import ProductionEstimate, SolarTimes
+from lumioo.tracker import Tracker, TrackerStatus
+from lumioo.user import User
+
+PLANT = {
+    "id": 12,
+    "user": "/v2/human/users/3",
+    "name": "Roof",
+    "timezone": "Europe/Paris",
+    "operationDate": "2020-01-01T00:00:00+00:00",
+    "mainMeter": "/v2/human/meters/7",
+}
+
+
+def test_iri_to_id():
+    assert iri_to_id("/v2/human/plants/12") == 12
+    assert iri_to_id(None) is None
+
+
+def test_cached_fields_are_parsed_once_until_raw_data_changes():
+    plant = Plant(dict(PLANT), None)
+
+    operation_date = plant.operation_date
+    assert operation_date == datetime.fromisoformat(PLANT["operationDate"])
+    assert plant.operation_date is operation_date
+    assert (plant.user, plant.main_meter) == (3, 7)
+
+    plant.raw_data = dict(PLANT, operationDate="2021-05-01T00:00:00+00:00", mainMeter="/v2/human/meters/8")
+    assert plant.operation_date.year == 2021
+    assert plant.main_meter == 8
+
+
+def test_item_access_reads_properties():
+    plant = Plant(PLANT, None)
+    assert plant["name"] == "Roof"
+    assert plant["main_meter"] == 7
+
+
+@pytest.mark.parametrize("model", [
+    Plant(PLANT, None),
+    PlantStatus({"hydra:member": [{}]}, None),
+    PlantEnergyDay(1, {}, None),
+    Tracker({}, None),
+    TrackerStatus({"hydra:member": [{}]}, None),
+    Meter({}, None),
+    MeterStatus({}, None),
+    SolarTimes(1, "2023-06-01", {"hydra:member": [{}]}, None),
+    ProductionEstimate(1, {}, None),
+    PowerPlantMinute({}, None),
+    User({}, None),
+])
+def test_models_have_no_instance_dict(model):
+    assert isinstance(model, Model)
+    assert not hasattr(model, "__dict__")
+    with pytest.raises(AttributeError):
+        model.unknown_attribute = 1
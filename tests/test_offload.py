@@ -0,0 +1,100 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from aiohttp import ClientResponseError
+
+from lumioo import offload
+from lumioo.analyse import PowerSeries
+from lumioo.response import BufferedResponse
+
+from .helpers import collection, json_response, make_api
+
+PAGES = 5
+PAGE_SIZE = 50
+
+
+def minute(index: int) -> dict:
+    return {
+        "@id": f"/v2/human/power_plant_minutes/{index}",
+        "date": f"2023-06-01T{index // 60:02d}:{index % 60:02d}:00+00:00",
+        "production": float(index), "consumption": 1.0, "autoConsumption": 1.0, "gridConsumption": 0.0,
+    }
+
+
+def paged_minutes(failing_page=None):
+    async def handler(method, path, headers):
+        page = int(path.rsplit("page=", 1)[1])
+        if page == failing_page:
+            # Fails once every following page was fetched and decoded.
+            await asyncio.sleep(0.5)
+            return json_response({"detail": "Not Found"}, status=404)
+        members = [minute((page - 1) * PAGE_SIZE + index) for index in range(PAGE_SIZE)]
+        return collection(members, total=PAGES * PAGE_SIZE, last_page=PAGES, page=page)
+    return handler
+
+
+def shared_blocks() -> set:
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+async def fetch(api, executor) -> PowerSeries:
+    return await api.async_get_power_series(1, "2023-06-01", "2023-06-02", prefetch=4, executor=executor)
+
+
+@pytest.mark.parametrize("executor_type", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+async def test_pages_decoded_in_an_executor_build_the_same_series(executor_type):
+    api, _ = make_api(paged_minutes())
+    executor = executor_type(2) if executor_type is not None else None
+    try:
+        series = await fetch(api, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    assert len(series) == PAGES * PAGE_SIZE
+    assert list(series.ids) == list(range(PAGES * PAGE_SIZE))
+    assert series.sum("production") == sum(range(PAGES * PAGE_SIZE))
+
+
+@pytest.mark.skipif(offload.shared_memory is None or not os.path.isdir("/dev/shm"), reason="Needs POSIX shared memory")
+async def test_prefetched_pages_are_released_when_a_page_fails():
+    api, session = make_api(paged_minutes(failing_page=2))
+    before = shared_blocks()
+    with ProcessPoolExecutor(2) as executor:
+        # Start the workers before timing the pages.
+        await asyncio.get_running_loop().run_in_executor(executor, offload.release_columns, {"hydra:member": offload.ColumnBuffers(0)})
+
+        with pytest.raises(ClientResponseError):
+            await fetch(api, executor)
+
+    assert sorted(session.paths)[-1].endswith("page=5")
+    assert shared_blocks() - before == set()
+
+
+def test_resample_off_the_loop():
+    series = PowerSeries.from_members(minute(index) for index in range(120))
+
+    async def resample(executor):
+        return await offload.async_resample(series, 3600, "sum", executor)
+
+    with ThreadPoolExecutor(1) as executor:
+        resampled = asyncio.run(resample(executor))
+    assert list(resampled.production) == [sum(range(60)), sum(range(60, 120))]
+
+
+async def test_failed_bodies_release_their_response():
+    released = []
+
+    class Response(BufferedResponse):
+        def release(self) -> None:
+            released.append(self.status)
+
+    api, _ = make_api(lambda *request: Response("get", "http://api.test/", 404, [], b"{}"))
+    with pytest.raises(ClientResponseError):
+        await api._async_get_body("power_plant_minutes?page=1")
+    with pytest.raises(ClientResponseError):
+        await api.async_get_plant(1)
+
+    assert released == [404, 404]
@@ -0,0 +1,93 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+from .helpers import collection, make_api
+
+
+def page_of(path: str) -> int:
+    return int(parse_qs(urlsplit(path).query).get("page", ["1"])[0])
+
+
+def minute(index: int) -> dict:
+    return {
+        "@id": f"/v2/human/power_plant_minutes/{index}",
+        "@type": "PowerPlantMinute",
+        "date": f"2023-06-01T00:{index:02d}:00+00:00",
+        "production": float(index),
+        "consumption": 1.0,
+        "autoConsumption": 1.0,
+        "gridConsumption": 0.0,
+    }
+
+
+def paged_minutes(pages: int, page_size: int = 3, last_link: bool = True, delays=None):
+    """Return a handler serving `pages` pages of minutes, later pages answering first."""
+    in_flight = {"now": 0, "max": 0, "cancelled": []}
+
+    async def handler(method, path, headers):
+        page = page_of(path)
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        try:
+            await asyncio.sleep((delays or {}).get(page, 0.01 * (pages - page)))
+        except asyncio.CancelledError:
+            in_flight["cancelled"].append(page)
+            raise
+        finally:
+            in_flight["now"] -= 1
+        members = [minute((page - 1) * page_size + index) for index in range(page_size)]
+        data = collection(members, total=pages * page_size, last_page=pages, page=page)
+        if not last_link:
+            del data["hydra:view"]["hydra:last"]
+            del data["hydra:totalItems"]
+        return data
+
+    return handler, in_flight
+
+
+async def test_iter_power_plant_minutes_yields_every_page_in_order():
+    handler, in_flight = paged_minutes(pages=6)
+    api, session = make_api(handler)
+
+    minutes = [minute async for minute in api.async_iter_power_plant_minutes(1, "2023-06-01", "2023-06-02", prefetch=2)]
+
+    assert [minute.id for minute in minutes] == list(range(18))
+    assert sorted(page_of(path) for path in session.paths) == [1, 2, 3, 4, 5, 6]
+    assert in_flight["max"] == 2
+
+
+async def test_iter_follows_next_links_without_page_count():
+    handler, in_flight = paged_minutes(pages=4, last_link=False)
+    api, session = make_api(handler)
+
+    minutes = [minute async for minute in api.async_iter_power_plant_minutes(1, "2023-06-01", "2023-06-02")]
+
+    assert [minute.id for minute in minutes] == list(range(12))
+    assert [page_of(path) for path in session.paths] == [1, 2, 3, 4]
+    assert in_flight["max"] == 1
+
+
+async def test_iter_plant_energy_days_single_page():
+    days = [{"@type": "EnergyPlantDay", "date": f"2023-06-0{day}", "production": 1, "consumption": 1, "autoConsumption": 1, "gridConsumption": 0} for day in range(1, 4)]
+    api, session = make_api(lambda method, path, headers: collection(days))
+
+    energy_days = [day async for day in api.async_iter_plant_energy_days(7, "2023-06-01", "2023-06-04")]
+
+    assert [day.date.day for day in energy_days] == [1, 2, 3]
+    assert {day.plant_id for day in energy_days} == {7}
+    assert len(session.requests) == 1
+
+
+async def test_breaking_out_cancels_prefetched_pages():
+    handler, in_flight = paged_minutes(pages=10, delays={2: 0.01, 3: 1.0, 4: 1.0})
+    api, session = make_api(handler)
+
+    minutes = api.async_iter_power_plant_minutes(1, "2023-06-01", "2023-06-02", prefetch=3)
+    async for minute in minutes:
+        if minute.id == 3:
+            break
+    await minutes.aclose()
+    await asyncio.sleep(0)
+
+    assert sorted(page_of(path) for path in session.paths) == [1, 2, 3, 4]
+    assert sorted(in_flight["cancelled"]) == [3, 4]
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from lumioo.cache import CacheEntry, DiskCache, MemoryCache, cache_key
+from lumioo.persist import SnapshotError, dump_entries, load_entries
+
+from .helpers import json_response, make_api
+
+
+@pytest.fixture(params=["memory", "disk"])
+def new_cache(request, tmp_path):
+    """Return a factory of empty caches of one kind."""
+    def factory():
+        if request.param == "memory":
+            return MemoryCache()
+        return DiskCache(str(tmp_path / f"cache{len(list(tmp_path.iterdir()))}"))
+    return factory
+
+
+def test_entries_round_trip_through_a_snapshot():
+    entries = [(cache_key("plants/1"), CacheEntry("http://api.test/", 200, [("ETag", '"v1"')], b"\x00{}", 12.5))]
+
+    (key, loaded), = load_entries(dump_entries(entries))
+    assert key == entries[0][0]
+    assert (loaded.url, loaded.status, loaded.headers, loaded.body, loaded.expires) == (
+        "http://api.test/", 200, [("ETag", '"v1"')], b"\x00{}", 12.5,
+    )
+    with pytest.raises(SnapshotError):
+        load_entries(b"LMSN\x02\x00")
+    with pytest.raises(SnapshotError):
+        load_entries(b"XXXX\x01\x00")
+
+
+async def test_snapshots_warm_start_a_new_client(new_cache, tmp_path):
+    def handler(method, path, headers):
+        if headers.get("if-none-match") == '"v1"':
+            return json_response(None, status=304, headers={"ETag": '"v1"'})
+        return json_response({"id": 1, "name": "Plant"}, headers={"ETag": '"v1"'})
+
+    api, _ = make_api(handler, cache=new_cache())
+    await api.async_get_plant(1)
+    snapshot = str(tmp_path / "snapshot")
+    assert api.save_snapshot(snapshot) == 1
+
+    warm, session = make_api(handler, cache=new_cache())
+    task = await warm.async_load_snapshot(snapshot, grace=60)
+    assert (await warm.async_get_plant(1)).name == "Plant"
+    await task
+
+    # Only the background revalidation reached the API, as a conditional request.
+    assert [(path, headers.get("if-none-match")) for _, path, headers in session.requests] == [("plants/1", '"v1"')]
+    assert warm.auth.cache.get(cache_key("plants/1")).expires > time.time() + 60
+
+
+async def test_a_missing_snapshot_is_a_cold_start(tmp_path):
+    api, _ = make_api(lambda *request: {})
+
+    assert await api.async_load_snapshot(str(tmp_path / "missing")) is None
+    assert isinstance(api.auth.cache, MemoryCache)
+    assert make_api(lambda *request: {})[0].save_snapshot(str(tmp_path / "none")) == 0
+
+
+async def test_revalidation_timeouts_keep_the_loaded_responses(tmp_path):
+    api, _ = make_api(lambda *request: json_response({"id": 1, "name": "Plant"}, headers={"ETag": '"v1"'}), cache=MemoryCache())
+    await api.async_get_plant(1)
+    snapshot = str(tmp_path / "snapshot")
+    api.save_snapshot(snapshot)
+
+    def timeout(method, path, headers):
+        raise asyncio.TimeoutError()
+
+    warm, session = make_api(timeout, cache=MemoryCache())
+    task = await warm.async_load_snapshot(snapshot, grace=60)
+    await task
+
+    assert session.requests
+    assert (await warm.async_get_plant(1)).name == "Plant"
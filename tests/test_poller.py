@@ -0,0 +1,117 @@
+import asyncio
+import logging
+
+from lumioo.poller import FleetPoller
+
+from .helpers import collection, make_api
+
+
+def plant_status(plant_id: int, alarms: int = 0, synchronisation: str = "2023-06-01T12:00:00+00:00") -> dict:
+    return {
+        "@type": "PlantStatus",
+        "id": 1000 + plant_id,
+        "plant": f"/v2/human/plants/{plant_id}",
+        "latestSynchronisation": synchronisation,
+        "isSynchronised": True,
+        "statusType": {"@type": "StatusType", "id": 1, "label": "Ok", "reference": "OK", "level": 1},
+        "alarmLevel1": alarms,
+        "alarmLevel2": 0,
+        "alarmLevel3": 0,
+    }
+
+
+async def test_poll_publishes_only_changes():
+    alarms = [0]
+    api, session = make_api(lambda method, path, headers: collection([plant_status(1, alarms[0])]))
+    poller = FleetPoller(api, plant_ids=[1])
+    queue = poller.subscribe()
+
+    first = await poller.async_poll("plant", 1)
+    assert await poller.async_poll("plant", 1) is None
+    alarms[0] = 1
+    second = await poller.async_poll("plant", 1)
+
+    assert [queue.get_nowait(), queue.get_nowait()] == [first, second]
+    assert second.status.alarm_level_1 == 1
+    assert queue.empty()
+    assert session.paths == ["plant_statuses?plant=/v2/human/plants/1"] * 3
+
+
+async def test_full_queue_drops_the_oldest_change():
+    alarms = [0]
+    api, session = make_api(lambda method, path, headers: collection([plant_status(1, alarms[0])]))
+    poller = FleetPoller(api, plant_ids=[1])
+    slow = poller.subscribe(maxsize=1)
+    fast = poller.subscribe()
+
+    changes = []
+    for level in range(3):
+        alarms[0] = level
+        changes.append(await asyncio.wait_for(poller.async_poll("plant", 1), 1))
+
+    assert poller.dropped == 2
+    assert slow.get_nowait() == changes[-1]
+    assert [fast.get_nowait() for _ in range(3)] == changes
+
+
+async def test_polling_survives_unexpected_errors(caplog):
+    responses = [collection([]), {"unexpected": True}, collection([plant_status(1)])]
+
+    def handler(method, path, headers):
+        return responses.pop(0) if len(responses) > 1 else responses[0]
+
+    api, session = make_api(handler)
+    poller = FleetPoller(api, plant_ids=[1], intervals={"plant": 0.01}, jitter=0)
+    queue = poller.subscribe()
+
+    with caplog.at_level(logging.ERROR, logger="lumioo.poller"):
+        async with poller:
+            change = await asyncio.wait_for(queue.get(), 1)
+
+    assert change.resource_id == 1
+    # An empty hydra:member raised IndexError, the malformed page KeyError.
+    assert [record.exc_info[0] for record in caplog.records] == [IndexError, KeyError]
+
+
+async def test_polling_survives_scheduler_errors(caplog):
+    class BrokenScheduler:
+        def observe(self, kind, resource_id, status):
+            pass
+
+        async def async_delay(self, kind, resource_id, interval):
+            raise RuntimeError("no time zone database")
+
+    api, session = make_api(lambda method, path, headers: collection([plant_status(1)]))
+    poller = FleetPoller(api, plant_ids=[1], intervals={"plant": 0.01}, jitter=0, scheduler=BrokenScheduler())
+
+    with caplog.at_level(logging.ERROR, logger="lumioo.poller"):
+        async with poller:
+            await asyncio.sleep(0.05)
+
+    assert len(session.requests) > 2
+    assert all(record.exc_info[0] is RuntimeError for record in caplog.records)
+
+
+async def test_start_spreads_the_first_polls():
+    api, session = make_api(lambda method, path, headers: collection([plant_status(1)]))
+    poller = FleetPoller(api, plant_ids=[1, 2, 3, 4], intervals={"plant": 0.4}, jitter=0)
+
+    async with poller:
+        await asyncio.sleep(0.05)
+        assert len(session.requests) == 1
+        await asyncio.sleep(0.1)
+        assert len(session.requests) == 2
+    assert poller._tasks == []
+
+
+def test_poller_created_outside_the_event_loop():
+    api, session = make_api(lambda method, path, headers: collection([plant_status(1)]))
+    poller = FleetPoller(api, plant_ids=[1])
+
+    async def poll():
+        poller.start()
+        await poller.async_poll("plant", 1)
+        await poller.async_stop()
+
+    asyncio.run(poll())
+    assert len(session.requests) >= 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from lumioo.pool import AccountRateLimiter, ClientPool
+from lumioo.ratelimit import FairScheduler
+
+from .helpers import FakeSession
+
+
+async def test_fair_scheduler_serves_clients_in_turn():
+    scheduler = FairScheduler(rate=200, capacity=1)
+    served = []
+
+    async def request(client: str) -> None:
+        await scheduler.acquire(client)
+        served.append(client)
+
+    await asyncio.gather(*(request("busy") for _ in range(4)), request("quiet"), request("other"))
+
+    assert served[:3] == ["busy", "quiet", "other"]
+    assert served[3:] == ["busy"] * 3
+
+
+async def test_cancelled_waiters_give_their_turn_away():
+    scheduler = FairScheduler(rate=20, capacity=1)
+    await scheduler.acquire("first")
+    cancelled = asyncio.ensure_future(scheduler.acquire("cancelled"))
+    waiting = asyncio.ensure_future(scheduler.acquire("waiting"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    # One token period for the waiting client, not two.
+    assert await asyncio.wait_for(waiting, 0.09) < 0.09
+    assert cancelled.cancelled()
+
+
+async def test_the_account_budget_is_taken_after_the_fair_turn(monkeypatch):
+    events = []
+    scheduler = FairScheduler(rate=1000)
+    limiter = AccountRateLimiter("account", rate=1000, scheduler=scheduler)
+
+    async def fair_turn(client):
+        events.append(("turn", client))
+        return 0.0
+
+    async def account_token(self, family):
+        events.append(("account", family))
+        return 0.0
+
+    monkeypatch.setattr(scheduler, "acquire", fair_turn)
+    monkeypatch.setattr("lumioo.ratelimit.RateLimiter.acquire", account_token)
+
+    await limiter.acquire("plants")
+    assert events == [("turn", "account"), ("account", "plants")]
+
+
+async def test_pool_accounts_share_the_session_and_the_fair_scheduler():
+    session = FakeSession(lambda method, path, headers: {"id": 1, "name": headers["authorization"]})
+    pool = ClientPool(session, rate=1000, account_rate=500)
+    first = pool.add_account("first", "token-1")
+    second = pool.add_account("second", "token-2")
+
+    assert [(await api.async_get_plant(1)).name for api in (first, second)] == ["token-1", "token-2"]
+    assert first.auth.rate_limiter.scheduler is second.auth.rate_limiter.scheduler is pool.scheduler
+    assert first.auth.websession is second.auth.websession is session
+
+    pool.set_access_token("first", "token-3")
+    assert (await pool["first"].async_get_plant(1)).name == "token-3"
+    with pytest.raises(ValueError):
+        pool.add_account("first", "token")
+    await pool.close()
+    assert not session.closed
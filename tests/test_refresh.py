@@ -0,0 +1,85 @@
+from lumioo.plant import Plant, PlantStatus
+from lumioo.refresh import async_refresh_all
+from lumioo.tracker import TrackerStatus
+
+from .helpers import collection, json_response, make_api
+
+
+def plant_status(status_id: int, plant_id: int, alarm: int = 0) -> dict:
+    return {"@type": "PlantStatus", "id": status_id, "plant": f"/v2/human/plants/{plant_id}", "alarmLevel1": alarm}
+
+
+def tracker_status(status_id: int, tracker_id: int, alarms: int = 0) -> dict:
+    return {"@type": "TrackerStatus", "id": status_id, "tracker": f"/v2/human/trackers/{tracker_id}", "alarms": alarms}
+
+
+def ids_in(path: str, resource: str):
+    return [int(value.rsplit("/", 1)[1]) for value in path.partition("?")[2].split("&") if value.startswith(resource)]
+
+
+def handler(method, path, headers):
+    # Status IDs (40+) differ from the IDs of their plants and trackers.
+    if path.startswith("plant_statuses?plant[]="):
+        return collection([plant_status(40 + plant_id - 12, plant_id, alarm=1) for plant_id in ids_in(path, "plant[]=") if plant_id != 14])
+    if path.startswith("plant_statuses?plant="):
+        plant_id = ids_in(path, "plant=")[0]
+        return collection([plant_status(40 + plant_id - 12, plant_id, alarm=2)])
+    if path.startswith("tracker_statuses?tracker[]="):
+        return collection([tracker_status(50 + tracker_id, tracker_id, alarms=3) for tracker_id in ids_in(path, "tracker[]=")])
+    if path.startswith("plants?page="):
+        page = int(path.rsplit("=", 1)[1])
+        plants = [{"id": 12, "name": "Renamed"}, {"id": 13, "name": "Moved"}]
+        return collection(plants[page - 1:page], last_page=2, page=page)
+    return json_response({}, status=500)
+
+
+async def test_statuses_are_refreshed_by_the_id_of_their_plant_or_tracker():
+    api, session = make_api(handler)
+    statuses = [PlantStatus(collection([plant_status(40, 12)]), api.auth), PlantStatus(collection([plant_status(41, 13)]), api.auth)]
+    trackers = [TrackerStatus(collection([tracker_status(57, 7)]), api.auth)]
+
+    result = await async_refresh_all(api, statuses + trackers)
+
+    assert result.ok
+    assert [status.alarm_level_1 for status in statuses] == [1, 1]
+    assert [status.id for status in statuses] == [40, 41]
+    assert trackers[0].alarms == 3
+    assert sorted(session.paths) == [
+        "plant_statuses?plant[]=/v2/human/plants/12&plant[]=/v2/human/plants/13&page=1",
+        "tracker_statuses?tracker[]=/v2/human/trackers/7&page=1",
+    ]
+
+
+async def test_statuses_missing_from_the_bulk_query_update_themselves():
+    api, session = make_api(handler)
+    status = PlantStatus(collection([plant_status(42, 14)]), api.auth)
+
+    result = await async_refresh_all(api, [status])
+
+    assert result.refreshed == [status]
+    assert status.alarm_level_1 == 2
+    assert session.paths[-1] == "plant_statuses?plant=/v2/human/plants/14"
+
+
+async def test_failures_keep_the_previous_data():
+    api, _ = make_api(handler)
+    plants = [Plant({"id": 12, "name": "Roof"}, api.auth), Plant({"id": 99, "name": "Gone"}, api.auth)]
+
+    result = await async_refresh_all(api, plants)
+
+    assert result.refreshed == [plants[0]]
+    assert plants[0].name == "Renamed"
+    (failure,) = result.failures
+    assert failure.model is plants[1] and plants[1].name == "Gone"
+    assert not result.ok
+
+
+async def test_plants_are_refreshed_from_every_page():
+    api, session = make_api(handler)
+    plants = [Plant({"id": 12, "name": "Roof"}, api.auth), Plant({"id": 13, "name": "Barn"}, api.auth)]
+
+    result = await async_refresh_all(api, plants)
+
+    assert result.ok
+    assert [plant.name for plant in plants] == ["Renamed", "Moved"]
+    assert sorted(session.paths) == ["plants?page=1", "plants?page=2"]
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from lumioo.circuit import CircuitBreaker, CircuitOpenError
+from lumioo.ratelimit import RateLimiter, RetryPolicy, TokenBucket, parse_retry_after
+
+from .helpers import json_response, make_api
+
+
+async def test_token_bucket_spaces_requests_after_the_burst():
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.monotonic()
+    waits = [await bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0 and waits[3] > 0
+    assert time.monotonic() - start >= 0.035
+
+
+def test_token_bucket_throttles_and_recovers():
+    bucket = TokenBucket(rate=10)
+    bucket.throttle()
+    assert bucket.rate == 5
+    for _ in range(100):
+        bucket.recover()
+    assert bucket.rate == 10
+    for _ in range(100):
+        bucket.throttle()
+    assert bucket.rate == pytest.approx(0.1)
+
+
+def test_retry_policy():
+    policy = RetryPolicy(retries=2, backoff=1, max_backoff=3)
+    assert policy.can_retry("GET", 1)
+    assert not policy.can_retry("GET", 2)
+    assert not policy.can_retry("POST", 0)
+    assert 0 <= policy.delay(5) <= 3
+    assert policy.delay(0, retry_after=10) == 3
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("soon") is None
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(retry_at) <= 30
+
+
+async def test_retryable_statuses_are_retried_honouring_retry_after():
+    statuses = [503, 429, 200]
+
+    def handler(method, path, headers):
+        return json_response({"id": 1}, status=statuses.pop(0), headers={"Retry-After": "0"})
+
+    limiter = RateLimiter(None, {"plants": 1000})
+    api, session = make_api(handler, rate_limiter=limiter)
+
+    assert (await api.async_get_plant(1)).id == 1
+    assert len(session.requests) == 3
+    # The 429 halved the rate, the 503 and the 200 grew it back a little.
+    assert limiter.family_buckets["plants"].rate == pytest.approx(1000 * 0.5 + 1000 * 0.05)
+
+
+async def test_connection_errors_are_retried_for_idempotent_requests_only():
+    def handler(method, path, headers):
+        raise ClientConnectionError()
+
+    api, session = make_api(handler, retry_policy=RetryPolicy(retries=2, backoff=0))
+    with pytest.raises(ClientConnectionError):
+        await api.auth.request("get", "plants/1")
+    assert len(session.requests) == 3
+
+    with pytest.raises(ClientConnectionError):
+        await api.auth.request("post", "plants/1")
+    assert len(session.requests) == 4
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    time.sleep(0.06)
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.before_request() is False
+
+
+async def test_auth_fails_fast_while_the_circuit_is_open():
+    def handler(method, path, headers):
+        return json_response({}, status=502)
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    api, session = make_api(handler, circuit_breaker=breaker, retry_policy=RetryPolicy(retries=0))
+    for _ in range(2):
+        resp = await api.auth.request("get", "plants/1")
+        assert resp.status == 502
+
+    with pytest.raises(CircuitOpenError):
+        await api.auth.request("get", "plants/1")
+    assert len(session.requests) == 2
+
+
+@pytest.mark.parametrize("outcome", ["cancelled", "unexpected"])
+async def test_trial_request_without_outcome_frees_the_trial(outcome):
+    async def handler(method, path, headers):
+        if outcome == "cancelled":
+            await asyncio.sleep(10)
+        raise ValueError("unexpected")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    api, session = make_api(handler, circuit_breaker=breaker)
+
+    trial = asyncio.ensure_future(api.auth.request("get", "plants/1"))
+    await asyncio.sleep(0.01)
+    if outcome == "cancelled":
+        trial.cancel()
+    with pytest.raises((asyncio.CancelledError, ValueError)):
+        await trial
+
+    # The next request is the new trial instead of failing with CircuitOpenError.
+    session.handler = lambda method, path, headers: {"id": 1}
+    assert (await api.async_get_plant(1)).id == 1
+    assert breaker.state == "closed"
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lumioo import utils
+from lumioo.scheduler import SolarScheduler, phase
+from lumioo.tracker import TrackerStatus
+
+from .helpers import collection, make_api
+
+UTC = timezone.utc
+# Sunrise and sunset in UTC: the plant time zone only picks the local day.
+SUNRISE, SUNSET = "06:00:00+00:00", "20:00:00+00:00"
+
+
+def handler(timezone_name: str = "UTC"):
+    def answer(method, path, headers):
+        if path.startswith("plants/"):
+            return {"id": 1, "timezone": timezone_name}
+        if path.startswith("trackers/"):
+            return {"id": 7, "plant": "/v2/human/plants/1"}
+        if path.startswith("solar_times/"):
+            day = path.rsplit("=", 1)[1]
+            return collection([{"@type": "SolarTimes", "sunrise": f"{day}T{SUNRISE}", "sunset": f"{day}T{SUNSET}"}])
+        raise AssertionError(path)
+    return answer
+
+
+def test_phases_spread_resources_over_an_interval():
+    phases = sorted(phase(resource_id) for resource_id in range(1, 101))
+    assert all(0 <= value < 1 for value in phases)
+    assert max(b - a for a, b in zip(phases, phases[1:])) < 0.03
+
+
+async def test_resources_are_polled_less_at_night_and_wake_up_spread_at_dawn():
+    api, session = make_api(handler())
+    scheduler = SolarScheduler(api, night_factor=6.0, margin=timedelta(minutes=30))
+
+    noon = datetime(2023, 6, 1, 12, tzinfo=UTC)
+    assert await scheduler.async_delay("plant", 1, 60, noon) == 60
+
+    before_dawn = datetime(2023, 6, 1, 5, 29, tzinfo=UTC)
+    assert await scheduler.async_delay("plant", 1, 60, before_dawn) == 60 + 60 * phase(1)
+    night = datetime(2023, 6, 1, 23, tzinfo=UTC)
+    assert await scheduler.async_delay("plant", 1, 60, night) == 360
+
+    # The time zone once, the solar times once per local day.
+    assert session.paths.count("plants/1") == 1
+    assert len([path for path in session.paths if path.startswith("solar_times/")]) == 2
+
+
+async def test_windy_plants_are_polled_more_often():
+    api, session = make_api(handler())
+    scheduler = SolarScheduler(api, wind_speed_threshold=15.0, wind_factor=0.25)
+    noon = datetime(2023, 6, 1, 12, tzinfo=UTC)
+
+    scheduler.observe("tracker", 7, TrackerStatus(collection([{"control": {"maxWindSpeed": 20.0}}]), None))
+    assert await scheduler.async_delay("tracker", 7, 60, noon) == 15
+    assert await scheduler.async_delay("plant", 1, 60, noon) == 15
+    assert session.paths.count("trackers/7") == 1
+
+    scheduler.observe("tracker", 7, TrackerStatus(collection([{"control": {"maxWindSpeed": 5.0}}]), None))
+    assert await scheduler.async_delay("plant", 1, 60, noon) == 60
+
+
+async def test_time_zones_without_zoneinfo_fall_back_to_the_interval(monkeypatch):
+    monkeypatch.setattr(utils, "_zone_info", lambda: None)
+    api, _ = make_api(handler("Europe/Paris"))
+
+    night = datetime(2023, 6, 1, 23, tzinfo=UTC)
+    assert await SolarScheduler(api).async_delay("plant", 1, 60, night) == 60
+
+
+async def test_unknown_time_zones_fall_back_to_the_interval():
+    if utils._zone_info() is None:
+        pytest.skip("Time zone support requires Python 3.9")
+    api, _ = make_api(handler("Mars/Olympus_Mons"))
+
+    night = datetime(2023, 6, 1, 23, tzinfo=UTC)
+    assert await SolarScheduler(api).async_delay("plant", 1, 60, night) == 60
+
+
+def test_zone(monkeypatch):
+    assert utils.zone(None) is UTC
+    if utils._zone_info() is not None:
+        assert datetime(2023, 1, 1, tzinfo=utils.zone("Europe/Paris")).utcoffset() == timedelta(hours=1)
+    monkeypatch.setattr(utils, "_zone_info", lambda: None)
+    with pytest.raises(RuntimeError):
+        utils.zone("Europe/Paris")
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from lumioo import schema
+from lumioo.meter import MeterStatus
+from lumioo.plant import Plant, PlantEnergyDay, PlantStatus
+from lumioo.tracker import TrackerStatus
+
+from .helpers import collection, make_api
+
+STATUS_TYPE = {"@type": "StatusType", "id": 2, "label": "Warning", "reference": "WARN", "level": 2}
+
+PLANT = {
+    "id": 12, "user": "/v2/human/users/3", "name": "Roof", "aliasInstallation": "R1", "timezone": "Europe/Paris",
+    "operationDate": "2021-04-01T00:00:00+02:00", "restrictedPower": False, "restrictedValue": 0,
+    "displayAutoconsumption": True, "displayConsumption": True, "nominalPower": 9000, "mainMeter": "/v2/human/meters/7",
+}
+PLANT_STATUS = {
+    "@type": "PlantStatus", "id": 40, "latestSynchronisation": "2023-06-01T12:00:00+00:00", "isSynchronised": True,
+    "statusType": STATUS_TYPE, "alarmLevel1": 1, "alarmLevel2": 0, "alarmLevel3": 0,
+}
+TRACKER_STATUS = {
+    "@type": "TrackerStatus", "id": 41, "statusType": STATUS_TYPE, "latestSynchronisation": "2023-06-01T12:00:00+00:00",
+    "isSynchronised": False, "alarms": 2, "maxWindSpeed20": 12.5, "softwareFlatStatu": False,
+    "data": {"@type": "TrackerStatusData", "production": 800, "restricted": False, "isSynchronised": True, "date": "2023-06-01T11:59:00+00:00"},
+    "control": {"@type": "TrackerStatusControl", "averageWindSpeed": 3.5, "alarmLabel": "Motor", "alarmDescription": "Stuck", "maxWindSpeed": 14.0, "date": "2023-06-01T11:59:00+00:00"},
+}
+METER_STATUS = {
+    "id": 7, "isSynchronised": True, "latestSynchronisation": "2023-06-01T12:00:00+00:00",
+    "data": {"date": "2023-06-01T11:00:00+00:00", "consumption": 420},
+}
+ENERGY_DAY = {
+    "@type": "EnergyPlantDay", "plant": "/v2/human/plants/12", "date": "2023-06-01T00:00:00+02:00",
+    "production": 30000, "consumption": 12000, "autoConsumption": 9000, "gridConsumption": 3000,
+}
+
+
+def assert_matches(record, model):
+    """Assert every field of a record equals the property of the same name of a model."""
+    for name in type(record).__slots__:
+        if not hasattr(type(model), name):
+            continue
+        value = getattr(record, name)
+        if isinstance(value, schema.Record):
+            assert_matches(value, getattr(model, name))
+        else:
+            assert value == getattr(model, name), name
+
+
+@pytest.mark.parametrize("record, model", [
+    (schema.PlantRecord.from_raw(PLANT), Plant(PLANT, None)),
+    (schema.PlantStatusRecord.from_data(collection([PLANT_STATUS])), PlantStatus(collection([PLANT_STATUS]), None)),
+    (schema.TrackerStatusRecord.from_raw(TRACKER_STATUS), TrackerStatus(collection([TRACKER_STATUS]), None)),
+    (schema.MeterStatusRecord.from_raw(METER_STATUS), MeterStatus(METER_STATUS, None)),
+    (schema.PlantEnergyDayRecord.from_raw(ENERGY_DAY), PlantEnergyDay(12, ENERGY_DAY, None)),
+], ids=lambda value: type(value).__name__)
+def test_records_match_the_models(record, model):
+    assert_matches(record, model)
+    assert not hasattr(record, "__dict__")
+
+
+def test_records_compare_by_value_and_decode_bodies():
+    body = json.dumps(collection([ENERGY_DAY, dict(ENERGY_DAY, production=1)])).encode()
+
+    days = schema.decode_members(body, schema.PlantEnergyDayRecord, plant_id=5)
+    assert [(day.plant_id, day.production) for day in days] == [(5, 30000), (5, 1)]
+    assert days[0] == schema.PlantEnergyDayRecord.from_raw(ENERGY_DAY, plant_id=5)
+    assert days[0] != days[1]
+    assert days[0]["grid_consumption"] == 3000
+    assert schema.decode(json.dumps(PLANT).encode(), schema.PlantRecord).main_meter == 7
+    assert repr(schema.StatusTypeRecord.from_raw(STATUS_TYPE)).startswith("StatusTypeRecord(type='StatusType', id=2")
+
+
+def test_missing_fields_decode_to_none():
+    record = schema.PlantRecord.from_raw({"id": 1})
+    assert (record.user, record.operation_date, record.main_meter) == (None, None, None)
+
+
+def test_records_must_implement_from_raw():
+    class Incomplete(schema.Record):
+        __slots__ = ("value",)
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    with pytest.raises(TypeError):
+        schema.Record()
+
+
+async def test_api_returns_records():
+    api, _ = make_api(lambda method, path, headers: PLANT if path == "plants/12" else collection([PLANT_STATUS]))
+
+    assert (await api.async_get_record("plants/12", schema.PlantRecord)).name == "Roof"
+    statuses = await api.async_get_records("plant_statuses?plant=/v2/human/plants/12", schema.PlantStatusRecord)
+    assert [status.status_type.level for status in statuses] == [2]
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lumioo.analyse import PowerPlantMinute, PowerSeries
+
+
+def member(minute: int, production: float, offset: str = "+02:00") -> dict:
+    return {
+        "@id": f"/v2/human/power_plant_minutes/{100 + minute}",
+        "@type": "PowerPlantMinute",
+        "date": f"2023-06-01T12:{minute:02d}:00{offset}",
+        "production": production,
+        "consumption": 10.0,
+        "autoConsumption": min(production, 10.0),
+        "gridConsumption": max(10.0 - production, 0.0),
+    }
+
+
+def test_rows_match_the_minute_models():
+    members = [member(minute, float(minute)) for minute in range(3)]
+    series = PowerSeries.from_members(members)
+
+    assert len(series) == 3
+    for row, raw_data in zip(series, members):
+        model = PowerPlantMinute(raw_data, None)
+        assert (row.id, row.date, row.production, row.auto_consumption, row.grid_consumption) == (
+            model.id, model.date, model.production, model.auto_consumption, model.grid_consumption,
+        )
+    assert series[-1].date.utcoffset() == timedelta(hours=2)
+    with pytest.raises(IndexError):
+        series[3]
+
+
+def test_naive_dates_are_utc():
+    series = PowerSeries.from_members([dict(member(0, 1.0), date="2023-06-01T12:00:00")])
+    assert series[0].date == datetime(2023, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def test_from_rows_round_trips_rows():
+    series = PowerSeries.from_members([member(minute, float(minute)) for minute in range(3)])
+    assert list(PowerSeries.from_rows(series.rows()).rows()) == list(series.rows())
+
+
+def test_extend_appends_every_column():
+    series = PowerSeries.from_members([member(0, 1.0)])
+    series.extend(PowerSeries.from_members([member(1, 2.0), member(2, 3.0)]))
+    assert list(series.production) == [1.0, 2.0, 3.0]
+    assert len(series.ids) == len(series.utc_offsets) == 3
+
+
+def test_sum_mean_and_resample(backend):
+    series = PowerSeries.from_members([member(minute, float(minute)) for minute in range(10)])
+
+    assert series.sum("production") == 45.0
+    assert series.mean("production") == 4.5
+    assert PowerSeries().mean("production") is None
+
+    means = series.resample(300)
+    assert list(means.production) == [2.0, 7.0]
+    assert [row.date for row in means] == [series[0].date, series[5].date]
+    assert list(series.resample(300, "sum").production) == [10.0, 35.0]
+    assert len(PowerSeries().resample(300)) == 0
+    with pytest.raises(ValueError):
+        series.resample(300, "median")
+
+
+def test_column_shares_the_array_memory(backend):
+    series = PowerSeries.from_members([member(0, 1.0)])
+    column = series.column("production")
+    if backend == "numpy":
+        series.production[0] = 5.0
+        assert column[0] == 5.0
+    else:
+        assert column is series.production
@@ -0,0 +1,83 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from lumioo.auth import Auth, PoolTracer, create_session, pool_stats
+from lumioo.pool import ClientPool
+
+
+def app(release: asyncio.Event) -> web.Application:
+    async def handler(request):
+        await release.wait()
+        return web.json_response({"id": 1})
+
+    application = web.Application()
+    application.router.add_get("/v2/human/plants/1", handler)
+    return application
+
+
+async def test_pool_tracer_counts_queued_created_and_reused_connections():
+    release = asyncio.Event()
+    tracer = PoolTracer()
+    async with TestServer(app(release)) as server:
+        session = create_session(limit_per_host=1, tracer=tracer)
+        auth = Auth(session, "token", pool_tracer=tracer)
+        auth.host = str(server.make_url("/v2/human"))
+        try:
+            requests = [asyncio.ensure_future(auth.request("get", "plants/1")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            stats = auth.pool_stats()
+            assert (stats.limit_per_host, stats.in_flight, stats.waiting, stats.created) == (1, 2, 1, 1)
+            assert stats.saturation == 2 / stats.limit
+
+            release.set()
+            for resp in await asyncio.gather(*requests):
+                await resp.json()
+                resp.release()
+            assert pool_stats(session, tracer)[2:] == (0, 0, 1, 1)
+        finally:
+            await session.close()
+
+
+async def test_requests_cancelled_while_queued_stop_waiting():
+    release = asyncio.Event()
+    tracer = PoolTracer()
+    async with TestServer(app(release)) as server:
+        async with create_session(limit_per_host=1, tracer=tracer) as session:
+            url = server.make_url("/v2/human/plants/1")
+            first = asyncio.ensure_future(session.get(url))
+            queued = asyncio.ensure_future(session.get(url))
+            await asyncio.sleep(0.05)
+            assert tracer.waiting == 1
+
+            queued.cancel()
+            await asyncio.gather(queued, return_exceptions=True)
+            assert (tracer.in_flight, tracer.waiting) == (1, 0)
+            release.set()
+            (await first).release()
+            assert tracer.in_flight == 0
+
+
+async def test_auth_follows_the_session_it_opens():
+    auth = Auth(None, "token")
+    assert auth.pool_stats() is None
+    auth.websession = create_session(tracer=auth.pool_tracer)
+    try:
+        assert auth.pool_stats()[:3] == (100, 30, 0)
+    finally:
+        await auth.close()
+
+    # A session given without its tracer is not followed.
+    async with create_session() as session:
+        assert Auth(session, "token").pool_stats() is None
+
+
+async def test_client_pool_shares_its_tracer_with_every_account():
+    async with ClientPool(session_options={"limit": 10}) as pool:
+        first = pool.add_account("first", "token")
+        second = pool.add_account("second", "token")
+
+        assert first.auth.pool_tracer is second.auth.pool_tracer is pool.pool_tracer
+        assert pool.pool_stats().limit == 10
+    assert pool.websession is None
@@ -0,0 +1,75 @@
+import asyncio
+
+from .helpers import collection, json_response, make_api
+
+
+def handler(method, path, headers):
+    if path.startswith("plants/"):
+        plant_id = int(path.rsplit("/", 1)[1])
+        if plant_id == 3:
+            return json_response({"detail": "Not Found"}, status=404)
+        return {"id": plant_id, "name": f"Plant {plant_id}", "mainMeter": "/v2/human/meters/9"}
+    if path.startswith("plant_statuses"):
+        return collection([{"id": 1, "isSynchronised": True}])
+    if path.startswith("trackers?"):
+        return collection([{"id": 10}, {"id": 11}])
+    if path.startswith("tracker_statuses"):
+        tracker_id = int(path.rsplit("/", 1)[1])
+        return collection([{"id": tracker_id, "alarms": 0}])
+    if path.startswith("meters/"):
+        return {"id": 9, "plant": "/v2/human/plants/1"}
+    if path.startswith("meter_statuses/"):
+        return {"id": 9, "isSynchronised": True}
+    raise AssertionError(path)
+
+
+async def test_snapshot_fetches_every_part_once():
+    api, session = make_api(handler)
+
+    snapshots = await api.async_get_plant_snapshot([1, 2])
+
+    first = snapshots[1]
+    assert first.complete
+    assert first.plant.name == "Plant 1"
+    assert [tracker.id for tracker in first.trackers] == [10, 11]
+    assert set(first.tracker_statuses) == {10, 11}
+    assert (first.meter.id, first.meter_status.id) == (9, 9)
+    # The meter and the trackers of both plants are the same resources: fetched once.
+    assert session.paths.count("meters/9") == 1
+    assert session.paths.count("tracker_statuses?tracker=/v2/human/trackers/10") == 1
+    assert snapshots[2].meter is first.meter
+
+
+async def test_snapshot_keeps_the_parts_that_did_not_fail():
+    api, session = make_api(handler)
+
+    snapshot = (await api.async_get_plant_snapshot([3]))[3]
+
+    assert not snapshot.complete
+    assert set(snapshot.errors) == {("plant", 3)}
+    assert snapshot.plant is None and snapshot.meter is None
+    assert snapshot.status is not None
+    assert len(snapshot.trackers) == 2
+
+
+async def test_cancelling_a_snapshot_cancels_its_requests():
+    started = asyncio.Event()
+    cancelled = []
+
+    async def slow(method, path, headers):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(path)
+            raise
+
+    api, session = make_api(slow)
+    snapshot = asyncio.ensure_future(api.async_get_plant_snapshot([1]))
+    await started.wait()
+    snapshot.cancel()
+    await asyncio.gather(snapshot, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == sorted(session.paths)
+    assert len(cancelled) == 3
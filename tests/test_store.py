@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from lumioo.analyse import PowerSeries
+from lumioo.plant import PlantEnergyDay
+from lumioo.store import EnergyStore
+
+from .helpers import collection, make_api
+
+
+def hourly_members(start: datetime, end: datetime) -> list:
+    members = []
+    dt = start
+    while dt < end:
+        members.append({
+            "@id": f"/v2/human/power_plant_minutes/{int(dt.timestamp()) // 60}",
+            "@type": "PowerPlantMinute",
+            "date": dt.isoformat(),
+            "production": float(dt.hour),
+            "consumption": 1.0,
+            "autoConsumption": 1.0,
+            "gridConsumption": 0.0,
+        })
+        dt += timedelta(hours=1)
+    return members
+
+
+def day_members(start: datetime, end: datetime) -> list:
+    members = []
+    dt = start
+    while dt < end:
+        members.append({"@type": "EnergyPlantDay", "date": dt.isoformat(), "production": dt.day, "consumption": 1, "autoConsumption": 1, "gridConsumption": 0})
+        dt += timedelta(days=1)
+    return members
+
+
+def handler(method, path, headers):
+    query = parse_qs(urlsplit(path).query)
+    start = datetime.fromisoformat(query["date[after]"][0]).replace(tzinfo=timezone.utc)
+    end = datetime.fromisoformat(query["date[strictly_before]"][0]).replace(tzinfo=timezone.utc)
+    if path.startswith("power_plant_minutes"):
+        return collection(hourly_members(start, end))
+    return collection(day_members(start, end))
+
+
+def test_power_series_round_trip_and_replace():
+    store = EnergyStore()
+    start = datetime(2023, 6, 1, tzinfo=timezone.utc)
+    series = PowerSeries.from_members(hourly_members(start, start + timedelta(days=1)))
+    store.add_power_series(1, series)
+    store.add_power_series(1, series)
+
+    queried = store.query_power_series(1, "2023-06-01T06:00:00", "2023-06-01T09:00:00")
+    assert list(queried.production) == [6.0, 7.0, 8.0]
+    assert len(store.query_power_series(1, "2023-06-01", "2023-06-02")) == 24
+    assert len(store.query_power_series(2, "2023-06-01", "2023-06-02")) == 0
+    assert store.latest_minute(1) == datetime(2023, 6, 1, 23, tzinfo=timezone.utc)
+    assert store.latest_minute(2) is None
+
+
+def test_energy_days_round_trip():
+    store = EnergyStore()
+    start = datetime(2023, 6, 1, tzinfo=timezone.utc)
+    store.add_energy_days(1, [PlantEnergyDay(1, raw_data, None) for raw_data in day_members(start, start + timedelta(days=5))])
+
+    days = store.query_energy_days(1, "2023-06-02", "2023-06-04")
+    assert [day.production for day in days] == [2, 3]
+    assert store.latest_energy_day(1) == datetime(2023, 6, 5, tzinfo=timezone.utc)
+
+
+async def test_sync_only_fetches_what_is_missing(tmp_path):
+    api, session = make_api(handler)
+    store = EnergyStore(str(tmp_path / "energy.db"), revision_window=timedelta(days=1))
+    today = datetime.now(timezone.utc).date()
+    since = today - timedelta(days=5)
+
+    await store.async_sync(api, 1, since=since)
+    first_sync = len(session.requests)
+    assert store.latest_energy_day(1).date() == today
+    assert len(store.query_power_series(1, since.isoformat(), (today + timedelta(days=1)).isoformat())) == 6 * 24
+
+    await store.async_sync(api, 1)
+    starts = {parse_qs(urlsplit(path).query)["date[after]"][0][:10] for path in session.paths[first_sync:]}
+    # Only the revision window before the latest stored day, and today, are fetched again.
+    assert starts == {(today - timedelta(days=1)).isoformat(), today.isoformat()}
+    store.close()
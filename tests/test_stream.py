@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from lumioo.response import BufferedResponse
+from lumioo.stream import HydraMemberStream
+
+MEMBERS = [
+    {"@id": f"/v2/human/energy_plant_days/{index}", "name": "é" * (index % 5), "production": index * 1.5, "gridConsumption": index}
+    for index in range(200)
+]
+DOCUMENT = {
+    "@context": "/v2/human/contexts/EnergyPlantDay",
+    "hydra:member": MEMBERS,
+    "hydra:totalItems": 4000,
+    "hydra:view": {"hydra:next": "/v2/human/energy_plant_days?page=2"},
+}
+
+
+class CountingResponse(BufferedResponse):
+    releases = 0
+
+    def release(self) -> None:
+        self.releases += 1
+
+
+def response(document=DOCUMENT) -> CountingResponse:
+    return CountingResponse("get", "http://api.test/", 200, [], json.dumps(document, indent=1, ensure_ascii=False).encode())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+async def test_stream_decodes_every_member_across_chunks(chunk_size):
+    resp = response()
+    stream = HydraMemberStream(resp, chunk_size=chunk_size)
+
+    assert [member async for member in stream] == MEMBERS
+    assert stream.meta == {key: value for key, value in DOCUMENT.items() if key != "hydra:member"}
+    assert resp.releases == 1
+
+
+async def test_stream_rejects_truncated_documents():
+    resp = CountingResponse("get", "http://api.test/", 200, [], json.dumps(DOCUMENT).encode()[:-40])
+    with pytest.raises(ValueError):
+        [member async for member in HydraMemberStream(resp, chunk_size=64)]
+    assert resp.releases == 1
+
+
+async def test_leaving_the_stream_early_releases_the_response():
+    resp = response()
+    async with HydraMemberStream(resp, chunk_size=64) as stream:
+        async for member in stream:
+            break
+    assert resp.releases >= 1
+
+
+async def test_early_exit_returns_the_connection_to_the_pool():
+    body = json.dumps(DOCUMENT).encode()
+
+    async def handler(request):
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    async with TestServer(app) as server, ClientSession() as session:
+        resp = await session.get(server.make_url("/"))
+        async with HydraMemberStream(resp, chunk_size=64) as stream:
+            async for member in stream:
+                break
+        assert resp.closed
+        assert resp.connection is None